@@ -6,6 +6,8 @@ import awkward as ak
 import numpy as np
 from hepflow.model.data_flow import DataDependencyResult
 
+from fasthep_carpenter.runtime.chunked import chunkwise
+
 ALIGN_SCHEMA_SPEC = {
     "name": "hep.align_schema",
     "kind": "transform",
@@ -107,6 +109,7 @@ def parse_align_schema_column_dependencies(
     return result
 
 
+@chunkwise
 def run_align_schema(
     *,
     stream: Any,
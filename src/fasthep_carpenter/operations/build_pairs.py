@@ -15,6 +15,7 @@ from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 from hepflow.registry.defaults import default_expr_registry
 from hepflow.runtime.engine import eval_expr
 
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
@@ -121,6 +122,7 @@ def run_build_pairs(
     return {DEFAULT_PRIMARY_STREAM_ID: out}
 
 
+@chunkwise
 def run_build_pairs_transform(
     *,
     stream: Any,
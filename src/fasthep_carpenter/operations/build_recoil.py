@@ -14,6 +14,7 @@ from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 from hepflow.registry.defaults import default_expr_registry
 from hepflow.runtime.engine import eval_expr
 
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
@@ -92,6 +93,7 @@ def run_build_recoil(
     return {DEFAULT_PRIMARY_STREAM_ID: out}
 
 
+@chunkwise
 def run_build_recoil_transform(
     *,
     stream: Any,
@@ -27,6 +27,7 @@ from hepflow.compiler.data_flow import (
 from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 from hepflow.registry.defaults import default_expr_registry
 
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
@@ -223,6 +224,7 @@ def run_clean(
     return {DEFAULT_PRIMARY_STREAM_ID: out}
 
 
+@chunkwise
 def run_clean_transform(
     *,
     stream: Any,
@@ -8,6 +8,7 @@ from hepflow.compiler.expr_symbols import data_symbols_in_expr
 from hepflow.model.data_flow import DataDependencyResult
 from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
@@ -172,6 +173,7 @@ def run_match_l1t_jets(
     return {"events": out_events}
 
 
+@chunkwise
 def run_match_l1t_jets_transform(
     *,
     stream,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Mapping
 from typing import Any
 
 import awkward as ak
@@ -10,6 +11,7 @@ from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 from hepflow.registry.defaults import default_expr_registry
 from hepflow.runtime.engine import eval_expr
 
+from fasthep_carpenter.runtime.chunked import ChunkedArray, chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
@@ -132,25 +134,104 @@ def run_cutflow(
     return {DEFAULT_PRIMARY_STREAM_ID: filtered, "cutflow": {"cuts": cuts}}
 
 
-def run_cutflow_transform(
-    *,
-    stream,
-    selection,
-    weight_expr=None,
-    output_field=None,
-    ctx=None,
-    **kwargs,
-):
-    stream = unwrap_legacy_data_envelope(stream)
-    legacy_data = legacy_data_envelope(stream)
-    legacy_params = {
-        "selection": selection,
+_ADDITIVE_CUT_FIELDS = (
+    "n",
+    "n_in",
+    "n_out",
+    "n_unweighted_in",
+    "n_unweighted_out",
+    "sumw",
+    "sumw2",
+    "sumw_in",
+    "sumw_out",
+    "sumw2_in",
+    "sumw2_out",
+)
+
+
+def _merge_chunk_cutflows(results: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    if isinstance(results, Iterator):
+        cutflow = _StreamedCutflow(results)
+        return {"stream": cutflow.stream(), "cutflow": cutflow}
+    rows: dict[str, dict[str, Any]] = {}
+    streams = []
+    for result in results:
+        streams.append(result["stream"])
+        _add_cut_rows(rows, result["cutflow"]["cuts"])
+    return {
+        "stream": ChunkedArray(streams),
+        "cutflow": {"cuts": list(rows.values())},
     }
+
+
+def _add_cut_rows(rows: dict[str, dict[str, Any]], cuts: list[dict[str, Any]]) -> None:
+    for row in cuts:
+        target = rows.get(row["name"])
+        if target is None:
+            rows[row["name"]] = dict(row)
+            continue
+        for field in _ADDITIVE_CUT_FIELDS:
+            if field in row:
+                target[field] = target.get(field, 0) + row[field]
+
+
+class _StreamedCutflow(Mapping[str, Any]):
+    """
+    The cutflow of a streamed input, summed as its filtered chunks are consumed.
+
+    :meth:`stream` yields each filtered chunk once, so only one chunk is held
+    at a time. Reading the cutflow before the stream is exhausted drains the
+    remaining chunks, counting them without keeping them; iterating the
+    stream after that raises.
+    """
+
+    def __init__(self, results: Iterator[dict[str, Any]]) -> None:
+        self._results = results
+        self._rows: dict[str, dict[str, Any]] = {}
+        self._drained = False
+
+    def stream(self) -> Iterator[Any]:
+        for result in self._results:
+            _add_cut_rows(self._rows, result["cutflow"]["cuts"])
+            yield result["stream"]
+        if self._drained:
+            raise RuntimeError(
+                "cutflow stream was drained to complete its counts before being read"
+            )
+
+    def _cutflow(self) -> dict[str, Any]:
+        for result in self._results:
+            self._drained = True
+            _add_cut_rows(self._rows, result["cutflow"]["cuts"])
+        return {"cuts": list(self._rows.values())}
+
+    def __getitem__(self, key: str) -> Any:
+        return self._cutflow()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._cutflow())
+
+    def __len__(self) -> int:
+        return len(self._cutflow())
+
+
+@chunkwise(merge=_merge_chunk_cutflows)
+def _run_cutflow_chunk(
+    *,
+    stream: Any,
+    selection: Any,
+    weight_expr: Any,
+    output_field: Any,
+    filter: bool,
+    ctx: Any,
+) -> dict[str, Any]:
+    legacy_data = legacy_data_envelope(unwrap_legacy_data_envelope(stream))
+    legacy_params = {"selection": selection}
     if weight_expr is not None:
         legacy_params["weight_expr"] = weight_expr
     if output_field is not None:
         legacy_params["output_field"] = output_field
-    legacy_params["filter"] = kwargs.pop("filter", True)
+    legacy_params["filter"] = filter
     legacy_ctx = ctx or {}
     if "primary_stream" not in legacy_ctx:
         legacy_ctx["primary_stream"] = DEFAULT_PRIMARY_STREAM_ID
@@ -160,7 +241,31 @@ def run_cutflow_transform(
         params=legacy_params,
         ctx=legacy_ctx,
     )
+    return {
+        "stream": out[DEFAULT_PRIMARY_STREAM_ID],
+        "cutflow": out["cutflow"],
+    }
+
+
+def run_cutflow_transform(
+    *,
+    stream,
+    selection,
+    weight_expr=None,
+    output_field=None,
+    ctx=None,
+    **kwargs,
+):
+    out = _run_cutflow_chunk(
+        stream=stream,
+        selection=selection,
+        weight_expr=weight_expr,
+        output_field=output_field,
+        filter=kwargs.pop("filter", True),
+        ctx=ctx,
+    )
     if ctx is not None and hasattr(ctx, "provenance"):
+        legacy_params = {"selection": selection, "weight_expr": weight_expr}
         deps = _runtime_dependencies(legacy_params, dict(ctx or {}))
         output_symbols = []
         if output_field:
@@ -169,10 +274,7 @@ def run_cutflow_transform(
             inputs={"symbols": sorted(deps.consumes)},
             outputs={"symbols": output_symbols},
         )
-    return {
-        "stream": out[DEFAULT_PRIMARY_STREAM_ID],
-        "cutflow": out["cutflow"],
-    }
+    return out
 
 
 def _runtime_dependencies(
@@ -9,6 +9,7 @@ from hepflow.model.data_flow import DataDependencyResult
 from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 from hepflow.runtime.engine import eval_expr
 
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
@@ -126,6 +127,7 @@ def run_define(
     return {DEFAULT_PRIMARY_STREAM_ID: out}
 
 
+@chunkwise
 def run_define_transform(
     *, stream: Any, variables: list[dict[str, Any]], ctx: Any = None, **kwargs: Any
 ) -> ak.Array:
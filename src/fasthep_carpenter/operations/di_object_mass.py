@@ -9,6 +9,7 @@ from hepflow.model.data_flow import DataDependencyResult
 from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 from hepflow.runtime.engine import eval_expr
 
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
@@ -157,6 +158,7 @@ def run_di_object_mass(
     return {DEFAULT_PRIMARY_STREAM_ID: out}
 
 
+@chunkwise
 def run_di_object_mass_transform(
     *, stream, collection="Muon", mask=None, out_var=None, ctx=None, **kwargs
 ):
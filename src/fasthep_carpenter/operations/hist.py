@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 
 import awkward as ak
@@ -9,6 +10,7 @@ from hepflow.model.data_flow import DataDependencyResult
 from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 from hepflow.runtime.engine import eval_expr
 
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
@@ -346,6 +348,17 @@ def _type_summary(value: Any) -> str:
         return type(value).__name__
 
 
+def _sum_chunk_histograms(histograms: Iterable[Any]) -> Any:
+    it = iter(histograms)
+    acc = next(it, None)
+    if acc is None:
+        raise ValueError("hist received an empty stream")
+    for value in it:
+        acc = acc + value
+    return acc
+
+
+@chunkwise(merge=_sum_chunk_histograms)
 def run_hist_transform(
     *,
     stream,
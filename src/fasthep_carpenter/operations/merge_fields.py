@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import Any
 
 import awkward as ak
 
+from fasthep_carpenter.runtime.chunked import is_chunked, map_aligned_chunks
+
 MERGE_FIELDS_SPEC = {
     "name": "hep.merge_fields",
     "kind": "transform",
@@ -35,18 +38,33 @@ def run_merge_fields(
     on_conflict: str = "keep_first",
     ctx: Any | None = None,
     **streams: Any,
-) -> ak.Array:
-    """Merge top-level fields from equal-length event streams."""
+) -> Any:
+    """
+    Merge top-level fields from equal-length event streams.
+
+    Chunked inputs (a ``ChunkedArray`` or a streamed iterator) are merged
+    chunk by chunk and give a chunked result of the same kind; their chunks
+    must line up.
+    """
     del ctx
     if not streams:
         raise ValueError("merge_fields requires at least one input stream")
     if on_conflict not in {"keep_first", "keep_last", "error"}:
         raise ValueError(f"Unsupported merge_fields on_conflict mode: {on_conflict}")
 
+    normalised = {
+        name: _normalise_stream(stream, name=name) for name, stream in streams.items()
+    }
+    merge = partial(_merge_streams, on_conflict=on_conflict)
+    if any(is_chunked(stream) for stream in normalised.values()):
+        return map_aligned_chunks(merge, normalised, name="merge_fields")
+    return merge(normalised)
+
+
+def _merge_streams(streams: dict[str, ak.Array], *, on_conflict: str) -> ak.Array:
     merged: dict[str, Any] = {}
     lengths: list[int] = []
-    for name, stream in streams.items():
-        arr = _normalise_stream(stream, name=name)
+    for arr in streams.values():
         lengths.append(len(arr))
         for field in ak.fields(arr):
             if field in merged:
@@ -62,11 +80,12 @@ def run_merge_fields(
     return ak.zip(merged, depth_limit=1)
 
 
-def _normalise_stream(stream: Any, *, name: str) -> ak.Array:
-    if isinstance(stream, ak.Array):
+def _normalise_stream(stream: Any, *, name: str) -> Any:
+    if is_chunked(stream) or isinstance(stream, ak.Array):
         return stream
     if isinstance(stream, dict):
         return ak.Array(stream)
     raise TypeError(
-        f"merge_fields input stream '{name}' expects awkward.Array or dict[str, array-like]"
+        f"merge_fields input stream '{name}' expects awkward.Array, "
+        "dict[str, array-like] or a chunked stream"
     )
@@ -6,6 +6,8 @@ import awkward as ak
 from hepflow.model.data_flow import DataDependencyResult
 from hepflow.runtime.records import get_field_by_branch
 
+from fasthep_carpenter.runtime.chunked import chunkwise
+
 PROJECT_FIELDS_SPEC = {
     "name": "core.project_fields",
     "kind": "transform",
@@ -64,6 +66,7 @@ def parse_project_fields_column_dependencies(
     return result
 
 
+@chunkwise
 def run_project_fields(
     stream: Any,
     *,
@@ -13,6 +13,8 @@ from hepflow.registry.defaults import default_expr_registry
 from hepflow.runtime import ComponentContext
 from hepflow.runtime.engine import eval_expr
 
+from fasthep_carpenter.runtime.chunked import chunkwise
+
 DEFAULT_SORT = {"by": "pt", "order": "descending"}
 
 
@@ -77,6 +79,7 @@ SELECT_OBJECTS_SPEC = {
 }
 
 
+@chunkwise
 def run_select_objects(
     *,
     stream: Any,
@@ -9,6 +9,7 @@ from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 from hepflow.registry.defaults import default_expr_registry
 from hepflow.runtime.engine import eval_expr
 
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
@@ -81,6 +82,7 @@ def run_selection_flag(
     return {DEFAULT_PRIMARY_STREAM_ID: ak.with_field(events, flag, output)}
 
 
+@chunkwise
 def run_selection_flag_transform(
     *,
     stream: Any,
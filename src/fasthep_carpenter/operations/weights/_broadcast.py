@@ -0,0 +1,31 @@
+"""Flatten per-event and per-object inputs for flat table lookups."""
+
+from __future__ import annotations
+
+import awkward as ak
+import numpy as np
+
+
+def broadcast_flatten(
+    arrays: list[ak.Array],
+) -> tuple[list[ak.Array], list[ak.Array]]:
+    """
+    Broadcast per-event or per-object arrays together and flatten them.
+
+    The returned ``counts`` undo the flattening with :func:`unflatten`.
+    """
+    if len(arrays) > 1:
+        arrays = ak.broadcast_arrays(*arrays)
+
+    counts: list[ak.Array] = []
+    while arrays[0].ndim > 1:
+        counts.append(ak.num(arrays[0], axis=1))
+        arrays = [ak.flatten(array, axis=1) for array in arrays]
+    return arrays, counts
+
+
+def unflatten(values: np.ndarray, counts: list[ak.Array]) -> ak.Array:
+    out = ak.Array(values)
+    for level_counts in reversed(counts):
+        out = ak.unflatten(out, level_counts)
+    return out
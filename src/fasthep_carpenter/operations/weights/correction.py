@@ -0,0 +1,577 @@
+from __future__ import annotations
+
+import ast
+import gzip
+import json
+import math
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import awkward as ak
+import numpy as np
+from hepflow.model.data_flow import DataDependencyResult
+from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
+
+from fasthep_carpenter.operations.weights._broadcast import (
+    broadcast_flatten,
+    unflatten,
+)
+from fasthep_carpenter.operations.weights.table_cache import TABLE_CACHE
+from fasthep_carpenter.runtime.chunked import chunkwise
+from fasthep_carpenter.runtime.compat import (
+    legacy_data_envelope,
+    unwrap_legacy_data_envelope,
+)
+from fasthep_carpenter.runtime.stream_readers import get_stream_array
+
+CORRECTION_SPEC = {
+    "name": "hep.weights.correction",
+    "kind": "transform",
+    "version": "1.0",
+    "input": {"name": "stream", "kind": "event_stream", "required": True},
+    "params": {
+        "path": {"type": "string", "required": True},
+        "correction": {"type": "string", "required": True},
+        "inputs": {"type": "mapping", "required": True},
+        "constants": {"type": "mapping", "required": False, "default": None},
+        "variations": {"type": "mapping", "required": False, "default": None},
+        "outputs": {"type": "mapping", "required": True},
+    },
+    "result": {
+        "kind": "event_stream",
+        "description": "Event stream with correction weight fields added.",
+    },
+    "requires": {
+        "symbols": [
+            {"from": "params.inputs.*", "kind": "field_list"},
+        ]
+    },
+    "provides": {
+        "symbols": [
+            {"from": "params.outputs.*", "kind": "field_list"},
+        ]
+    },
+}
+
+# Evaluates a node for ``n`` rows of named, equal-length input columns.
+_Evaluator = Callable[[dict[str, np.ndarray], int], np.ndarray]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledCorrection:
+    """A correction compiled to a vectorised evaluator over NumPy columns."""
+
+    name: str
+    inputs: tuple[tuple[str, str], ...]
+    evaluator: _Evaluator
+
+    def evaluate(self, columns: dict[str, np.ndarray], n: int) -> np.ndarray:
+        missing = [name for name, _ in self.inputs if name not in columns]
+        if missing:
+            raise ValueError(f"correction {self.name!r} is missing inputs {missing}")
+        return np.asarray(self.evaluator(columns, n), dtype=float)
+
+
+def parse_correction_dependencies(
+    params: dict[str, Any],
+    **_: Any,
+) -> DataDependencyResult:
+    result = DataDependencyResult()
+    inputs = params.get("inputs") or {}
+    if isinstance(inputs, dict):
+        for field in inputs.values():
+            if isinstance(field, str) and field:
+                result.consumes.add(field)
+
+    outputs = params.get("outputs") or {}
+    if isinstance(outputs, dict):
+        for output in outputs.values():
+            if isinstance(output, str) and output:
+                result.produces.add(output)
+
+    return result
+
+
+def run_correction(
+    data: dict[str, Any], params: dict[str, Any], ctx: dict[str, Any]
+) -> dict[str, Any]:
+    events = get_stream_array(
+        data, ctx.get("primary_stream", DEFAULT_PRIMARY_STREAM_ID)
+    )
+    out = apply_correction(
+        events,
+        path=params["path"],
+        correction=params["correction"],
+        inputs=dict(params["inputs"]),
+        outputs=dict(params["outputs"]),
+        constants=dict(params.get("constants") or {}),
+        variations=dict(params.get("variations") or {}),
+    )
+    return {DEFAULT_PRIMARY_STREAM_ID: out}
+
+
+@chunkwise
+def run_correction_transform(
+    *,
+    stream: Any,
+    path: str,
+    correction: str,
+    inputs: dict[str, str],
+    outputs: dict[str, str],
+    constants: dict[str, Any] | None = None,
+    variations: dict[str, dict[str, Any]] | None = None,
+    ctx: dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> dict[str, ak.Array]:
+    stream = unwrap_legacy_data_envelope(stream)
+    legacy_data = legacy_data_envelope(stream)
+    out = run_correction(
+        data=legacy_data,
+        params={
+            "path": path,
+            "correction": correction,
+            "inputs": inputs,
+            "outputs": outputs,
+            "constants": dict(constants or {}),
+            "variations": dict(variations or {}),
+        },
+        ctx=dict(ctx or {}),
+        **kwargs,
+    )
+    return {"events": get_stream_array(out, DEFAULT_PRIMARY_STREAM_ID)}
+
+
+def apply_correction(
+    events: ak.Array,
+    *,
+    path: str,
+    correction: str,
+    inputs: dict[str, str],
+    outputs: dict[str, str],
+    constants: dict[str, Any] | None = None,
+    variations: dict[str, dict[str, Any]] | None = None,
+) -> ak.Array:
+    """
+    Add weights evaluated from a correctionlib-style JSON correction.
+
+    First-pass assumptions:
+    - ``path`` is a correction set (``schema_version`` 2, optionally gzipped)
+      or a single correction; ``correction`` names the one to apply.
+    - supported nodes are numbers, ``binning``, ``multibinning``,
+      ``category``, ``formula``/``formularef`` (TFormula syntax) and
+      ``transform``; ``flow`` may be ``clamp``, ``error`` or a node.
+    - ``inputs`` maps correction inputs to numeric event fields, one value or
+      one list of values per event; the fields are broadcast together and the
+      outputs take their shape.
+    - ``constants`` sets the remaining inputs (e.g. ``{"syst": "nominal"}``)
+      for every output; ``variations`` overrides them per output label, e.g.
+      ``{"up": {"syst": "up"}}``.
+    - ``outputs`` maps labels to event field names.
+    - the compiled correction is cached per process (see ``TABLE_CACHE``).
+    """
+    compiled = load_correction(path, correction)
+    fields = list(inputs.items())
+    flat_arrays, counts = (
+        broadcast_flatten([events[field] for _, field in fields])
+        if fields
+        else ([], [])
+    )
+    n = len(flat_arrays[0]) if fields else len(events)
+    columns = {
+        name: _flat_input(array, name=name, field=field)
+        for (name, field), array in zip(fields, flat_arrays, strict=True)
+    }
+
+    out = events
+    for label, output_name in outputs.items():
+        overrides = {**(constants or {}), **((variations or {}).get(label) or {})}
+        label_columns = {
+            **columns,
+            **{name: np.full(n, value) for name, value in overrides.items()},
+        }
+        values = compiled.evaluate(label_columns, n)
+        out = ak.with_field(out, unflatten(values, counts), output_name)
+
+    return out
+
+
+def load_correction(path: str, name: str) -> CompiledCorrection:
+    """Return the named correction from ``path``, compiled once per process."""
+    return TABLE_CACHE.get_or_load(
+        path, ("correction", name), lambda: _compile_correction(path, name)
+    )
+
+
+def _compile_correction(path: str, name: str) -> CompiledCorrection:
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(Path(path), "rt", encoding="utf-8") as handle:
+        document = json.load(handle)
+
+    if "corrections" in document:
+        found = [c for c in document["corrections"] if c.get("name") == name]
+        if not found:
+            available = sorted(str(c.get("name")) for c in document["corrections"])
+            raise ValueError(
+                f"correction {name!r} not found in {path}; available: {available}"
+            )
+        spec = found[0]
+    elif document.get("name") == name:
+        spec = document
+    else:
+        raise ValueError(f"correction {name!r} not found in {path}")
+
+    inputs = tuple(
+        (str(item["name"]), str(item.get("type", "real")))
+        for item in spec.get("inputs", [])
+    )
+    compiler = _NodeCompiler(name, spec.get("generic_formulas") or [])
+    return CompiledCorrection(
+        name=name, inputs=inputs, evaluator=compiler.compile(spec["data"])
+    )
+
+
+class _NodeCompiler:
+    """Compile correction content nodes into ``_Evaluator`` closures."""
+
+    def __init__(self, correction: str, generic_formulas: list[dict[str, Any]]) -> None:
+        self.correction = correction
+        self.generic_formulas = generic_formulas
+
+    def compile(self, node: Any) -> _Evaluator:
+        if isinstance(node, (int, float)) and not isinstance(node, bool):
+            return _Constant(float(node))
+        if not isinstance(node, dict):
+            raise ValueError(
+                f"correction {self.correction!r} has an invalid node: {node!r}"
+            )
+
+        nodetype = node.get("nodetype")
+        if nodetype == "binning":
+            return self._binning([node["input"]], [node["edges"]], node)
+        if nodetype == "multibinning":
+            return self._binning(list(node["inputs"]), list(node["edges"]), node)
+        if nodetype == "category":
+            return self._category(node)
+        if nodetype == "formula":
+            return self._formula(node, parameters=node.get("parameters") or [])
+        if nodetype == "formularef":
+            return self._formula(
+                self.generic_formulas[int(node["index"])],
+                parameters=node.get("parameters") or [],
+            )
+        if nodetype == "transform":
+            return self._transform(node)
+        raise ValueError(
+            f"correction {self.correction!r} has unsupported node type {nodetype!r}"
+        )
+
+    def _binning(
+        self, inputs: list[str], edges: list[Any], node: dict[str, Any]
+    ) -> _Evaluator:
+        axis_edges = [_edges(axis) for axis in edges]
+        shape = tuple(len(axis) - 1 for axis in axis_edges)
+        children = [self.compile(child) for child in node["content"]]
+        if len(children) != math.prod(shape):
+            raise ValueError(
+                f"correction {self.correction!r} binning over {inputs} has "
+                f"{len(children)} content entries for {math.prod(shape)} bins"
+            )
+        flow = node.get("flow", "error")
+        flow_child = None if flow in ("clamp", "error") else self.compile(flow)
+        correction = self.correction
+
+        def evaluate(columns: dict[str, np.ndarray], n: int) -> np.ndarray:
+            indices: list[np.ndarray] = []
+            outside: np.ndarray = np.zeros(n, dtype=bool)
+            for name, edges_, nbins in zip(inputs, axis_edges, shape, strict=True):
+                values = np.asarray(columns[name], dtype=float)
+                index = np.searchsorted(edges_, values, side="right") - 1
+                unmatched = np.isnan(values) | (index < 0) | (index >= nbins)
+                if flow == "error" and np.any(unmatched):
+                    value = values[int(np.argmax(unmatched))]
+                    raise ValueError(
+                        f"correction {correction!r} input {name!r} value {value} "
+                        "is outside the binning"
+                    )
+                outside |= unmatched
+                indices.append(np.clip(index, 0, nbins - 1))
+            flat_index = np.asarray(np.ravel_multi_index(tuple(indices), shape))
+            if flow_child is None:
+                return _dispatch(children, flat_index, columns, n)
+            flat_index[outside] = len(children)
+            return _dispatch([*children, flow_child], flat_index, columns, n)
+
+        return evaluate
+
+    def _category(self, node: dict[str, Any]) -> _Evaluator:
+        name = node["input"]
+        items = node["content"]
+        keys = [item["key"] for item in items]
+        children = [self.compile(item["value"]) for item in items]
+        default = node.get("default")
+        default_child = None if default is None else self.compile(default)
+        order = np.argsort(np.asarray(keys), kind="stable")
+        sorted_keys = np.asarray(keys)[order]
+        correction = self.correction
+
+        def evaluate(columns: dict[str, np.ndarray], n: int) -> np.ndarray:
+            values = np.asarray(columns[name])
+            if sorted_keys.dtype.kind in "iuf":
+                values = values.astype(float)
+            else:
+                values = values.astype(str)
+            position = np.clip(
+                np.searchsorted(sorted_keys, values), 0, len(sorted_keys) - 1
+            )
+            matched = sorted_keys[position] == values
+            index = order[position]
+            if not np.all(matched):
+                if default_child is None:
+                    value = values[int(np.argmax(~matched))].item()
+                    raise ValueError(
+                        f"correction {correction!r} input {name!r} has no "
+                        f"category for {value!r}"
+                    )
+                index = np.where(matched, index, len(children))
+                return _dispatch([*children, default_child], index, columns, n)
+            return _dispatch(children, index, columns, n)
+
+        return evaluate
+
+    def _formula(self, node: dict[str, Any], *, parameters: list[Any]) -> _Evaluator:
+        if node.get("parser", "TFormula") != "TFormula":
+            raise ValueError(
+                f"correction {self.correction!r} formula parser "
+                f"{node.get('parser')!r} is not supported"
+            )
+        variables = list(node.get("variables") or [])
+        code = _compile_tformula(
+            str(node["expression"]),
+            n_variables=len(variables),
+            parameters=[float(value) for value in parameters],
+            correction=self.correction,
+        )
+
+        def evaluate(columns: dict[str, np.ndarray], n: int) -> np.ndarray:
+            scope: dict[str, Any] = dict(_FORMULA_FUNCTIONS)
+            for index, name in enumerate(variables):
+                scope[_FORMULA_VARIABLES[index]] = np.asarray(
+                    columns[name], dtype=float
+                )
+            return np.broadcast_to(
+                np.asarray(eval(code, {"__builtins__": {}}, scope), dtype=float), (n,)
+            )
+
+        return evaluate
+
+    def _transform(self, node: dict[str, Any]) -> _Evaluator:
+        name = node["input"]
+        rule = self.compile(node["rule"])
+        content = self.compile(node["content"])
+
+        def evaluate(columns: dict[str, np.ndarray], n: int) -> np.ndarray:
+            return content({**columns, name: rule(columns, n)}, n)
+
+        return evaluate
+
+
+@dataclass(frozen=True, slots=True)
+class _Constant:
+    value: float
+
+    def __call__(self, columns: dict[str, np.ndarray], n: int) -> np.ndarray:
+        del columns
+        return np.full(n, self.value)
+
+
+def _dispatch(
+    children: list[_Evaluator],
+    index: np.ndarray,
+    columns: dict[str, np.ndarray],
+    n: int,
+) -> np.ndarray:
+    """Evaluate ``children[index[i]]`` for every row ``i``."""
+    constants = [child for child in children if isinstance(child, _Constant)]
+    if len(constants) == len(children):
+        return np.asarray([child.value for child in constants])[index]
+
+    # Group the rows by child with one stable sort rather than a mask per child.
+    order = np.argsort(index, kind="stable")
+    groups = np.split(order, np.flatnonzero(np.diff(index[order])) + 1)
+    out: np.ndarray = np.empty(n, dtype=float)
+    for rows in groups:
+        if not len(rows):
+            continue
+        subset = {name: values[rows] for name, values in columns.items()}
+        out[rows] = children[int(index[rows[0]])](subset, len(rows))
+    return out
+
+
+def _edges(edges: Any) -> np.ndarray:
+    if isinstance(edges, dict):
+        return np.linspace(
+            float(edges["low"]), float(edges["high"]), int(edges["n"]) + 1
+        )
+    return np.asarray(edges, dtype=float)
+
+
+def _flat_input(array: ak.Array, *, name: str, field: str) -> np.ndarray:
+    try:
+        return np.asarray(ak.to_numpy(array))
+    except Exception as exc:
+        raise ValueError(
+            f"correction input {name!r} field {field!r} must be numeric, with one "
+            "value or one list of values per event"
+        ) from exc
+
+
+_FORMULA_VARIABLES = ("x", "y", "z", "t")
+
+_FORMULA_FUNCTIONS: dict[str, Any] = {
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "fabs": np.abs,
+    "pow": np.power,
+    "max": np.maximum,
+    "min": np.minimum,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "atan2": np.arctan2,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "erf": np.vectorize(math.erf, otypes=[float]),
+    "Exp": np.exp,
+    "Log": np.log,
+    "Log10": np.log10,
+    "Sqrt": np.sqrt,
+    "Abs": np.abs,
+    "Power": np.power,
+    "Max": np.maximum,
+    "Min": np.minimum,
+    "Erf": np.vectorize(math.erf, otypes=[float]),
+    "_and": np.logical_and,
+    "_or": np.logical_or,
+    "_not": np.logical_not,
+}
+
+_FORMULA_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Pow,
+    ast.USub,
+    ast.UAdd,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.Eq,
+    ast.NotEq,
+)
+
+
+def _compile_tformula(
+    expression: str,
+    *,
+    n_variables: int,
+    parameters: list[float],
+    correction: str,
+) -> Any:
+    """
+    Compile a TFormula expression to a code object over NumPy arrays.
+
+    ``x``/``y``/``z``/``t`` are the formula variables and ``[i]`` its
+    parameters, which are substituted as literals. ``&&``, ``||`` and ``!``
+    become element-wise logical functions and chained comparisons are split,
+    so the result is valid for whole columns.
+    """
+
+    def parameter(match: re.Match[str]) -> str:
+        index = int(match.group(1))
+        if index >= len(parameters):
+            raise ValueError(
+                f"correction {correction!r} formula {expression!r} uses "
+                f"parameter [{index}] but only {len(parameters)} are given"
+            )
+        return f"({parameters[index]!r})"
+
+    source = re.sub(r"\[(\d+)\]", parameter, expression.replace("TMath::", ""))
+    source = source.replace("^", "**").replace("&&", " and ").replace("||", " or ")
+    source = re.sub(r"!(?!=)", "~", source)
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(
+            f"correction {correction!r} formula {expression!r} is not valid"
+        ) from exc
+
+    tree = ast.fix_missing_locations(_ElementwiseLogic().visit(tree))
+    allowed_names = set(_FORMULA_FUNCTIONS) | set(_FORMULA_VARIABLES[:n_variables])
+    for node in ast.walk(tree):
+        if not isinstance(node, _FORMULA_NODES):
+            raise ValueError(
+                f"correction {correction!r} formula {expression!r} uses "
+                f"unsupported syntax {type(node).__name__}"
+            )
+        if isinstance(node, ast.Name) and node.id not in allowed_names:
+            raise ValueError(
+                f"correction {correction!r} formula {expression!r} uses "
+                f"unknown name {node.id!r}"
+            )
+    return compile(tree, "<formula>", "eval")
+
+
+class _ElementwiseLogic(ast.NodeTransformer):
+    """Rewrite boolean logic and chained comparisons as NumPy calls."""
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        func = "_and" if isinstance(node.op, ast.And) else "_or"
+        out = node.values[0]
+        for value in node.values[1:]:
+            out = _call(func, out, value)
+        return out
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, (ast.Not, ast.Invert)):
+            return _call("_not", node.operand)
+        return node
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        operands = [node.left, *node.comparators]
+        parts = [
+            ast.Compare(left=left, ops=[op], comparators=[right])
+            for left, op, right in zip(operands, node.ops, operands[1:], strict=False)
+        ]
+        out: ast.expr = parts[0]
+        for part in parts[1:]:
+            out = _call("_and", out, part)
+        return out
+
+
+def _call(name: str, *args: ast.expr) -> ast.Call:
+    return ast.Call(
+        func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[]
+    )
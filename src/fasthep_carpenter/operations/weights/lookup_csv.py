@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import json
+import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -9,12 +13,23 @@ import numpy as np
 from hepflow.model.data_flow import DataDependencyResult
 from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 
+from fasthep_carpenter.operations.weights._broadcast import (
+    broadcast_flatten,
+    unflatten,
+)
+from fasthep_carpenter.operations.weights.table_cache import (
+    TABLE_CACHE,
+    file_fingerprint,
+)
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
 )
 from fasthep_carpenter.runtime.stream_readers import get_stream_array
 
+OUT_OF_RANGE_POLICIES = ("error", "clamp", "default")
+
 LOOKUP_CSV_SPEC = {
     "name": "hep.weights.lookup_csv",
     "kind": "transform",
@@ -22,10 +37,19 @@ LOOKUP_CSV_SPEC = {
     "input": {"name": "stream", "kind": "event_stream", "required": True},
     "params": {
         "path": {"type": "string", "required": True},
-        "variable": {"type": "string", "required": True},
+        "variable": {"type": "string", "required": False, "default": None},
         "bins": {"type": "mapping", "required": False},
+        "axes": {"type": "list[mapping]", "required": False, "default": None},
         "values": {"type": "mapping", "required": True},
         "outputs": {"type": "mapping", "required": True},
+        "out_of_range": {
+            "type": "string",
+            "required": False,
+            "default": "error",
+            "allowed": list(OUT_OF_RANGE_POLICIES),
+        },
+        "default_value": {"type": "number", "required": False, "default": 1.0},
+        "sidecar": {"type": "boolean", "required": False, "default": False},
     },
     "result": {
         "kind": "event_stream",
@@ -33,7 +57,8 @@ LOOKUP_CSV_SPEC = {
     },
     "requires": {
         "symbols": [
-            {"from": "params.variable", "kind": "expr_or_field"},
+            {"from": "params.variable", "kind": "field_list"},
+            {"from": "params.axes.*.variable", "kind": "field_list"},
         ]
     },
     "provides": {
@@ -44,14 +69,26 @@ LOOKUP_CSV_SPEC = {
 }
 
 
+@dataclass(frozen=True, slots=True)
+class _LookupTable:
+    """Dense lookup grid: ``edges[i]`` bins axis ``i`` of every ``values`` array."""
+
+    edges: tuple[np.ndarray, ...]
+    values: dict[str, np.ndarray]
+
+
 def parse_lookup_csv_dependencies(
     params: dict[str, Any],
     **_: Any,
 ) -> DataDependencyResult:
     result = DataDependencyResult()
-    variable = params.get("variable")
-    if isinstance(variable, str) and variable:
-        result.consumes.add(variable)
+    variables = [params.get("variable")]
+    for axis in params.get("axes") or []:
+        if isinstance(axis, dict):
+            variables.append(axis.get("variable"))
+    for variable in variables:
+        if isinstance(variable, str) and variable:
+            result.consumes.add(variable)
 
     outputs = params.get("outputs") or {}
     if isinstance(outputs, dict):
@@ -71,22 +108,31 @@ def run_lookup_csv(
     out = apply_lookup_csv(
         events,
         path=params["path"],
-        variable=params["variable"],
+        variable=params.get("variable"),
         bins=dict(params.get("bins") or {}),
+        axes=params.get("axes"),
         values=dict(params["values"]),
         outputs=dict(params["outputs"]),
+        out_of_range=params.get("out_of_range", "error"),
+        default_value=params.get("default_value", 1.0),
+        sidecar=bool(params.get("sidecar", False)),
     )
     return {DEFAULT_PRIMARY_STREAM_ID: out}
 
 
+@chunkwise
 def run_lookup_csv_transform(
     *,
     stream: Any,
     path: str,
-    variable: str,
     values: dict[str, str],
     outputs: dict[str, str],
+    variable: str | None = None,
     bins: dict[str, str] | None = None,
+    axes: list[dict[str, Any]] | None = None,
+    out_of_range: str = "error",
+    default_value: float = 1.0,
+    sidecar: bool = False,
     ctx: dict[str, Any] | None = None,
     **kwargs: Any,
 ) -> dict[str, ak.Array]:
@@ -98,8 +144,12 @@ def run_lookup_csv_transform(
             "path": path,
             "variable": variable,
             "bins": dict(bins or {}),
+            "axes": axes,
             "values": values,
             "outputs": outputs,
+            "out_of_range": out_of_range,
+            "default_value": default_value,
+            "sidecar": sidecar,
         },
         ctx=dict(ctx or {}),
         **kwargs,
@@ -111,41 +161,132 @@ def apply_lookup_csv(
     events: ak.Array,
     *,
     path: str,
-    variable: str,
-    bins: dict[str, str],
     values: dict[str, str],
     outputs: dict[str, str],
+    variable: str | None = None,
+    bins: dict[str, str] | None = None,
+    axes: list[dict[str, Any]] | None = None,
+    out_of_range: str = "error",
+    default_value: float = 1.0,
+    sidecar: bool = False,
 ) -> ak.Array:
     """
-    Add lookup weights from a one-dimensional CSV bin table.
+    Add lookup weights from a binned CSV table with one or more axes.
 
     First-pass assumptions:
-    - ``variable`` names one scalar numeric event field.
-    - bins are half-open ``lower <= value < upper`` ranges.
-    - bin column names default to ``pt_min``/``pt_max``; if ``bins.column`` is
+    - either ``variable`` (with optional ``bins``) describes a single axis, or
+      ``axes`` lists one mapping per axis with a ``variable`` field, the bin
+      columns in the same form as ``bins`` and an optional ``abs: true`` to
+      look up ``|variable|``.
+    - each CSV row is one cell of the grid; per axis, bins are half-open
+      ``lower <= value < upper`` ranges that tile one contiguous range, every
+      cell appears exactly once and rows may appear in any order.
+    - bin column names default to ``pt_min``/``pt_max``; if ``column`` is
       provided, ``<column>_min``/``<column>_max`` are used.
+    - variables are numeric event fields, either one value per event or one
+      list per event (e.g. per muon); axis variables are broadcast together
+      and the outputs take their shape.
+    - ``out_of_range`` handles values outside the grid: ``error`` raises,
+      ``clamp`` uses the nearest edge bin and ``default`` writes
+      ``default_value``.
     - ``values`` maps labels such as ``nominal``/``up``/``down`` to CSV columns.
     - ``outputs`` maps those same labels to event field names.
+    - parsed tables are cached per process (see ``TABLE_CACHE``); with
+      ``sidecar`` the parsed grid is also stored in an ``.npz`` file next to
+      the CSV so new processes can skip parsing.
     """
-    table = _load_lookup_table(path, bins=bins, value_columns=values)
-    variable_values = _flat_numeric_event_field(events, variable)
+    if out_of_range not in OUT_OF_RANGE_POLICIES:
+        raise ValueError(
+            f"lookup_csv out_of_range must be one of {list(OUT_OF_RANGE_POLICIES)}, "
+            f"got {out_of_range!r}"
+        )
+    axis_specs = _axis_specs(variable=variable, bins=bins, axes=axes)
+    table = _load_lookup_table(
+        path,
+        bin_columns=[_bin_columns(axis) for axis in axis_specs],
+        value_columns=values,
+        sidecar=sidecar,
+    )
+    flat_values, counts = _flatten_axis_variables(events, axis_specs)
+    indices, unmatched = _bin_indices(
+        flat_values,
+        table.edges,
+        variables=[str(axis["variable"]) for axis in axis_specs],
+        out_of_range=out_of_range,
+    )
 
     out = events
     for label, output_name in outputs.items():
         value_column = values.get(label)
         if value_column is None:
             raise ValueError(f"outputs.{label} has no matching values entry")
-        looked_up = _lookup_values(variable_values, table, value_column)
-        out = ak.with_field(out, ak.Array(looked_up), output_name)
+        looked_up = table.values[value_column][indices]
+        if unmatched is not None:
+            looked_up = np.where(unmatched, float(default_value), looked_up)
+        out = ak.with_field(out, unflatten(looked_up, counts), output_name)
 
     return out
 
 
+def _axis_specs(
+    *,
+    variable: str | None,
+    bins: dict[str, str] | None,
+    axes: list[dict[str, Any]] | None,
+) -> list[dict[str, Any]]:
+    if axes and variable:
+        raise ValueError("lookup_csv takes either variable or axes, not both")
+    if not axes:
+        if not variable:
+            raise ValueError("lookup_csv requires either variable or axes")
+        return [{**(bins or {}), "variable": variable}]
+
+    for index, axis in enumerate(axes):
+        if not isinstance(axis, dict) or not axis.get("variable"):
+            raise ValueError(
+                f"lookup_csv axes[{index}] must be a mapping with a variable"
+            )
+    return [dict(axis) for axis in axes]
+
+
 def _load_lookup_table(
-    path: str, *, bins: dict[str, str], value_columns: dict[str, str]
-) -> dict[str, np.ndarray]:
-    lower_column, upper_column = _bin_columns(bins)
-    required = {lower_column, upper_column, *value_columns.values()}
+    path: str,
+    *,
+    bin_columns: list[tuple[str, str]],
+    value_columns: dict[str, str],
+    sidecar: bool = False,
+) -> _LookupTable:
+    key = (
+        "lookup_csv",
+        tuple(bin_columns),
+        tuple(sorted(set(value_columns.values()))),
+    )
+
+    def load() -> _LookupTable:
+        if not sidecar:
+            return _parse_lookup_table(
+                path, bin_columns=bin_columns, value_columns=value_columns
+            )
+        sidecar_path = _sidecar_path(path, key)
+        table = _read_sidecar(sidecar_path, source=path, columns=key[2])
+        if table is None:
+            table = _parse_lookup_table(
+                path, bin_columns=bin_columns, value_columns=value_columns
+            )
+            _write_sidecar(sidecar_path, table, source=path)
+        return table
+
+    return TABLE_CACHE.get_or_load(path, key, load)
+
+
+def _parse_lookup_table(
+    path: str,
+    *,
+    bin_columns: list[tuple[str, str]],
+    value_columns: dict[str, str],
+) -> _LookupTable:
+    required = {column for pair in bin_columns for column in pair}
+    required.update(value_columns.values())
 
     rows: list[dict[str, str]] = []
     with Path(path).open(newline="", encoding="utf-8") as handle:
@@ -158,15 +299,117 @@ def _load_lookup_table(
     if not rows:
         raise ValueError("CSV lookup table has no rows")
 
-    table: dict[str, np.ndarray] = {}
-    for column in required:
-        table[column] = np.asarray([float(row[column]) for row in rows], dtype=float)
-    table["__lower__"] = table[lower_column]
-    table["__upper__"] = table[upper_column]
+    columns = {
+        column: np.asarray([float(row[column]) for row in rows], dtype=float)
+        for column in required
+    }
+
+    edges: list[np.ndarray] = []
+    cell_indices: list[np.ndarray] = []
+    for lower_column, upper_column in bin_columns:
+        axis_edges = _axis_edges(columns[lower_column], columns[upper_column])
+        edges.append(axis_edges)
+        cell_indices.append(
+            np.asarray(np.searchsorted(axis_edges, columns[lower_column]))
+        )
+
+    shape = tuple(len(axis_edges) - 1 for axis_edges in edges)
+    cells = np.ravel_multi_index(tuple(cell_indices), shape)
+    counts = np.bincount(cells, minlength=int(np.prod(shape)))
+    if np.any(counts != 1):
+        bad = int(np.argmax(counts != 1))
+        bounds = ", ".join(
+            f"[{axis_edges[i]}, {axis_edges[i + 1]})"
+            for axis_edges, i in zip(edges, np.unravel_index(bad, shape), strict=True)
+        )
+        problem = "is missing from" if counts[bad] == 0 else "appears more than once in"
+        raise ValueError(f"CSV lookup bin {bounds} {problem} the table")
+
+    dense: dict[str, np.ndarray] = {}
+    for column in set(value_columns.values()):
+        grid: np.ndarray = np.empty(shape, dtype=float)
+        grid.reshape(-1)[cells] = columns[column]
+        dense[column] = grid
+    return _read_only(_LookupTable(edges=tuple(edges), values=dense))
+
+
+def _read_only(table: _LookupTable) -> _LookupTable:
+    for array in (*table.edges, *table.values.values()):
+        array.flags.writeable = False
     return table
 
 
-def _bin_columns(bins: dict[str, str]) -> tuple[str, str]:
+def _sidecar_path(path: str, key: tuple[Any, ...]) -> Path:
+    digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()[:16]
+    csv_path = Path(path)
+    return csv_path.with_name(f"{csv_path.name}.{digest}.npz")
+
+
+def _read_sidecar(
+    sidecar_path: Path, *, source: str, columns: tuple[str, ...]
+) -> _LookupTable | None:
+    """Load a sidecar written for the current version of ``source``, if any."""
+    try:
+        with np.load(sidecar_path, allow_pickle=False) as stored:
+            if stored["source"].tolist() != list(file_fingerprint(source)[1:]):
+                return None
+            if tuple(stored["value_columns"].tolist()) != columns:
+                return None
+            edges = tuple(stored[f"edges_{i}"] for i in range(int(stored["ndim"])))
+            values = {column: stored[f"values_{i}"] for i, column in enumerate(columns)}
+    except (OSError, KeyError, ValueError):
+        return None
+    return _read_only(_LookupTable(edges=edges, values=values))
+
+
+def _write_sidecar(sidecar_path: Path, table: _LookupTable, *, source: str) -> None:
+    columns = sorted(table.values)
+    arrays = {
+        "source": np.asarray(file_fingerprint(source)[1:], dtype=np.int64),
+        "ndim": np.asarray(len(table.edges)),
+        "value_columns": np.asarray(columns),
+        **{f"edges_{i}": edges for i, edges in enumerate(table.edges)},
+        **{f"values_{i}": table.values[column] for i, column in enumerate(columns)},
+    }
+    tmp_path = sidecar_path.with_name(f"{sidecar_path.name}.{os.getpid()}.tmp.npz")
+    try:
+        np.savez(tmp_path, **arrays)
+        tmp_path.replace(sidecar_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _axis_edges(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Return the edges of one axis from the bins of every grid cell."""
+    pairs = np.unique(np.stack([lower, upper], axis=1), axis=0)
+    if len(np.unique(pairs[:, 0])) != len(pairs):
+        bad = int(np.argmax(pairs[1:, 0] == pairs[:-1, 0]))
+        raise ValueError(
+            f"CSV lookup bin [{pairs[bad, 0]}, {pairs[bad, 1]}) overlaps "
+            f"[{pairs[bad + 1, 0]}, {pairs[bad + 1, 1]})"
+        )
+    return _bin_edges(pairs[:, 0], pairs[:, 1])
+
+
+def _bin_edges(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Return the ``n + 1`` edges of sorted bins, checking they tile one range."""
+    if not np.all(upper > lower):
+        bad = int(np.argmax(~(upper > lower)))
+        raise ValueError(
+            f"CSV lookup bin [{lower[bad]}, {upper[bad]}) must have upper > lower"
+        )
+    gaps = np.nonzero(upper[:-1] != lower[1:])[0]
+    if len(gaps):
+        bad = int(gaps[0])
+        raise ValueError(
+            "CSV lookup bins must be contiguous and non-overlapping: "
+            f"[{lower[bad]}, {upper[bad]}) is followed by "
+            f"[{lower[bad + 1]}, {upper[bad + 1]})"
+        )
+    return np.append(lower, upper[-1])
+
+
+def _bin_columns(bins: dict[str, Any]) -> tuple[str, str]:
     lower = bins.get("lower") or bins.get("min")
     upper = bins.get("upper") or bins.get("max")
     if lower and upper:
@@ -179,27 +422,60 @@ def _bin_columns(bins: dict[str, str]) -> tuple[str, str]:
     return "pt_min", "pt_max"
 
 
-def _flat_numeric_event_field(events: ak.Array, field: str) -> np.ndarray:
-    values = events[field]
+def _flatten_axis_variables(
+    events: ak.Array, axis_specs: list[dict[str, Any]]
+) -> tuple[list[np.ndarray], list[ak.Array]]:
+    """Flatten the axis variables to 1D arrays, taking ``abs`` where requested."""
+    flat_arrays, counts = broadcast_flatten(
+        [events[str(axis["variable"])] for axis in axis_specs]
+    )
+    flat_values = []
+    for axis, array in zip(axis_specs, flat_arrays, strict=True):
+        values = _flat_numeric(array, str(axis["variable"]))
+        flat_values.append(np.abs(values) if axis.get("abs") else values)
+    return flat_values, counts
+
+
+def _flat_numeric(array: ak.Array, field: str) -> np.ndarray:
     try:
-        return np.asarray(ak.to_numpy(values), dtype=float)
+        return np.asarray(ak.to_numpy(array), dtype=float)
     except Exception as exc:
         raise ValueError(
-            f"lookup_csv variable {field!r} must be one scalar numeric value per event"
+            f"lookup_csv variable {field!r} must be numeric, with one value "
+            "or one list of values per event"
         ) from exc
 
 
-def _lookup_values(
-    variable_values: np.ndarray, table: dict[str, np.ndarray], value_column: str
-) -> np.ndarray:
-    lower = table["__lower__"]
-    upper = table["__upper__"]
-    values = table[value_column]
-
-    output: np.ndarray = np.empty(len(variable_values), dtype=float)
-    for index, value in enumerate(variable_values):
-        matches = np.nonzero((lower <= value) & (value < upper))[0]
-        if len(matches) == 0:
-            raise ValueError(f"No CSV lookup bin matched value {value}")
-        output[index] = values[int(matches[0])]
-    return output
+def _bin_indices(
+    flat_values: list[np.ndarray],
+    edges: tuple[np.ndarray, ...],
+    *,
+    variables: list[str],
+    out_of_range: str,
+) -> tuple[tuple[np.ndarray, ...], np.ndarray | None]:
+    """
+    Locate every value in its axis with ``searchsorted``.
+
+    Returns the per-axis bin indices, always valid for indexing the dense
+    grid, and under the ``default`` policy the mask of unmatched entries.
+    """
+    indices: list[np.ndarray] = []
+    unmatched_any: np.ndarray | None = None
+    for values, axis_edges, variable in zip(flat_values, edges, variables, strict=True):
+        nbins = len(axis_edges) - 1
+        index = np.searchsorted(axis_edges, values, side="right") - 1
+        nan = np.isnan(values)
+        unmatched = nan | (index < 0) | (index >= nbins)
+        if out_of_range == "error" or (out_of_range == "clamp" and np.any(nan)):
+            bad = unmatched if out_of_range == "error" else nan
+            if np.any(bad):
+                value = values[int(np.argmax(bad))]
+                raise ValueError(
+                    f"No CSV lookup bin matched value {value} of {variable!r}"
+                )
+        elif out_of_range == "default":
+            unmatched_any = (
+                unmatched if unmatched_any is None else unmatched_any | unmatched
+            )
+        indices.append(np.clip(index, 0, nbins - 1))
+    return tuple(indices), unmatched_any
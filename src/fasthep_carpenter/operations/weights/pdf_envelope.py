@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import warnings
 from typing import Any
 
 import awkward as ak
+import numpy as np
 from hepflow.model.data_flow import DataDependencyResult
 from hepflow.model.defaults import DEFAULT_PRIMARY_STREAM_ID
 
+from fasthep_carpenter.runtime.chunked import chunkwise
 from fasthep_carpenter.runtime.compat import (
     legacy_data_envelope,
     unwrap_legacy_data_envelope,
 )
 from fasthep_carpenter.runtime.stream_readers import get_stream_array
 
+PDF_ENVELOPE_METHODS = ("envelope", "hessian", "replicas", "scale")
+
+# 7-point muR/muF variations in the usual 9-entry LHEScaleWeight order
+# (muR, muF) = (0.5, 0.5), (0.5, 1), (0.5, 2), (1, 0.5), (1, 1), ..., (2, 2),
+# dropping the anti-correlated (0.5, 2) and (2, 0.5) entries.
+SCALE_7POINT_MEMBERS = (0, 1, 3, 4, 5, 7, 8)
+
 PDF_ENVELOPE_SPEC = {
     "name": "hep.weights.pdf_envelope",
     "kind": "transform",
@@ -20,6 +30,16 @@ PDF_ENVELOPE_SPEC = {
     "params": {
         "inputs": {"type": "string", "required": True},
         "outputs": {"type": "mapping", "required": True},
+        "method": {
+            "type": "string",
+            "required": False,
+            "default": "envelope",
+            "allowed": ["envelope", "hessian", "replicas", "scale"],
+        },
+        "nominal": {"type": "integer", "required": False, "default": 0},
+        "members": {"type": "list[integer]", "required": False, "default": None},
+        "alphas": {"type": "list[integer]", "required": False, "default": None},
+        "n_members": {"type": "integer", "required": False, "default": None},
     },
     "result": {
         "kind": "event_stream",
@@ -66,15 +86,26 @@ def run_pdf_envelope(
         events,
         inputs=params["inputs"],
         outputs=dict(params["outputs"]),
+        method=params.get("method", "envelope"),
+        nominal=params.get("nominal", 0),
+        members=params.get("members"),
+        alphas=params.get("alphas"),
+        n_members=params.get("n_members"),
     )
     return {DEFAULT_PRIMARY_STREAM_ID: out}
 
 
+@chunkwise
 def run_pdf_envelope_transform(
     *,
     stream: Any,
     inputs: str,
     outputs: dict[str, str],
+    method: str = "envelope",
+    nominal: int = 0,
+    members: list[int] | None = None,
+    alphas: list[int] | None = None,
+    n_members: int | None = None,
     ctx: dict[str, Any] | None = None,
     **kwargs: Any,
 ) -> dict[str, ak.Array]:
@@ -82,7 +113,15 @@ def run_pdf_envelope_transform(
     legacy_data = legacy_data_envelope(stream)
     out = run_pdf_envelope(
         data=legacy_data,
-        params={"inputs": inputs, "outputs": outputs},
+        params={
+            "inputs": inputs,
+            "outputs": outputs,
+            "method": method,
+            "nominal": nominal,
+            "members": members,
+            "alphas": alphas,
+            "n_members": n_members,
+        },
         ctx=dict(ctx or {}),
         **kwargs,
     )
@@ -90,25 +129,151 @@ def run_pdf_envelope_transform(
 
 
 def apply_pdf_envelope(
-    events: ak.Array, *, inputs: str, outputs: dict[str, str]
+    events: ak.Array,
+    *,
+    inputs: str,
+    outputs: dict[str, str],
+    method: str = "envelope",
+    nominal: int = 0,
+    members: list[int] | None = None,
+    alphas: list[int] | None = None,
+    n_members: int | None = None,
 ) -> ak.Array:
     """
-    Add per-event PDF envelope fields.
+    Add per-event PDF or scale uncertainty weight fields.
 
     First-pass assumptions:
-    - ``inputs`` names an array-like field containing PDF weights per event.
-    - ``outputs.up`` receives ``max(inputs)`` per event.
-    - ``outputs.down`` receives ``min(inputs)`` per event.
+    - ``inputs`` names an array-like field containing weights per event, e.g.
+      ``LHEPdfWeight`` or ``LHEScaleWeight``; it is converted once to a 2D
+      block ``n_members`` wide (default: the longest list in the chunk),
+      padding shorter lists with NaN, which every statistic ignores.
+    - ``method`` selects the statistic over the ``members`` columns:
+      - ``envelope``: ``up``/``down`` are the max/min, ``std`` the spread.
+      - ``scale``: the same over the 7-point muR/muF members by default.
+      - ``hessian``: ``std = sqrt(sum((w_i - w_nominal) ** 2))``.
+      - ``replicas``: ``std`` is the sample standard deviation of the
+        replicas.
+      For ``hessian`` and ``replicas``, ``up``/``down`` are
+      ``w_nominal +/- std`` and ``members`` defaults to every column except
+      ``nominal`` and ``alphas``.
+    - ``alphas`` optionally gives the ``[down, up]`` alpha_s columns; half
+      their difference is added to ``std`` in quadrature.
+    - events without usable weights (e.g. an empty list) get ``None`` in
+      every output, as ``ak.max``/``ak.min`` give for an empty list.
+    - ``outputs`` maps any of ``up``/``down``/``std`` to event field names.
     """
-    weights = events[inputs]
+    if method not in PDF_ENVELOPE_METHODS:
+        raise ValueError(
+            f"pdf_envelope method must be one of {list(PDF_ENVELOPE_METHODS)}, "
+            f"got {method!r}"
+        )
+    if alphas is not None and method not in ("hessian", "replicas"):
+        raise ValueError("pdf_envelope alphas requires method hessian or replicas")
+    if alphas is not None and len(alphas) != 2:
+        raise ValueError(
+            f"pdf_envelope alphas must list the [down, up] members, got {alphas!r}"
+        )
+
+    block = _weight_block(events[inputs], n_members)
+    if block.shape[1] == 0:
+        # No event in this chunk has weights.
+        up = down = std = np.full(len(block), np.nan)
+    else:
+        columns = _member_columns(
+            block.shape[1],
+            method=method,
+            nominal=nominal,
+            members=members,
+            alphas=alphas,
+        )
+        with warnings.catch_warnings():
+            # All-NaN rows (events without weights) are masked below.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            up, down, std = _block_statistics(
+                block, columns, method=method, nominal=nominal, alphas=alphas
+            )
+
+    results = {
+        "up": ak.Array(np.ma.masked_invalid(up)),
+        "down": ak.Array(np.ma.masked_invalid(down)),
+        "std": ak.Array(np.ma.masked_invalid(std)),
+    }
     out = events
+    for label, output_name in outputs.items():
+        if label not in results:
+            raise ValueError(
+                f"pdf_envelope outputs.{label} must be one of {sorted(results)}"
+            )
+        if output_name:
+            out = ak.with_field(out, results[label], output_name)
+    return out
 
-    up = outputs.get("up")
-    if up:
-        out = ak.with_field(out, ak.max(weights, axis=1), up)
 
-    down = outputs.get("down")
-    if down:
-        out = ak.with_field(out, ak.min(weights, axis=1), down)
+def _weight_block(weights: ak.Array, n_members: int | None) -> np.ndarray:
+    """Return the weights as a float ``(events, n_members)`` array."""
+    counts = np.asarray(ak.num(weights, axis=1))
+    width = int(n_members) if n_members is not None else int(counts.max(initial=0))
+    if len(counts) and np.all(counts == width):
+        flat = np.asarray(ak.to_numpy(ak.flatten(weights, axis=1)), dtype=float)
+        return flat.reshape(len(counts), width)
+    padded = ak.pad_none(weights, width, axis=1, clip=True)
+    return np.asarray(ak.to_numpy(ak.fill_none(padded, np.nan)), dtype=float).reshape(
+        len(counts), width
+    )
 
-    return out
+
+def _member_columns(
+    width: int,
+    *,
+    method: str,
+    nominal: int,
+    members: list[int] | None,
+    alphas: list[int] | None,
+) -> np.ndarray:
+    if members is not None:
+        columns = [int(member) for member in members]
+    elif method == "scale":
+        columns = list(SCALE_7POINT_MEMBERS)
+    elif method == "envelope":
+        columns = list(range(width))
+    else:
+        excluded = {nominal, *(alphas or [])}
+        columns = [index for index in range(width) if index not in excluded]
+
+    referenced = [*columns, *(alphas or [])]
+    if method in ("hessian", "replicas"):
+        referenced.append(nominal)
+    outside = [index for index in referenced if not 0 <= index < width]
+    if outside:
+        raise ValueError(
+            f"pdf_envelope members {outside} are outside the {width} weights per event"
+        )
+    return np.asarray(columns, dtype=int)
+
+
+def _block_statistics(
+    block: np.ndarray,
+    columns: np.ndarray,
+    *,
+    method: str,
+    nominal: int,
+    alphas: list[int] | None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    variations = block[:, columns]
+    if method in ("envelope", "scale"):
+        return (
+            np.nanmax(variations, axis=1),
+            np.nanmin(variations, axis=1),
+            np.nanstd(variations, axis=1),
+        )
+
+    central = block[:, nominal]
+    if method == "hessian":
+        std = np.sqrt(np.nansum((variations - central[:, None]) ** 2, axis=1))
+        std[np.isnan(central)] = np.nan
+    else:
+        std = np.nanstd(variations, axis=1, ddof=1)
+    if alphas is not None:
+        down, up = alphas
+        std = np.hypot(std, (block[:, up] - block[:, down]) / 2.0)
+    return central + std, central - std, std
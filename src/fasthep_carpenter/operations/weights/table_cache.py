@@ -0,0 +1,65 @@
+"""Process-wide cache of parsed correction tables."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any
+
+
+class TableCache:
+    """
+    In-memory LRU cache of parsed tables, shared by every partition in a process.
+
+    Entries are keyed by the resolved file path, its modification time and size,
+    and a caller-supplied key describing what was parsed (e.g. the requested
+    columns), so an edited file is re-parsed on its next use. Once more than
+    ``max_entries`` tables are held, the least recently used are dropped.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        if isinstance(max_entries, bool) or max_entries <= 0:
+            raise ValueError(
+                f"table cache max_entries must be positive, got {max_entries!r}"
+            )
+        self.max_entries = int(max_entries)
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_load(
+        self, path: str | Path, key: Hashable, load: Callable[[], Any]
+    ) -> Any:
+        """Return the table cached for ``(path, key)``, calling ``load`` on a miss."""
+        entry_key = (*file_fingerprint(path), key)
+        with self._lock:
+            if entry_key in self._entries:
+                self._entries.move_to_end(entry_key)
+                return self._entries[entry_key]
+
+        value = load()
+        with self._lock:
+            self._entries[entry_key] = value
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def file_fingerprint(path: str | Path) -> tuple[str, int, int]:
+    """Return ``(resolved path, mtime in ns, size)`` for a local file."""
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    return str(resolved), stat.st_mtime_ns, stat.st_size
+
+
+TABLE_CACHE = TableCache()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import Any
 
 import awkward as ak
 
+from fasthep_carpenter.runtime.chunked import is_chunked, map_aligned_chunks
+
 ZIP_JOIN_SPEC = {
     "name": "hep.zip_join",
     "kind": "transform",
@@ -24,10 +27,14 @@ def run_zip_join(
     on_mismatch: str = "error",
     inputs: list[dict[str, str]],
     **streams: Any,
-) -> ak.Array:
+) -> Any:
     """
     Zip multiple event streams into one.
 
+    Chunked inputs (a ``ChunkedArray`` or a streamed iterator) are zipped
+    chunk by chunk and give a chunked result of the same kind; their chunks
+    must line up.
+
     Parameters
     ----------
     streams:
@@ -35,8 +42,7 @@ def run_zip_join(
     inputs:
         [{name: ..., prefix: ...}]
     """
-    parts: dict[str, ak.Array] = {}
-    lens: list[int] = []
+    parts: dict[str, Any] = {}
 
     for inp in inputs:
         name = inp["name"]
@@ -45,23 +51,28 @@ def run_zip_join(
         if name not in streams:
             raise ValueError(f"Missing input stream '{name}'")
 
-        arr = streams[name]
-        arr = _normalise_stream(arr)
+        parts[prefix] = _normalise_stream(streams[name])
 
-        parts[prefix] = arr
-        lens.append(len(arr))
+    zip_parts = partial(_zip_parts, on_mismatch=on_mismatch)
+    if any(is_chunked(arr) for arr in parts.values()):
+        return map_aligned_chunks(zip_parts, parts, name="zip_join")
+    return zip_parts(parts)
 
+
+def _zip_parts(parts: dict[str, ak.Array], *, on_mismatch: str) -> ak.Array:
+    lens = [len(arr) for arr in parts.values()]
     if len(set(lens)) != 1:
         if on_mismatch == "error":
             raise ValueError(f"zip_join length mismatch: {lens}")
         raise ValueError(f"Unsupported on_mismatch mode: {on_mismatch}")
-
     return ak.zip(parts, depth_limit=1)
 
 
-def _normalise_stream(stream: Any) -> ak.Array:
-    if isinstance(stream, ak.Array):
+def _normalise_stream(stream: Any) -> Any:
+    if is_chunked(stream) or isinstance(stream, ak.Array):
         return stream
     if isinstance(stream, dict):
         return ak.Array(stream)
-    raise TypeError("zip_join expects awkward.Array or dict[str, array-like]")
+    raise TypeError(
+        "zip_join expects awkward.Array, dict[str, array-like] or a chunked stream"
+    )
@@ -10,6 +10,8 @@ from hepflow.build_layout import BuildPaths
 from hepflow.runtime.materialize import product_id
 from hepflow.utils import write_json, write_pickle
 
+from fasthep_carpenter.runtime.chunked import ChunkedArray
+
 
 def merge_event_streams(
     values: list[Any],
@@ -24,6 +26,12 @@ def merge_event_streams(
         return values[0]
     if dataset_name is None:
         return list(values)
+    if any(isinstance(value, ChunkedArray) for value in values):
+        return ChunkedArray(
+            chunk
+            for value in values
+            for chunk in (value if isinstance(value, ChunkedArray) else [value])
+        )
     if all(isinstance(value, ak.Array) for value in values):
         return ak.concatenate(values)
     return list(values)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+import awkward as ak
+import numpy as np
+
+from fasthep_carpenter.runtime.compat import unwrap_legacy_data_envelope
+
+
+class ChunkedArray:
+    """
+    An event stream held as a sequence of arrays, e.g. one per input file.
+
+    The chunks are never concatenated implicitly: transforms decorated with
+    :func:`chunkwise` run once per chunk, and :meth:`concatenate` builds a
+    single ``awkward.Array`` only when a caller asks for one. ``offsets`` is
+    the length index, the global entry number at which each chunk starts.
+    """
+
+    __slots__ = ("_chunks", "_offsets")
+
+    def __init__(self, chunks: Iterable[Any]) -> None:
+        self._chunks = tuple(chunks)
+        self._offsets: np.ndarray = np.zeros(len(self._chunks) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in self._chunks], out=self._offsets[1:])
+
+    @property
+    def chunks(self) -> tuple[Any, ...]:
+        return self._chunks
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self._offsets
+
+    @property
+    def fields(self) -> list[str]:
+        return list(self._chunks[0].fields) if self._chunks else []
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._chunks)
+
+    def __getitem__(self, where: Any) -> ChunkedArray:
+        if not isinstance(where, str):
+            raise TypeError(
+                "ChunkedArray only supports field access; call concatenate() "
+                f"before indexing with {type(where).__name__}"
+            )
+        return ChunkedArray(chunk[where] for chunk in self._chunks)
+
+    def __repr__(self) -> str:
+        return f"<ChunkedArray of {len(self._chunks)} chunks, {len(self)} entries>"
+
+    def locate(self, entry: int) -> tuple[int, int]:
+        """Return ``(chunk index, local entry)`` for a global entry number."""
+        if not 0 <= entry < len(self):
+            raise IndexError(f"entry {entry} out of range for {len(self)} entries")
+        index = int(np.searchsorted(self._offsets, entry, side="right")) - 1
+        return index, int(entry - self._offsets[index])
+
+    def map(self, func: Callable[[Any], Any]) -> ChunkedArray:
+        return ChunkedArray(func(chunk) for chunk in self._chunks)
+
+    def concatenate(self) -> ak.Array:
+        if len(self._chunks) == 1:
+            return self._chunks[0]
+        return ak.concatenate(self._chunks, axis=0)
+
+
+def concatenate_chunks(value: Any) -> Any:
+    """Return ``value`` as one array if it is a :class:`ChunkedArray`."""
+    if isinstance(value, ChunkedArray):
+        return value.concatenate()
+    return value
+
+
+def iter_chunks(value: Any) -> Iterable[Any]:
+    """Return the chunks of a :class:`ChunkedArray` or iterator, else ``[value]``."""
+    if isinstance(value, (ChunkedArray, Iterator)):
+        return value
+    return [value]
+
+
+def is_chunked(value: Any) -> bool:
+    """Return whether ``value`` is a :class:`ChunkedArray` or a streamed iterator."""
+    return isinstance(value, (ChunkedArray, Iterator))
+
+
+def map_aligned_chunks(
+    func: Callable[[dict[str, Any]], Any],
+    streams: dict[str, Any],
+    *,
+    name: str,
+) -> Any:
+    """
+    Apply ``func`` to the aligned chunks of several input streams.
+
+    The chunked inputs are advanced together, one chunk each per call; inputs
+    that are not chunked are sliced to the length of the current chunk. The
+    result is a generator if any input is a streamed iterator, else a
+    :class:`ChunkedArray`. ``name`` prefixes error messages.
+    """
+    results = (func(chunks) for chunks in _aligned_chunks(streams, name=name))
+    if any(isinstance(value, Iterator) for value in streams.values()):
+        return results
+    return ChunkedArray(results)
+
+
+def _aligned_chunks(
+    streams: dict[str, Any],
+    *,
+    name: str,
+) -> Iterator[dict[str, Any]]:
+    chunked = {key: iter(value) for key, value in streams.items() if is_chunked(value)}
+    start = 0
+    while True:
+        parts: dict[str, Any] = {key: next(it, None) for key, it in chunked.items()}
+        finished = sorted(key for key, part in parts.items() if part is None)
+        if finished:
+            if len(finished) != len(parts):
+                raise ValueError(
+                    f"{name} inputs {finished} ran out of chunks before the others"
+                )
+            break
+        length = len(next(iter(parts.values())))
+        yield {
+            key: parts[key] if key in parts else value[start : start + length]
+            for key, value in streams.items()
+        }
+        start += length
+
+    lengths = {
+        key: len(value) for key, value in streams.items() if not is_chunked(value)
+    }
+    if any(length != start for length in lengths.values()):
+        raise ValueError(f"{name} length mismatch: {lengths} vs {start} streamed")
+
+
+def chunkwise(
+    func: Callable[..., Any] | None = None,
+    *,
+    merge: Callable[[Iterable[Any]], Any] | None = None,
+) -> Any:
+    """
+    Run a ``stream`` transform once per chunk of a chunked input.
+
+    A :class:`ChunkedArray` input gives a new :class:`ChunkedArray` of
+    per-chunk results. An iterator input (a streamed source, see
+    ``step_size``) gives a generator that applies the transform as each chunk
+    is consumed, so only one chunk is held at a time; like its input it can
+    be consumed only once. Plain array inputs are passed through unchanged.
+
+    With ``merge``, the per-chunk results are passed to ``merge`` (e.g. to sum
+    histograms) instead; for iterator inputs ``merge`` receives a generator
+    and consumes the stream.
+    """
+    if func is None:
+        return functools.partial(chunkwise, merge=merge)
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        positional = bool(args)
+        if positional:
+            stream, args = args[0], args[1:]
+        else:
+            stream = kwargs.pop("stream")
+
+        def call(value: Any) -> Any:
+            if positional:
+                return func(value, *args, **kwargs)
+            return func(*args, stream=value, **kwargs)
+
+        chunked = unwrap_legacy_data_envelope(stream)
+        if isinstance(chunked, ChunkedArray):
+            results = [call(chunk) for chunk in chunked]
+            return ChunkedArray(results) if merge is None else merge(results)
+        if isinstance(chunked, Iterator):
+            if merge is not None:
+                return merge(_map_closing(call, chunked))
+            return _map_closing(
+                lambda chunk: unwrap_legacy_data_envelope(call(chunk)), chunked
+            )
+        return call(stream)
+
+    return wrapper
+
+
+def _map_closing(func: Callable[[Any], Any], chunks: Iterator[Any]) -> Iterator[Any]:
+    """Yield ``func`` of each chunk and close ``chunks`` when done or abandoned."""
+    try:
+        for chunk in chunks:
+            yield func(chunk)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import importlib
-from collections.abc import MutableMapping
+from collections.abc import Iterator, MutableMapping
 from typing import Any
 
+from fasthep_carpenter.runtime.chunked import ChunkedArray
+
 MISSING_CUPY_MESSAGE = (
     "gpu.preload requires CuPy. Install fasthep-carpenter[gpu] or ensure CuPy "
     "is available."
@@ -17,7 +19,8 @@ class GPUPreloadModifier:
     This is an execution modifier and intentionally mutates selected input fields
     in place where the stream container supports mutation. For immutable stream
     containers such as Awkward arrays, it replaces ``inputs["stream"]`` with an
-    equivalent stream carrying converted fields.
+    equivalent stream carrying converted fields. Chunked streams are converted
+    chunk by chunk; streamed iterators lazily, as each chunk is consumed.
     """
 
     def __init__(
@@ -49,6 +52,26 @@ class GPUPreloadModifier:
 
         cupy = _load_cupy()
         stream = inputs["stream"]
+        if isinstance(stream, ChunkedArray):
+            preloaded = [self._preload(chunk, node=node, cupy=cupy) for chunk in stream]
+            stream = ChunkedArray(chunk for chunk, _ in preloaded)
+            moved = list(dict.fromkeys(f for _, fields in preloaded for f in fields))
+        elif isinstance(stream, Iterator):
+            # Streamed chunks are converted as they are consumed.
+            stream = (self._preload(chunk, node=node, cupy=cupy)[0] for chunk in stream)
+            moved = list(self.fields)
+        else:
+            stream, moved = self._preload(stream, node=node, cupy=cupy)
+
+        inputs["stream"] = stream
+        _record_metadata(
+            ctx,
+            node_id=str(node.id),
+            fields=moved,
+            backend=self.backend,
+        )
+
+    def _preload(self, stream: Any, *, node: Any, cupy: Any) -> tuple[Any, list[str]]:
         moved: list[str] = []
         for field in self.fields:
             if not _has_field(stream, field):
@@ -58,14 +81,7 @@ class GPUPreloadModifier:
             converted = _to_gpu_array(_get_field(stream, field), field=field, cupy=cupy)
             stream = _set_field(stream, field, converted)
             moved.append(field)
-
-        inputs["stream"] = stream
-        _record_metadata(
-            ctx,
-            node_id=str(node.id),
-            fields=moved,
-            backend=self.backend,
-        )
+        return stream, moved
 
 
 def _normalise_fields(fields: list[str] | None) -> list[str]:
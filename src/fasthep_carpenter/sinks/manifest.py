@@ -0,0 +1,69 @@
+"""Writer manifest records shared by the file-writing sinks."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+
+def writer_manifest_record(
+    *,
+    kind: str,
+    output_path: Path,
+    entries: int | None,
+    size_bytes: int | None,
+    output_format: str,
+    ctx: dict[str, Any],
+    meta: dict[str, Any],
+    tree: str | None = None,
+    root_classname: str | None = None,
+) -> dict[str, Any]:
+    """
+    Describe one written file for the runtime's per-writer ``manifest.json``.
+
+    Every sink returns this record as ``metadata["writer_manifest"]``; ``tree``
+    and ``root_classname`` are ``None`` for formats without them.
+    """
+    partition = dict(ctx.get("partition") or {})
+    path, path_type = manifest_path(
+        output_path,
+        Path(str(ctx.get("outdir") or ".")),
+    )
+    return {
+        "kind": kind,
+        "name": str(meta.get("writer_name") or output_path.stem),
+        "node_id": str(meta.get("node_id") or ""),
+        "input_node": str(meta.get("input_node") or ""),
+        "tree": tree,
+        "format": output_format,
+        "root_classname": root_classname,
+        "path": path,
+        "path_type": path_type,
+        "dataset": dataset_name(ctx),
+        "partition": _partition_index(partition),
+        "attempt": int(ctx.get("attempt") or 0),
+        "entries": entries,
+        "size_bytes": size_bytes,
+    }
+
+
+def manifest_path(path: Path, outdir: Path) -> tuple[str, str]:
+    resolved = path.resolve()
+    resolved_outdir = outdir.resolve()
+    try:
+        return resolved.relative_to(resolved_outdir).as_posix(), "relative_to_outdir"
+    except ValueError:
+        return resolved.as_posix(), "absolute"
+
+
+def dataset_name(ctx: dict[str, Any]) -> str:
+    partition = dict(ctx.get("partition") or {})
+    return str(ctx.get("dataset_name") or partition.get("dataset") or "dataset")
+
+
+def _partition_index(partition: dict[str, Any]) -> int:
+    part = str(partition.get("part") or "0")
+    try:
+        return int(part.rsplit("_", 1)[-1])
+    except ValueError:
+        return 0
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import awkward as ak
 import uproot
-from hepflow.model.io import OutputResult
+from hepflow.model.io import ArtifactManifest, OutputResult
 
+from fasthep_carpenter.runtime.chunked import iter_chunks
 from fasthep_carpenter.runtime.compat import unwrap_legacy_data_envelope
+from fasthep_carpenter.sinks.compression import parallel_compression
+from fasthep_carpenter.sinks.manifest import (  # noqa: F401 - manifest_path re-exported
+    dataset_name,
+    manifest_path,
+    writer_manifest_record,
+)
 
 ROOT_TREE_WRITE_SPEC = {
     "name": "root_tree",
@@ -31,12 +40,18 @@ ROOT_TREE_WRITE_SPEC = {
             "allowed": ["zlib", "lz4", "zstd", "none"],
         },
         "compression_level": {"type": "integer", "required": False, "default": 1},
+        "compression_workers": {"type": "integer", "required": False, "default": 1},
         "mode": {
             "type": "string",
             "required": False,
             "default": "recreate",
             "allowed": ["recreate"],
         },
+        "flush_entries": {"type": "integer", "required": False, "default": None},
+        "flush_bytes": {"type": "string", "required": False, "default": None},
+        "verify": {"type": "boolean", "required": False, "default": True},
+        "rollover_entries": {"type": "integer", "required": False, "default": None},
+        "rollover_bytes": {"type": "string", "required": False, "default": None},
     },
     "result": {
         "kind": "artifact",
@@ -62,17 +77,44 @@ def run_root_tree_write(
     format: str = "rntuple",
     compression: str = "zlib",
     compression_level: int = 1,
+    compression_workers: int = 1,
     mode: str = "recreate",
+    flush_entries: int | None = None,
+    flush_bytes: str | None = None,
+    verify: bool = True,
+    rollover_entries: int | None = None,
+    rollover_bytes: str | None = None,
     ctx: dict[str, Any] | None = None,
     meta: dict[str, Any] | None = None,
-) -> OutputResult:
+) -> OutputResult | ArtifactManifest:
     """
     Write an event-like stream to a ROOT RNTuple or TTree.
 
     Initial assumptions:
-      - target is awkward.Array or dict[str, array-like]
+      - target is awkward.Array, dict[str, array-like], a ChunkedArray or an
+        iterator of chunks (e.g. a chunked root_tree source stream)
       - fields on the awkward record correspond to output branches
       - keep, when provided, is a flat list of existing field names
+
+    Chunks are streamed through a :class:`RootTreeWriter`, so only one basket
+    or cluster worth of entries is buffered at a time. ``flush_entries`` or
+    ``flush_bytes`` set the target TTree basket / RNTuple cluster size.
+
+    ``compression_workers`` greater than one compresses each zlib or zstd
+    basket or page in fixed-size pieces concurrently on a thread pool; the
+    output is deterministic and reads back the same as serial compression.
+
+    The manifest's classname and size come from the writer, so the output is
+    not reopened to describe it. With ``verify`` (the default) it is read back
+    once to check the written object's classname and entry count; set
+    ``verify: false`` to skip that read, e.g. on network filesystems.
+
+    ``rollover_entries`` or ``rollover_bytes`` split the output into several
+    files of uniform size through a :class:`RolloverRootTreeWriter`. ``path``
+    is then a template such as ``skim_{dataset}_{index}.root`` (inside a
+    workflow, escape the placeholder as ``{{index}}``) and one result is
+    returned as an ``ArtifactManifest`` with one part per file, each carrying
+    its own manifest record.
     """
     if mode != "recreate":
         raise ValueError(
@@ -80,108 +122,416 @@ def run_root_tree_write(
             "Only 'recreate' is currently supported."
         )
     output_format = _normalise_format(format)
+    ctx = dict(ctx or {})
+    meta = dict(meta or {})
+    options: dict[str, Any] = {
+        "tree": tree,
+        "format": output_format,
+        "compression": compression,
+        "compression_level": compression_level,
+        "compression_workers": compression_workers,
+        "keep": keep,
+        "flush_entries": flush_entries,
+        "flush_bytes": flush_bytes,
+    }
+    chunks = iter_chunks(unwrap_legacy_data_envelope(target))
+
+    if rollover_entries is None and rollover_bytes is None:
+        with RootTreeWriter(Path(path), **options) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+        return _output_result(writer, verify=verify, ctx=ctx, meta=meta)
+
+    template = path.replace("{dataset}", dataset_name(ctx))
+    meta["writer_name"] = _rollover_name(str(meta.get("writer_name") or template))
+    with RolloverRootTreeWriter(
+        template,
+        rollover_entries=rollover_entries,
+        rollover_bytes=rollover_bytes,
+        **options,
+    ) as rollover:
+        for chunk in chunks:
+            rollover.write(chunk)
+    parts = [
+        _output_result(writer, verify=verify, ctx=ctx, meta=meta, piece=index)
+        for index, writer in enumerate(rollover.pieces)
+    ]
+    return ArtifactManifest(
+        product_kind="artifact",
+        format="root",
+        producer_node=str(meta.get("node_id") or "root_tree"),
+        output_name="artifact",
+        dataset_name=dataset_name(ctx),
+        parts=tuple(parts),
+    )
 
-    array = _normalise_target(unwrap_legacy_data_envelope(target))
-
-    if keep is not None:
-        missing = [field for field in keep if field not in array.fields]
-        if missing:
-            raise KeyError(
-                f"Requested branches are missing from the input stream: {missing}"
-            )
-        array = array[keep]
-
-    output_path = Path(path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    compression_arg = _resolve_compression(compression, compression_level)
-
-    payload = {field: array[field] for field in array.fields}
-
-    with uproot.recreate(output_path, compression=compression_arg) as fout:
-        if output_format == "rntuple":
-            fout.mkrntuple(tree, payload)
-        elif output_format == "ttree":
-            fout.mktree(tree, payload)
 
-    root_classname = _root_classname(output_path, tree)
+def _output_result(
+    writer: RootTreeWriter,
+    *,
+    verify: bool,
+    ctx: dict[str, Any],
+    meta: dict[str, Any],
+    piece: int | None = None,
+) -> OutputResult:
+    root_classname = writer.root_classname
+    if verify:
+        _verify_output(
+            writer.path,
+            writer.tree,
+            root_classname=root_classname,
+            entries=writer.entries,
+        )
 
-    entries = _safe_len(array)
-    manifest_record = _manifest_record(
-        output_path=output_path,
-        entries=entries,
-        tree=tree,
-        output_format=output_format,
+    manifest_record = writer_manifest_record(
+        kind="root_tree",
+        output_path=writer.path,
+        entries=writer.entries,
+        size_bytes=writer.size_bytes,
+        tree=writer.tree,
+        output_format=writer.format,
         root_classname=root_classname,
-        ctx=dict(ctx or {}),
-        meta=dict(meta or {}),
+        ctx=ctx,
+        meta=meta,
     )
+    identity: dict[str, Any] = {}
+    if piece is not None:
+        # Pieces of one partition are told apart by partition_id when the
+        # runtime merges artifact references.
+        manifest_record["piece"] = piece
+        partition = dict(ctx.get("partition") or {})
+        identity = {
+            "producer_node": manifest_record["node_id"] or None,
+            "dataset_name": manifest_record["dataset"],
+            "partition_id": f"{partition.get('id') or manifest_record['partition']}/{piece}",
+            "partition_index": manifest_record["partition"],
+        }
 
     return OutputResult(
         kind="artifact",
-        path=str(output_path),
+        path=str(writer.path),
         format="root",
         metadata={
-            "tree": tree,
-            "format": output_format,
+            "tree": writer.tree,
+            "format": writer.format,
             "root_classname": root_classname,
-            "entries": entries,
-            "branches": list(array.fields),
-            "compression": compression,
-            "compression_level": compression_level,
+            "entries": writer.entries,
+            "branches": list(writer.fields or []),
+            "compression": writer.compression,
+            "compression_level": writer.compression_level,
             "writer_manifest": manifest_record,
         },
+        **identity,
     )
 
 
-def _manifest_record(
-    *,
-    output_path: Path,
-    entries: int | None,
-    tree: str,
-    output_format: str,
-    root_classname: str,
-    ctx: dict[str, Any],
-    meta: dict[str, Any],
-) -> dict[str, Any]:
-    partition = dict(ctx.get("partition") or {})
-    path, path_type = manifest_path(
-        output_path,
-        Path(str(ctx.get("outdir") or ".")),
-    )
-    return {
-        "kind": "root_tree",
-        "name": str(meta.get("writer_name") or output_path.stem),
-        "node_id": str(meta.get("node_id") or ""),
-        "input_node": str(meta.get("input_node") or ""),
-        "tree": tree,
-        "format": output_format,
-        "root_classname": root_classname,
-        "path": path,
-        "path_type": path_type,
-        "dataset": str(ctx.get("dataset_name") or partition.get("dataset") or "dataset"),
-        "partition": _partition_index(partition),
-        "attempt": int(ctx.get("attempt") or 0),
-        "entries": entries,
-        "size_bytes": output_path.stat().st_size,
-    }
+class RootTreeWriter:
+    """
+    Incremental ROOT output handle: the file is opened once and chunks appended.
+
+    Every flush becomes one basket per branch for a TTree (``tree.extend``) or
+    one cluster for an RNTuple. Written chunks are buffered until
+    ``flush_entries`` entries (or ``flush_bytes``, converted to entries from the
+    first chunk's size) are available and larger chunks are sliced, so baskets
+    and clusters are uniformly sized however the input was chunked. Without a
+    target, each written chunk is flushed as it arrives.
+
+    With ``compression_workers`` greater than one, uproot's compression of
+    each basket or page is split across a thread pool (see
+    :mod:`fasthep_carpenter.sinks.compression`).
+
+    ``bytes_written`` is the extent of the file written so far, counted as
+    uproot writes it, and ``size_bytes`` its final value once the writer is
+    closed.
+    """
 
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        tree: str = "events",
+        format: str = "rntuple",
+        compression: str = "zlib",
+        compression_level: int = 1,
+        compression_workers: int = 1,
+        keep: list[str] | None = None,
+        flush_entries: int | None = None,
+        flush_bytes: str | None = None,
+    ) -> None:
+        if flush_entries is not None and flush_bytes is not None:
+            raise ValueError(
+                "root_tree writer accepts only one of flush_entries or flush_bytes"
+            )
+        self.path = Path(path)
+        self.tree = tree
+        self.format = _normalise_format(format)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.keep = None if keep is None else list(keep)
+        self.fields: list[str] | None = self.keep
+        self.entries = 0
+        self.size_bytes: int | None = None
+        self._flush_entries = _positive_option("flush_entries", flush_entries)
+        self._flush_bytes = _positive_size("flush_bytes", flush_bytes)
+        self._pending: list[ak.Array] = []
+        self._pending_entries = 0
+        self._handle: Any = None
+
+        compression_arg = _resolve_compression(compression, compression_level)
+        self._executor: ThreadPoolExecutor | None = None
+        if (
+            _compression_workers(compression_workers) > 1
+            and compression_arg is not None
+        ):
+            self._executor = ThreadPoolExecutor(max_workers=compression_workers)
+            compression_arg = parallel_compression(compression_arg, self._executor)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._sink = _ExtentTrackingFile(self.path)
+        self._file = uproot.recreate(self._sink, compression=compression_arg)
+
+    @property
+    def root_classname(self) -> str:
+        return _ROOT_CLASSNAMES[self.format]
+
+    @property
+    def buffered_entries(self) -> int:
+        """Entries written so far, including those not yet flushed."""
+        return self.entries + self._pending_entries
+
+    @property
+    def bytes_written(self) -> int:
+        """Bytes written to the output file so far, buffered or not."""
+        return self._sink.extent
+
+    def __enter__(self) -> RootTreeWriter:
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._release()
+
+    def write(self, chunk: Any) -> None:
+        array = self._select(_normalise_target(chunk))
+        self._pending.append(array)
+        self._pending_entries += len(array)
+
+        target = self._target_entries(array)
+        if target is None:
+            self.flush()
+            return
+        while self._pending_entries >= target:
+            self._write_out(self._take(target))
+
+    def flush(self) -> None:
+        if self._pending:
+            self._write_out(self._take(self._pending_entries))
+
+    def close(self) -> None:
+        try:
+            self.flush()
+            if self._handle is None:
+                raise ValueError("root_tree writer received an empty stream")
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        self._file.close()
+        self.size_bytes = self.bytes_written
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _select(self, array: ak.Array) -> ak.Array:
+        if self.fields is None:
+            self.fields = list(array.fields)
+        missing = [field for field in self.fields if field not in array.fields]
+        if missing:
+            raise KeyError(
+                f"Requested branches are missing from the input stream: {missing}"
+            )
+        return array
+
+    def _target_entries(self, array: ak.Array) -> int | None:
+        if self._flush_bytes is not None and self._flush_entries is None and len(array):
+            bytes_per_entry = max(1, array.nbytes // len(array))
+            self._flush_entries = max(1, self._flush_bytes // bytes_per_entry)
+        return self._flush_entries
+
+    def _take(self, n: int) -> ak.Array:
+        taken: list[ak.Array] = []
+        needed = n
+        while self._pending and (needed > 0 or not len(self._pending[0])):
+            head = self._pending[0]
+            if len(head) <= needed:
+                taken.append(self._pending.pop(0))
+                needed -= len(head)
+            else:
+                taken.append(head[:needed])
+                self._pending[0] = head[needed:]
+                needed = 0
+        self._pending_entries -= n
+        return taken[0] if len(taken) == 1 else ak.concatenate(taken, axis=0)
+
+    def _write_out(self, array: ak.Array) -> None:
+        if self._handle is not None and not len(array):
+            return
+        payload = {field: array[field] for field in self.fields or []}
+        if self._handle is None:
+            if self.format == "rntuple":
+                self._handle = self._file.mkrntuple(self.tree, payload)
+            else:
+                self._handle = self._file.mktree(self.tree, payload)
+        else:
+            self._handle.extend(payload)
+        self.entries += len(array)
+
+
+class _ExtentTrackingFile(io.BufferedRandom):
+    """Output file that counts its own length as uproot writes and seeks."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(io.FileIO(path, "w+"))
+        self.extent = 0
+
+    def write(self, data: Any) -> int:
+        written = super().write(data)
+        self.extent = max(self.extent, self.tell())
+        return written
+
+
+class RolloverRootTreeWriter:
+    """
+    Split one output stream across a sequence of ROOT files.
+
+    Pieces are written by :class:`RootTreeWriter` to ``path`` with its
+    ``{index}`` placeholder (appended to the stem when missing) replaced by
+    0, 1, 2, ... A piece is closed once it holds ``rollover_entries`` entries,
+    with chunks split exactly at the boundary, or once ``rollover_bytes`` have
+    been written to it, which is checked after every write so a piece
+    overshoots by at most one flush. Later pieces keep the branches of the
+    first.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        rollover_entries: int | None = None,
+        rollover_bytes: str | None = None,
+        **options: Any,
+    ) -> None:
+        if (rollover_entries is None) == (rollover_bytes is None):
+            raise ValueError(
+                "root_tree writer rollover needs exactly one of "
+                "rollover_entries or rollover_bytes"
+            )
+        self.path = str(path)
+        self.pieces: list[RootTreeWriter] = []
+        self._rollover_entries = _positive_option("rollover_entries", rollover_entries)
+        self._rollover_bytes = _positive_size("rollover_bytes", rollover_bytes)
+        self._options = options
+        self._current: RootTreeWriter | None = None
+
+    def __enter__(self) -> RolloverRootTreeWriter:
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._current is not None:
+            self._current._release()
+
+    def write(self, chunk: Any) -> None:
+        array = _normalise_target(chunk)
+        if not len(array) and self.pieces:
+            return
+        while True:
+            writer = self._current or self._open()
+            if self._rollover_entries is not None:
+                room = self._rollover_entries - writer.buffered_entries
+                head, array = array[:room], array[room:]
+            else:
+                head, array = array, array[:0]
+            writer.write(head)
+            if self._is_full(writer):
+                self._finish()
+            if not len(array):
+                return
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._finish()
+        if not self.pieces:
+            raise ValueError("root_tree writer received an empty stream")
+
+    def _open(self) -> RootTreeWriter:
+        if self.pieces:
+            self._options["keep"] = self.pieces[0].fields
+        writer = RootTreeWriter(
+            _piece_path(self.path, len(self.pieces)), **self._options
+        )
+        self.pieces.append(writer)
+        self._current = writer
+        return writer
+
+    def _is_full(self, writer: RootTreeWriter) -> bool:
+        if self._rollover_entries is not None:
+            return writer.buffered_entries >= self._rollover_entries
+        return writer.bytes_written >= (self._rollover_bytes or 0)
+
+    def _finish(self) -> None:
+        writer, self._current = self._current, None
+        if writer is not None:
+            writer.close()
 
-def manifest_path(path: Path, outdir: Path) -> tuple[str, str]:
-    resolved = path.resolve()
-    resolved_outdir = outdir.resolve()
-    try:
-        return resolved.relative_to(resolved_outdir).as_posix(), "relative_to_outdir"
-    except ValueError:
-        return resolved.as_posix(), "absolute"
 
+def _piece_path(template: str, index: int) -> Path:
+    if "{index}" not in template:
+        path = Path(template)
+        template = str(path.with_name(f"{path.stem}_{{index}}{path.suffix}"))
+    return Path(template.replace("{index}", str(index)))
 
-def _partition_index(partition: dict[str, Any]) -> int:
-    part = str(partition.get("part") or "0")
+
+def _rollover_name(template: str) -> str:
+    stem = Path(template).stem
+    for placeholder in ("_{{index}}", "{{index}}", "_{index}", "{index}"):
+        stem = stem.replace(placeholder, "")
+    return stem or "root_tree"
+
+
+def _compression_workers(value: int | None) -> int:
+    workers = 1 if value is None else value
+    if isinstance(workers, bool) or int(workers) < 1:
+        raise ValueError(
+            f"root_tree writer compression_workers must be a positive integer, got {value!r}"
+        )
+    return int(workers)
+
+
+def _positive_option(name: str, value: int | None) -> int | None:
+    if value is None:
+        return None
+    if isinstance(value, bool) or int(value) <= 0:
+        raise ValueError(
+            f"root_tree writer {name} must be a positive integer, got {value!r}"
+        )
+    return int(value)
+
+
+def _positive_size(name: str, value: str | None) -> int | None:
+    if value is None:
+        return None
     try:
-        return int(part.rsplit("_", 1)[-1])
-    except ValueError:
-        return 0
+        size = uproot._util.memory_size(value)
+    except TypeError:
+        size = 0
+    if size <= 0:
+        raise ValueError(
+            f"root_tree writer {name} must be a positive memory size, got {value!r}"
+        )
+    return size
 
 
 def _normalise_target(target: Any) -> ak.Array:
@@ -209,9 +559,12 @@ def _resolve_compression(name: str, level: int) -> Any:
     raise ValueError(f"Unsupported ROOT compression algorithm: {name!r}")
 
 
+_ROOT_CLASSNAMES = {"rntuple": "ROOT::RNTuple", "ttree": "TTree"}
+
+
 def _normalise_format(name: str) -> str:
     output_format = str(name).strip().lower()
-    if output_format in {"rntuple", "ttree"}:
+    if output_format in _ROOT_CLASSNAMES:
         return output_format
     raise ValueError(
         f"Unsupported ROOT output format: {name!r}. "
@@ -219,13 +572,18 @@ def _normalise_format(name: str) -> str:
     )
 
 
-def _root_classname(path: Path, tree: str) -> str:
+def _verify_output(
+    path: Path,
+    tree: str,
+    *,
+    root_classname: str,
+    entries: int,
+) -> None:
     with uproot.open(path) as root_file:
-        return str(root_file[tree].classname)
-
-
-def _safe_len(array: ak.Array) -> int | None:
-    try:
-        return len(array)
-    except Exception:
-        return None
+        written = root_file[tree]
+        found = (str(written.classname), int(written.num_entries))
+    if found != (root_classname, entries):
+        raise ValueError(
+            f"root_tree writer verification failed for {str(path)!r}: expected "
+            f"{root_classname} with {entries} entries, found {found[0]} with {found[1]}"
+        )
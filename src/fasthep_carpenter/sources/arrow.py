@@ -0,0 +1,481 @@
+"""Columnar Parquet and Arrow IPC (Feather v2) sources."""
+
+from __future__ import annotations
+
+import abc
+import importlib
+import operator
+from collections.abc import Callable, Iterator
+from functools import partial
+from typing import Any
+
+import awkward as ak
+import numpy as np
+
+from fasthep_carpenter.runtime.chunked import ChunkedArray
+from fasthep_carpenter.sources.root_tree import RootTreeSchema
+
+MISSING_PYARROW_MESSAGE = (
+    "The parquet and arrow_ipc sources require pyarrow. Install "
+    "fasthep-carpenter[arrow] or ensure pyarrow is available."
+)
+
+_SOURCE_PARAMS = {
+    "datasets": {"type": "list[mapping]", "required": True},
+    "defaults": {"type": "mapping", "required": False, "default": {}},
+    "stream_type": {
+        "type": "string",
+        "required": False,
+        "default": "event_stream",
+    },
+    "branches": {"type": "list[string]", "required": False, "default": None},
+    "missing_branches": {
+        "type": "string",
+        "required": False,
+        "default": "error",
+        "allowed": ["error", "ignore"],
+    },
+    "start": {"type": "integer", "required": False, "default": None},
+    "stop": {"type": "integer", "required": False, "default": None},
+    "metadata_only": {"type": "boolean", "required": False, "default": False},
+    "filters": {"type": "list[mapping]", "required": False, "default": None},
+    "memory_map": {"type": "boolean", "required": False, "default": True},
+}
+
+PARQUET_SOURCE_SPEC = {
+    "name": "parquet",
+    "kind": "source",
+    "version": "1.0",
+    "input": None,
+    "params": _SOURCE_PARAMS,
+    "result": {
+        "kind": "event_stream",
+        "description": "Loaded Parquet event stream.",
+    },
+}
+
+ARROW_IPC_SOURCE_SPEC = {
+    "name": "arrow_ipc",
+    "kind": "source",
+    "version": "1.0",
+    "input": None,
+    "params": _SOURCE_PARAMS,
+    "result": {
+        "kind": "event_stream",
+        "description": "Loaded Arrow IPC (Feather v2) event stream.",
+    },
+}
+
+_FILTER_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def run_parquet_source(
+    *,
+    datasets: list[dict[str, Any]],
+    defaults: dict[str, Any] | None = None,
+    stream_type: str | None = None,
+    branches: list[str] | None = None,
+    missing_branches: str = "error",
+    start: int | None = None,
+    stop: int | None = None,
+    metadata_only: bool = False,
+    filters: list[dict[str, Any]] | None = None,
+    memory_map: bool = True,
+    ctx: dict[str, Any] | None = None,
+) -> Any:
+    """
+    Load Parquet files for each dataset and return a dataset-keyed event stream.
+
+    The representation and the ``datasets``/``start``/``stop``/``partition``
+    conventions match :func:`run_root_tree_source`: one ``awkward.Array`` per
+    dataset, or a ``ChunkedArray`` of per-file arrays for datasets with more
+    than one file, and only ``ctx["partition"]``'s file and entry window when
+    a partition is given.
+
+    Only the ``branches`` columns are read, and only from the row groups that
+    overlap the entry window. ``filters`` is a list of
+    ``{column, op, value}`` conditions (``op`` one of ``==``, ``!=``, ``<``,
+    ``<=``, ``>``, ``>=``) on flat columns, all of which must hold: row groups
+    whose min/max statistics rule a condition out are skipped without being
+    read, and the remaining rows are filtered exactly. ``memory_map`` reads
+    the files through a memory map.
+    """
+    del stream_type, defaults
+    return _run_columnar_source(
+        _ParquetInput,
+        datasets=datasets,
+        branches=branches,
+        missing_branches=missing_branches,
+        start=start,
+        stop=stop,
+        metadata_only=metadata_only,
+        filters=filters,
+        memory_map=memory_map,
+        ctx=ctx,
+    )
+
+
+def run_arrow_ipc_source(
+    *,
+    datasets: list[dict[str, Any]],
+    defaults: dict[str, Any] | None = None,
+    stream_type: str | None = None,
+    branches: list[str] | None = None,
+    missing_branches: str = "error",
+    start: int | None = None,
+    stop: int | None = None,
+    metadata_only: bool = False,
+    filters: list[dict[str, Any]] | None = None,
+    memory_map: bool = True,
+    ctx: dict[str, Any] | None = None,
+) -> Any:
+    """
+    Load Arrow IPC (Feather v2) files with the conventions of :func:`run_parquet_source`.
+
+    With ``memory_map`` (the default) record batches are mapped rather than
+    read, so only the pages of the selected columns are loaded; converting
+    them to an awkward array still copies them once. Without it, batches are
+    read in order only as far as the entry window's end. IPC files carry no
+    column statistics, so ``filters`` are applied to rows only.
+    """
+    del stream_type, defaults
+    return _run_columnar_source(
+        _ArrowIpcInput,
+        datasets=datasets,
+        branches=branches,
+        missing_branches=missing_branches,
+        start=start,
+        stop=stop,
+        metadata_only=metadata_only,
+        filters=filters,
+        memory_map=memory_map,
+        ctx=ctx,
+    )
+
+
+def _run_columnar_source(
+    opener: _Opener,
+    *,
+    datasets: list[dict[str, Any]],
+    branches: list[str] | None,
+    missing_branches: str,
+    start: int | None,
+    stop: int | None,
+    metadata_only: bool,
+    filters: list[dict[str, Any]] | None,
+    memory_map: bool,
+    ctx: dict[str, Any] | None,
+) -> Any:
+    _load_pyarrow()
+    read_one_file = partial(
+        _read_one_file,
+        opener=opener,
+        branches=branches,
+        missing_branches=_missing_branch_policy(opener.name, missing_branches),
+        metadata_only=metadata_only,
+        filters=_filters(opener.name, filters),
+        memory_map=bool(memory_map),
+    )
+
+    partition = dict(ctx or {}).get("partition")
+    if partition is not None:
+        partition_start = partition.get("start")
+        partition_stop = partition.get("stop")
+        return read_one_file(
+            str(partition["file"]),
+            start=start if partition_start is None else partition_start,
+            stop=stop if partition_stop is None else partition_stop,
+        )
+
+    out: dict[str, Any] = {}
+    for ds in datasets:
+        name = str(ds["name"])
+        files = list(ds.get("files") or [])
+        if not files:
+            raise ValueError(f"Dataset '{name}' has no files")
+
+        arrays = [read_one_file(str(path), start=start, stop=stop) for path in files]
+        if metadata_only or len(arrays) == 1:
+            out[name] = arrays[0]
+        else:
+            out[name] = ChunkedArray(arrays)
+    return out
+
+
+class _ColumnarInput(abc.ABC):
+    """One open columnar file, read by row group (record batch for IPC)."""
+
+    name = ""
+    schema: Any
+
+    @abc.abstractmethod
+    def num_rows(self) -> int:
+        """Return the number of rows in the file."""
+
+    @abc.abstractmethod
+    def row_group_rows(self) -> Iterator[int]:
+        """Yield the number of rows of each row group, in file order."""
+
+    @abc.abstractmethod
+    def read(self, index: int, columns: list[str]) -> Any:
+        """Return row group ``index`` restricted to ``columns`` as a pyarrow table."""
+
+    def bounds(self, index: int, column: str) -> tuple[Any, Any] | None:
+        """Return the ``(min, max)`` statistics of a column chunk, if recorded."""
+        del index, column
+        return None
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """Release the open file."""
+
+    def __enter__(self) -> _ColumnarInput:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class _ParquetInput(_ColumnarInput):
+    name = "parquet"
+
+    def __init__(self, path: str, *, memory_map: bool) -> None:
+        pq = importlib.import_module("pyarrow.parquet")
+        self._file = pq.ParquetFile(path, memory_map=memory_map)
+        self._metadata = self._file.metadata
+        self.schema = self._file.schema_arrow
+
+    def num_rows(self) -> int:
+        return int(self._metadata.num_rows)
+
+    def row_group_rows(self) -> Iterator[int]:
+        for index in range(self._metadata.num_row_groups):
+            yield self._metadata.row_group(index).num_rows
+
+    def read(self, index: int, columns: list[str]) -> Any:
+        return self._file.read_row_group(index, columns=columns)
+
+    def bounds(self, index: int, column: str) -> tuple[Any, Any] | None:
+        row_group = self._metadata.row_group(index)
+        for position in range(row_group.num_columns):
+            chunk = row_group.column(position)
+            if chunk.path_in_schema != column:
+                continue
+            statistics = chunk.statistics
+            if statistics is None or not statistics.has_min_max:
+                return None
+            return statistics.min, statistics.max
+        return None
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ArrowIpcInput(_ColumnarInput):
+    name = "arrow_ipc"
+
+    def __init__(self, path: str, *, memory_map: bool) -> None:
+        pa = importlib.import_module("pyarrow")
+        self._source = pa.memory_map(path) if memory_map else pa.OSFile(path)
+        self._reader = pa.ipc.open_file(self._source)
+        self.schema = self._reader.schema
+        self._batch: tuple[int, Any] | None = None
+
+    def num_rows(self) -> int:
+        return int(self._reader.count_rows())
+
+    def row_group_rows(self) -> Iterator[int]:
+        # The footer records no row counts, so each batch is loaded to count
+        # it and kept for read(); without a memory map, that is its only read.
+        for index in range(self._reader.num_record_batches):
+            yield self._get_batch(index).num_rows
+
+    def read(self, index: int, columns: list[str]) -> Any:
+        pa = importlib.import_module("pyarrow")
+        return pa.Table.from_batches([self._get_batch(index).select(columns)])
+
+    def _get_batch(self, index: int) -> Any:
+        if self._batch is None or self._batch[0] != index:
+            self._batch = (index, self._reader.get_batch(index))
+        return self._batch[1]
+
+    def close(self) -> None:
+        self._source.close()
+
+
+_Opener = type[_ParquetInput] | type[_ArrowIpcInput]
+
+
+def _read_one_file(
+    path: str,
+    *,
+    opener: _Opener,
+    branches: list[str] | None,
+    missing_branches: str,
+    metadata_only: bool,
+    filters: list[tuple[str, str, Any]],
+    memory_map: bool,
+    start: int | None,
+    stop: int | None,
+) -> ak.Array | RootTreeSchema:
+    with opener(path, memory_map=memory_map) as source:
+        available = list(source.schema.names)
+        columns = _resolve_columns(
+            opener.name,
+            available,
+            branches=branches,
+            missing_branches=missing_branches,
+        )
+        if metadata_only:
+            first, last = _entry_window(source.num_rows(), start=start, stop=stop)
+            form = ak.from_arrow_schema(source.schema)
+            return RootTreeSchema(
+                fields=columns,
+                awkward_type={
+                    column: str(form.content(column).type) for column in columns
+                },
+                entry_count=last - first,
+            )
+
+        filter_columns = [column for column, _, _ in filters]
+        missing = sorted(set(filter_columns) - set(available))
+        if missing:
+            raise KeyError(
+                f"{opener.name} filters reference unknown columns: {missing}"
+            )
+        read_columns = columns + [
+            c for c in dict.fromkeys(filter_columns) if c not in columns
+        ]
+
+        # Row groups are counted as they are visited, up to the window's end.
+        window_start = max(0, int(start or 0))
+        window_stop = None if stop is None else max(window_start, int(stop))
+        tables = []
+        group_stop = 0
+        for index, rows in enumerate(source.row_group_rows()):
+            group_start, group_stop = group_stop, group_stop + rows
+            if group_stop > window_start and _may_match(source, index, filters):
+                table = source.read(index, read_columns)
+                lo = max(window_start, group_start)
+                hi = group_stop if window_stop is None else min(window_stop, group_stop)
+                tables.append(table.slice(lo - group_start, hi - lo))
+            if window_stop is not None and group_stop >= window_stop:
+                break
+
+        if not tables:
+            tables = [source.schema.empty_table().select(read_columns)]
+        pa = importlib.import_module("pyarrow")
+        array = ak.from_arrow(pa.concat_tables(tables))
+
+    if filters:
+        array = array[_filter_mask(array, filters)]
+    return array[columns] if read_columns != columns else array
+
+
+def _may_match(
+    source: _ColumnarInput,
+    index: int,
+    filters: list[tuple[str, str, Any]],
+) -> bool:
+    for column, op, value in filters:
+        bounds = source.bounds(index, column)
+        if bounds is None:
+            continue
+        low, high = bounds
+        if op == "==" and not low <= value <= high:
+            return False
+        if op == "!=" and low == high == value:
+            return False
+        if op == "<" and not low < value:
+            return False
+        if op == "<=" and not low <= value:
+            return False
+        if op == ">" and not high > value:
+            return False
+        if op == ">=" and not high >= value:
+            return False
+    return True
+
+
+def _filter_mask(array: ak.Array, filters: list[tuple[str, str, Any]]) -> np.ndarray:
+    mask: np.ndarray = np.ones(len(array), dtype=bool)
+    for column, op, value in filters:
+        values = array[column]
+        if values.ndim != 1:
+            raise ValueError(
+                f"columnar source filters require flat columns; {column!r} is jagged"
+            )
+        mask &= np.asarray(_FILTER_OPS[op](ak.to_numpy(values), value), dtype=bool)
+    return mask
+
+
+def _filters(
+    name: str, filters: list[dict[str, Any]] | None
+) -> list[tuple[str, str, Any]]:
+    parsed = []
+    for item in filters or []:
+        condition = dict(item)
+        op = str(condition.get("op", ""))
+        if (
+            "column" not in condition
+            or "value" not in condition
+            or op not in _FILTER_OPS
+        ):
+            raise ValueError(
+                f"{name} filters must be mappings with column, op and value; op is "
+                f"one of {sorted(_FILTER_OPS)}, got {item!r}"
+            )
+        parsed.append((str(condition["column"]), op, condition["value"]))
+    return parsed
+
+
+def _resolve_columns(
+    name: str,
+    available: list[str],
+    *,
+    branches: list[str] | None,
+    missing_branches: str,
+) -> list[str]:
+    if not branches:
+        return available
+    requested = [str(branch) for branch in branches]
+    missing = [branch for branch in requested if branch not in available]
+    if missing and missing_branches == "error":
+        raise KeyError(f"Columns not found in {name} file: {missing}")
+    return [branch for branch in requested if branch in available]
+
+
+def _entry_window(
+    num_entries: int,
+    *,
+    start: int | None,
+    stop: int | None,
+) -> tuple[int, int]:
+    window_start = min(num_entries, max(0, int(start or 0)))
+    window_stop = num_entries if stop is None else min(num_entries, int(stop))
+    return window_start, max(window_start, window_stop)
+
+
+def _missing_branch_policy(name: str, value: str) -> str:
+    if value not in {"error", "ignore"}:
+        raise ValueError(
+            f"{name} missing_branches must be 'error' or 'ignore', got {value!r}"
+        )
+    return value
+
+
+def _load_pyarrow() -> Any:
+    try:
+        pa = importlib.import_module("pyarrow")
+        importlib.import_module("pyarrow.ipc")
+        importlib.import_module("pyarrow.parquet")
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(MISSING_PYARROW_MESSAGE) from exc
+    return pa
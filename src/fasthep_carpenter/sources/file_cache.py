@@ -0,0 +1,160 @@
+"""Local read-through cache for remote ROOT input files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import fsspec
+
+from fasthep_carpenter.sources.fingerprint import path_mtime, uri_fingerprint
+
+_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+class RemoteFileCache:
+    """
+    Whole-file disk cache for remote ROOT inputs.
+
+    Each cached file is stored as ``<sha256(uri)>.root`` next to a JSON record
+    holding the remote fingerprint (size and modification time), the SHA-256
+    of the downloaded bytes and the size and mtime of the local copy. A
+    download is checked against the remote size once, as it is fetched. A
+    cached copy is then reused while the remote fingerprint is unchanged (or
+    cannot be checked, e.g. when offline) and, with ``verify`` enabled, while
+    the local copy still has the recorded size and mtime, so a truncated or
+    rewritten copy is fetched again without re-hashing it on every hit. Hits
+    touch the record, whose mtime orders the least recently used files evicted
+    once the cache holds more than ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        max_bytes: int | None = None,
+        verify: bool = True,
+    ) -> None:
+        if max_bytes is not None and (isinstance(max_bytes, bool) or max_bytes <= 0):
+            raise ValueError(
+                f"root_tree file_cache max_bytes must be positive, got {max_bytes!r}"
+            )
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.verify = bool(verify)
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> RemoteFileCache:
+        if "path" not in config:
+            raise ValueError("root_tree file_cache requires a 'path'")
+        return cls(
+            config["path"],
+            max_bytes=config.get("max_bytes"),
+            verify=config.get("verify", True),
+        )
+
+    def local_path(self, uri: str) -> Path:
+        """Return a verified local copy of ``uri``, fetching it on a miss."""
+        digest = hashlib.sha256(uri.encode("utf-8")).hexdigest()
+        data_path = self.directory / f"{digest}.root"
+        record_path = self.directory / f"{digest}.json"
+
+        fingerprint = uri_fingerprint(uri)
+        if self._is_valid(data_path, record_path, fingerprint=fingerprint):
+            # An explicit time: the clock utime uses by default is too coarse
+            # to order hits that follow each other closely.
+            now = time.time_ns()
+            os.utime(record_path, ns=(now, now))
+            return data_path
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        checksum = self._fetch(uri, data_path, fingerprint=fingerprint)
+        record = {
+            "uri": uri,
+            "fingerprint": fingerprint,
+            "sha256": checksum,
+            "local": _local_fingerprint(data_path),
+        }
+        record_path.write_text(json.dumps(record), encoding="utf-8")
+        self._evict(keep=data_path)
+        return data_path
+
+    def _is_valid(
+        self,
+        data_path: Path,
+        record_path: Path,
+        *,
+        fingerprint: list[Any] | None,
+    ) -> bool:
+        if not data_path.exists() or not record_path.exists():
+            return False
+        try:
+            record = json.loads(record_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if fingerprint is not None and record.get("fingerprint") != fingerprint:
+            return False
+        return not self.verify or _local_fingerprint(data_path) == record.get("local")
+
+    def _fetch(
+        self,
+        uri: str,
+        data_path: Path,
+        *,
+        fingerprint: list[Any] | None,
+    ) -> str:
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp_path = Path(tmp.name)
+            try:
+                with fsspec.open(uri, "rb") as remote:
+                    while block := remote.read(_BLOCK_SIZE):
+                        digest.update(block)
+                        tmp.write(block)
+                        size += len(block)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+        expected_size = None if fingerprint is None else fingerprint[0]
+        if expected_size is not None and size != expected_size:
+            tmp_path.unlink(missing_ok=True)
+            raise OSError(
+                f"Incomplete download of {uri}: expected {expected_size} bytes, "
+                f"got {size}"
+            )
+        tmp_path.replace(data_path)
+        return digest.hexdigest()
+
+    def _evict(self, *, keep: Path) -> None:
+        if self.max_bytes is None:
+            return
+        files = sorted(
+            self.directory.glob("*.root"),
+            key=lambda path: path_mtime(path.with_suffix(".json")),
+        )
+        total = sum(path.stat().st_size for path in files)
+        for path in files:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+
+
+def _local_fingerprint(path: Path) -> list[int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
@@ -0,0 +1,51 @@
+"""Change detection for input files, shared by the on-disk source caches."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+import fsspec
+
+
+def uri_fingerprint(uri: str) -> list[Any] | None:
+    """
+    Return ``[size, version]`` identifying the current contents of ``uri``.
+
+    Local paths use the size and ``st_mtime_ns``; URIs use ``fs.info`` and the
+    first of its modification time, ETag or checksum fields. ``None`` means the
+    file cannot be fingerprinted, e.g. it does not exist or is unreachable.
+    """
+    if not urlparse(uri).scheme:
+        try:
+            stat = Path(uri).stat()
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    try:
+        fs, fs_path = fsspec.core.url_to_fs(uri)
+        info = fs.info(fs_path)
+    except Exception:
+        return None
+    size = info.get("size")
+    if size is None:
+        return None
+    version = next(
+        (
+            str(info[key])
+            for key in ("mtime", "modified", "LastModified", "ETag", "checksum")
+            if info.get(key) is not None
+        ),
+        None,
+    )
+    return [int(size), version]
+
+
+def path_mtime(path: Path) -> float:
+    """Return the mtime of a cache entry, or ``0.0`` if it has just gone."""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
@@ -0,0 +1,124 @@
+"""Persistent on-disk cache of ROOT tree metadata."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from fasthep_carpenter.sources.fingerprint import path_mtime, uri_fingerprint
+
+
+class RootTreeMetadataCache:
+    """
+    Content-addressed cache of tree metadata records, one JSON file per entry.
+
+    Entries are keyed by ``(uri, fingerprint, tree)`` where the fingerprint is
+    the size and modification time of the file (``fs.info`` for remote URIs),
+    so a rewritten file never serves stale metadata. Records older than
+    ``ttl_seconds`` are treated as misses. When more than ``max_entries`` are
+    stored, the least recently used entries are evicted; hits refresh the entry
+    file's mtime, which is what the LRU ordering uses. The ordering is read
+    from the directory once per cache object and then kept in memory, so
+    entries written meanwhile by other processes are only counted by later
+    cache objects.
+
+    Files whose fingerprint cannot be determined are never cached.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = 10_000,
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl_seconds = _optional_positive(ttl_seconds, name="ttl")
+        self.max_entries = _optional_positive(max_entries, name="max_entries")
+        self._lru: OrderedDict[Path, None] | None = None
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> RootTreeMetadataCache:
+        if "path" not in config:
+            raise ValueError("root_tree metadata_cache requires a 'path'")
+        return cls(
+            config["path"],
+            ttl_seconds=config.get("ttl"),
+            max_entries=config.get("max_entries", 10_000),
+        )
+
+    def get(self, uri: str, tree: str) -> dict[str, Any] | None:
+        entry_path = self._entry_path(uri, tree)
+        if entry_path is None or not entry_path.exists():
+            return None
+        try:
+            record = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._discard(entry_path)
+            return None
+
+        created = float(record.get("created") or 0.0)
+        if self.ttl_seconds is not None and time.time() - created > self.ttl_seconds:
+            self._discard(entry_path)
+            return None
+
+        os.utime(entry_path)
+        if self._lru is not None and entry_path in self._lru:
+            self._lru.move_to_end(entry_path)
+        return dict(record["metadata"])
+
+    def put(self, uri: str, tree: str, metadata: dict[str, Any]) -> None:
+        entry_path = self._entry_path(uri, tree)
+        if entry_path is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = {
+            "uri": uri,
+            "tree": tree,
+            "created": time.time(),
+            "metadata": metadata,
+        }
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(record), encoding="utf-8")
+        tmp_path.replace(entry_path)
+        self._evict(entry_path)
+
+    def _entry_path(self, uri: str, tree: str) -> Path | None:
+        fingerprint = uri_fingerprint(uri)
+        if fingerprint is None:
+            return None
+        key = json.dumps([uri, fingerprint, tree])
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def _discard(self, entry_path: Path) -> None:
+        entry_path.unlink(missing_ok=True)
+        if self._lru is not None:
+            self._lru.pop(entry_path, None)
+
+    def _evict(self, written: Path) -> None:
+        if self.max_entries is None:
+            return
+        if self._lru is None:
+            entries = sorted(self.directory.glob("*.json"), key=path_mtime)
+            self._lru = OrderedDict.fromkeys(entries)
+        self._lru[written] = None
+        self._lru.move_to_end(written)
+        while len(self._lru) > int(self.max_entries):
+            entry, _ = self._lru.popitem(last=False)
+            entry.unlink(missing_ok=True)
+
+
+def _optional_positive(value: Any, *, name: str) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, bool) or value <= 0:
+        raise ValueError(
+            f"root_tree metadata_cache {name} must be positive, got {value!r}"
+        )
+    return value
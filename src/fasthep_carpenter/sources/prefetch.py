@@ -0,0 +1,115 @@
+"""Background read-ahead for chunked ROOT tree streams."""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import deque
+from collections.abc import Iterator
+from typing import Any
+
+_DONE = object()
+
+
+class PrefetchIterator(Iterator[Any]):
+    """
+    Iterate ``chunks`` while a background thread reads ahead of the consumer.
+
+    The reader thread keeps decoding the next chunks (including the first chunk
+    of the next file) while downstream transforms work on the current one. It
+    pauses once the buffered chunks hold ``max_bytes`` or more; at least one
+    chunk is always read ahead so that I/O overlaps compute even when a single
+    chunk exceeds the budget.
+
+    ``chunks`` is advanced and, if it has a ``close`` method, closed only on
+    the reader thread, so open files are released there when the stream is
+    exhausted, fails or is closed early. A stream that is dropped without
+    being closed stops its reader when it is garbage collected.
+    """
+
+    def __init__(self, chunks: Iterator[Any], *, max_bytes: int) -> None:
+        # The reader thread only references the shared state, not the
+        # iterator, so an abandoned iterator can still be collected.
+        self._state = _ReadAhead(chunks, max_bytes=int(max_bytes))
+        self._thread = threading.Thread(
+            target=self._state.run, name="root-tree-prefetch", daemon=True
+        )
+        self._thread.start()
+        self._stop = weakref.finalize(self, self._state.stop)
+
+    def __next__(self) -> Any:
+        return self._state.next()
+
+    def close(self) -> None:
+        """Stop reading ahead and wait for the reader thread to release files."""
+        self._stop()
+        self._thread.join()
+
+
+class _ReadAhead:
+    """Buffer shared by a :class:`PrefetchIterator` and its reader thread."""
+
+    def __init__(self, chunks: Iterator[Any], *, max_bytes: int) -> None:
+        self._chunks = chunks
+        self._max_bytes = max_bytes
+        self._buffer: deque[tuple[Any, int]] = deque()
+        self._buffered_bytes = 0
+        self._error: BaseException | None = None
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def next(self) -> Any:
+        with self._condition:
+            while not self._buffer and self._error is None:
+                self._condition.wait()
+            error = self._error
+            if not self._buffer and error is not None:
+                self._error = StopIteration()
+                raise error
+            chunk, nbytes = self._buffer.popleft()
+            if chunk is _DONE:
+                self._buffer.appendleft((chunk, nbytes))
+                raise StopIteration
+            self._buffered_bytes -= nbytes
+            self._condition.notify_all()
+            return chunk
+
+    def stop(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._buffer.clear()
+            self._buffered_bytes = 0
+            self._condition.notify_all()
+
+    def run(self) -> None:
+        try:
+            for chunk in self._chunks:
+                nbytes = _nbytes(chunk)
+                with self._condition:
+                    if self._closed:
+                        return
+                    self._buffer.append((chunk, nbytes))
+                    self._buffered_bytes += nbytes
+                    self._condition.notify_all()
+                    while not self._closed and self._buffered_bytes >= self._max_bytes:
+                        self._condition.wait()
+                    if self._closed:
+                        return
+            with self._condition:
+                self._buffer.append((_DONE, 0))
+                self._condition.notify_all()
+        except BaseException as exc:
+            with self._condition:
+                self._error = exc
+                self._condition.notify_all()
+        finally:
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+
+
+def _nbytes(chunk: Any) -> int:
+    try:
+        return int(chunk.nbytes)
+    except Exception:
+        return 0
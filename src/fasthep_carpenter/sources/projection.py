@@ -0,0 +1,87 @@
+"""Column-projection pushdown from carpenter steps into ROOT tree sources."""
+
+from __future__ import annotations
+
+import importlib.resources as resources
+from typing import Any
+
+import yaml
+from hepflow.compiler.data_flow import (
+    DependencyContext,
+    parse_component_data_dependencies,
+)
+from hepflow.registry.defaults import default_expr_registry_config
+from hepflow.registry.loaders import load_object
+
+
+def required_root_tree_branches(
+    steps: list[dict[str, Any]],
+    *,
+    available: list[str] | None = None,
+    registry: dict[str, Any] | None = None,
+) -> list[str]:
+    """
+    Return the minimal ``branches`` list a root_tree source must read for ``steps``.
+
+    ``steps`` are workflow stage mappings with ``op`` and ``params``. They are
+    walked in order: each step's consumed symbols (declared through its spec's
+    ``requires``/``provides`` blocks, including collection-prefixed fields such
+    as ``Muon_pt`` for ``hep.select_objects``) are kept unless an earlier step
+    produced them.
+
+    When the tree's ``available`` branches are given, symbols that name a
+    collection rather than a branch (``Muon`` in ``Muon.pt``) expand to every
+    ``Muon_*`` branch, and symbols that are not branches at all are dropped.
+    """
+    registry = _carpenter_registry() if registry is None else registry
+    transforms = dict(registry.get("transforms") or {})
+    functions = {
+        **default_expr_registry_config()["functions"],
+        **dict(registry.get("functions") or {}),
+    }
+    dep_ctx = DependencyContext(
+        known_functions={str(name) for name in functions},
+        known_constants={str(name) for name in registry.get("constants") or {}},
+        context_symbols=set(),
+    )
+
+    required: set[str] = set()
+    produced: set[str] = set()
+    for index, step in enumerate(steps):
+        op = step.get("op")
+        if op not in transforms:
+            raise ValueError(
+                f"Step {step.get('id', index)!r} uses unknown operation {op!r}"
+            )
+        deps = parse_component_data_dependencies(
+            spec=load_object(transforms[op]["spec"]),
+            params=dict(step.get("params") or {}),
+            dep_ctx=dep_ctx,
+        )
+        required.update(deps.consumes - produced)
+        produced.update(deps.produces)
+
+    if available is None:
+        return sorted(required)
+    return _project_onto_branches(required, available=[str(b) for b in available])
+
+
+def _project_onto_branches(required: set[str], *, available: list[str]) -> list[str]:
+    available_set = set(available)
+    branches: set[str] = set()
+    for symbol in required:
+        if symbol in available_set:
+            branches.add(symbol)
+            continue
+        prefix = f"{symbol}_"
+        branches.update(branch for branch in available if branch.startswith(prefix))
+    return sorted(branches)
+
+
+def _carpenter_registry() -> dict[str, Any]:
+    text = (
+        resources.files("fasthep_carpenter.profiles")
+        .joinpath("registry.yaml")
+        .read_text(encoding="utf-8")
+    )
+    return dict(yaml.safe_load(text)["registry"])
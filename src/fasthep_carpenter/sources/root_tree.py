@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
+from functools import partial
+from itertools import pairwise
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 import awkward as ak
+import numpy as np
 import uproot
+from hepflow.compiler.expr_symbols import data_symbols_in_expr
+from hepflow.registry.defaults import default_expr_registry
+from hepflow.runtime.engine import eval_expr
+from uproot.source.coalesce import CoalesceConfig
+
+from fasthep_carpenter.runtime.chunked import ChunkedArray
+from fasthep_carpenter.sources.file_cache import RemoteFileCache
+from fasthep_carpenter.sources.metadata_cache import RootTreeMetadataCache
+from fasthep_carpenter.sources.prefetch import PrefetchIterator
 
 ROOT_TREE_SOURCE_SPEC = {
     "name": "root_tree",
@@ -32,6 +48,16 @@ ROOT_TREE_SOURCE_SPEC = {
         "start": {"type": "integer", "required": False, "default": None},
         "stop": {"type": "integer", "required": False, "default": None},
         "metadata_only": {"type": "boolean", "required": False, "default": False},
+        "step_size": {"type": "integer", "required": False, "default": None},
+        "step_bytes": {"type": "string", "required": False, "default": None},
+        "read_workers": {"type": "integer", "required": False, "default": None},
+        "metadata_cache": {"type": "mapping", "required": False, "default": None},
+        "remote_read": {"type": "mapping", "required": False, "default": None},
+        "file_cache": {"type": "mapping", "required": False, "default": None},
+        "lazy": {"type": "boolean", "required": False, "default": False},
+        "preselection": {"type": "string", "required": False, "default": None},
+        "prefetch_bytes": {"type": "string", "required": False, "default": None},
+        "dtypes": {"type": "mapping", "required": False, "default": None},
     },
     "result": {
         "kind": "event_stream",
@@ -65,33 +91,131 @@ def run_root_tree_source(
     start: int | None = None,
     stop: int | None = None,
     metadata_only: bool = False,
+    step_size: int | None = None,
+    step_bytes: str | None = None,
+    read_workers: int | None = None,
+    metadata_cache: dict[str, Any] | None = None,
+    remote_read: dict[str, Any] | None = None,
+    file_cache: dict[str, Any] | None = None,
+    lazy: bool = False,
+    preselection: str | None = None,
+    prefetch_bytes: str | None = None,
+    dtypes: dict[str, Any] | None = None,
     ctx: dict[str, Any] | None = None,
-) -> ak.Array | RootTreeSchema | dict[str, ak.Array | RootTreeSchema]:
+) -> Any:
     """
-    Load ROOT TTrees for each dataset and return a dataset-keyed event stream.
+    Load ROOT TTrees or RNTuples for each dataset and return a dataset-keyed
+    event stream.
 
     Current representation:
-      {dataset_name: awkward.Array}
+      {dataset_name: awkward.Array}, or a ``ChunkedArray`` of per-file arrays
+      for datasets with more than one file.
+
+    ``tree`` may name either a TTree or an RNTuple; both are read column-wise
+    with the same ``branches``/``start``/``stop``/``metadata_only`` semantics.
+    For RNTuples, ``branches`` are field names and chunk boundaries are aligned
+    to cluster boundaries so that no page is decompressed twice.
+
+    When ``step_size`` (entries) or ``step_bytes`` (an uproot memory size such
+    as ``"100 MB"``) is set, each dataset instead maps to an iterator of bounded
+    awkward chunks. Files are opened lazily as the iterator is consumed, so peak
+    memory is one chunk rather than the whole dataset.
+
+    ``read_workers`` greater than one reads the files of a dataset concurrently
+    and decompresses baskets on a shared thread pool. File order is preserved
+    in the chunked result.
+
+    ``metadata_cache`` (``{path, ttl, max_entries}``) persists tree metadata on
+    disk so ``metadata_only`` reads of unchanged files skip opening the tree.
+
+    ``remote_read`` tunes how remote URIs are fetched. uproot already gathers
+    the basket byte ranges of every requested branch in the entry window before
+    issuing a read; these settings control how those ranges are merged into
+    vector requests (``max_range_gap``, ``max_request_bytes``,
+    ``max_request_ranges``, ``min_first_request_bytes``) and how many requests
+    may be in flight (``max_inflight``).
+
+    ``file_cache`` (``{path, max_bytes, verify}``) keeps checksum-verified local
+    copies of remote inputs so reruns over the same files read local disk.
+
+    ``lazy`` returns awkward arrays backed by uproot virtual buffers: a branch
+    is only read and decompressed when a downstream transform first touches
+    it. The ROOT file therefore stays open for as long as the arrays are alive.
+
+    ``preselection`` is an event-level expression evaluated at read time. Only
+    the branches it references are read for the whole entry window; the other
+    branches are then read only for basket ranges that contain surviving
+    entries, and only surviving entries are returned. With ``lazy`` the mask is
+    applied without materialising the other branches, which stay virtual until
+    first touched.
+
+    ``prefetch_bytes`` (an uproot memory size) reads chunked streams ahead on a
+    background thread: the next chunk, or the first chunk of the next file, is
+    decoded while downstream transforms process the current one, until the
+    buffered chunks reach this budget. Each call only sees its own partition,
+    so read-ahead covers the chunks and files of that call.
+
+    ``dtypes`` narrows (or widens) numeric columns as each chunk is decoded:
+    ``{"float": "float32", "int": "int32"}`` applies to every floating-point or
+    integer leaf, and ``{"branches": {"nMuon": "int64"}}`` overrides individual
+    branches. Columns that already have the target dtype are not copied.
     """
     del stream_type
     defaults = dict(defaults or {})
     ctx = dict(ctx or {})
     partition = ctx.get("partition")
+    chunked = not metadata_only and _is_chunked(
+        step_size=step_size, step_bytes=step_bytes
+    )
+    prefetch_limit = _prefetch_limit(prefetch_bytes, chunked=chunked, lazy=lazy)
+    options = _ReadOptions(
+        tree=tree,
+        branches=branches,
+        missing_branches=missing_branches,
+        read_workers=_read_workers(read_workers),
+        metadata_cache=(
+            None
+            if metadata_cache is None
+            else RootTreeMetadataCache.from_config(dict(metadata_cache))
+        ),
+        remote_open_options=_remote_open_options(remote_read),
+        file_cache=(
+            None
+            if file_cache is None
+            else RemoteFileCache.from_config(dict(file_cache))
+        ),
+        lazy=bool(lazy),
+        preselection=_preselection(preselection),
+        expr_ctx=ctx,
+        dtypes=_dtype_policy(dtypes, lazy=bool(lazy)),
+    )
 
     if partition is not None:
         partition_start = partition.get("start")
         partition_stop = partition.get("stop")
-        return _read_one_file(
-            str(partition["file"]),
-            tree=tree,
-            branches=branches,
-            missing_branches=missing_branches,
-            start=start if partition_start is None else partition_start,
-            stop=stop if partition_stop is None else partition_stop,
-            metadata_only=metadata_only,
-        )
+        if chunked:
+            return _prefetched(
+                _iterate_one_file(
+                    str(partition["file"]),
+                    options,
+                    start=start if partition_start is None else partition_start,
+                    stop=stop if partition_stop is None else partition_stop,
+                    step_size=step_size,
+                    step_bytes=step_bytes,
+                ),
+                max_bytes=prefetch_limit,
+            )
+        with _decompression_executor(options.read_workers) as executor:
+            return _read_one_file(
+                str(partition["file"]),
+                options,
+                start=start if partition_start is None else partition_start,
+                stop=stop if partition_stop is None else partition_stop,
+                metadata_only=metadata_only,
+                decompression_executor=executor,
+            )
 
-    out: dict[str, ak.Array | RootTreeSchema] = {}
+    out: dict[str, Any] = {}
 
     for ds in datasets:
         name = str(ds["name"])
@@ -99,93 +223,765 @@ def run_root_tree_source(
         if not files:
             raise ValueError(f"Dataset '{name}' has no files")
 
-        arrays = [
-            _read_one_file(
-                path,
-                tree=tree,
-                branches=branches,
-                missing_branches=missing_branches,
-                start=start,
-                stop=stop,
-                metadata_only=metadata_only,
+        if chunked:
+            out[name] = _prefetched(
+                _iterate_files(
+                    files,
+                    options,
+                    start=start,
+                    stop=stop,
+                    step_size=step_size,
+                    step_bytes=step_bytes,
+                ),
+                max_bytes=prefetch_limit,
             )
-            for path in files
-        ]
+            continue
 
-        if metadata_only:
-            merged = arrays[0]
-        else:
-            merged = arrays[0] if len(arrays) == 1 else ak.concatenate(arrays, axis=0)
+        arrays = _read_files(
+            files,
+            options,
+            start=start,
+            stop=stop,
+            metadata_only=metadata_only,
+        )
 
-        out[name] = merged
+        # Multi-file datasets stay split per file; transforms run chunkwise and
+        # only an explicit ``concatenate()`` joins them.
+        if metadata_only or len(arrays) == 1:
+            out[name] = arrays[0]
+        else:
+            out[name] = ChunkedArray(arrays)
 
     return out
 
 
+@dataclass(frozen=True, slots=True)
+class _ReadOptions:
+    tree: str
+    branches: list[str] | None
+    missing_branches: str
+    read_workers: int = 1
+    metadata_cache: RootTreeMetadataCache | None = None
+    remote_open_options: dict[str, Any] | None = None
+    file_cache: RemoteFileCache | None = None
+    lazy: bool = False
+    preselection: str | None = None
+    expr_ctx: dict[str, Any] | None = None
+    dtypes: _DtypePolicy | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _DtypePolicy:
+    kinds: dict[str, np.dtype]
+    branches: dict[str, np.dtype]
+
+
+def _read_files(
+    files: list[str],
+    options: _ReadOptions,
+    *,
+    start: int | None,
+    stop: int | None,
+    metadata_only: bool,
+) -> list[ak.Array | RootTreeSchema]:
+    if options.read_workers == 1 or len(files) == 1 or metadata_only:
+        with _decompression_executor(options.read_workers) as executor:
+            return [
+                _read_one_file(
+                    str(path),
+                    options,
+                    start=start,
+                    stop=stop,
+                    metadata_only=metadata_only,
+                    decompression_executor=executor,
+                )
+                for path in files
+            ]
+
+    # File-level tasks block on basket decompression futures, so they must not
+    # share a pool with the decompression work or a full pool would deadlock.
+    with (
+        _decompression_executor(options.read_workers) as executor,
+        ThreadPoolExecutor(
+            max_workers=min(options.read_workers, len(files))
+        ) as file_pool,
+    ):
+        return list(
+            file_pool.map(
+                lambda path: _read_one_file(
+                    str(path),
+                    options,
+                    start=start,
+                    stop=stop,
+                    metadata_only=False,
+                    decompression_executor=executor,
+                ),
+                files,
+            )
+        )
+
+
 def _read_one_file(
     path: str,
+    options: _ReadOptions,
     *,
-    tree: str,
-    branches: list[str] | None,
-    missing_branches: str,
     start: int | None,
     stop: int | None,
     metadata_only: bool = False,
+    decompression_executor: Executor | None = None,
 ) -> ak.Array | RootTreeSchema:
-    file_path = Path(path)
-    if not _is_remote_uri(path) and not file_path.exists():
-        raise FileNotFoundError(f"ROOT input file does not exist: {path}")
-
-    with uproot.open(path if _is_remote_uri(path) else file_path) as fin:
-        try:
-            t = fin[tree]
-        except KeyError as exc:
-            raise KeyError(f"Tree '{tree}' not found in ROOT file: {path}") from exc
+    if metadata_only and options.metadata_cache is not None:
+        metadata = load_tree_metadata(
+            path,
+            tree=options.tree,
+            cache=options.metadata_cache,
+            remote_open_options=options.remote_open_options,
+            file_cache=options.file_cache,
+        )
+        branches = _resolve_branches(
+            None,
+            branches=options.branches,
+            missing_branches=options.missing_branches,
+            fields=metadata["fields"],
+        )
+        return _schema_from_metadata(
+            metadata, branches=branches, start=start, stop=stop
+        )
 
-        missing_policy = _missing_branch_policy(missing_branches)
-        if branches and missing_policy == "ignore":
-            available = set(_tree_keys(t))
-            branches = [str(branch) for branch in branches if str(branch) in available]
+    with _open_for_read(path, options, metadata_only=metadata_only) as fin:
+        t = _get_tree(fin, tree=options.tree, path=path)
+        branches = _resolve_branches(
+            t, branches=options.branches, missing_branches=options.missing_branches
+        )
 
         if metadata_only:
             return _inspect_tree_schema(t, branches=branches, start=start, stop=stop)
 
-        if not branches:
-            return t.arrays(
-                entry_start=start,
-                entry_stop=stop,
-                library="ak",
+        return _read_window(
+            t,
+            options,
+            branches=branches,
+            start=start,
+            stop=stop,
+            decompression_executor=decompression_executor,
+        )
+
+
+def _iterate_files(
+    files: list[str],
+    options: _ReadOptions,
+    *,
+    start: int | None,
+    stop: int | None,
+    step_size: int | None,
+    step_bytes: str | None,
+) -> Iterator[ak.Array]:
+    for path in files:
+        yield from _iterate_one_file(
+            str(path),
+            options,
+            start=start,
+            stop=stop,
+            step_size=step_size,
+            step_bytes=step_bytes,
+        )
+
+
+def _prefetched(chunks: Iterator[ak.Array], *, max_bytes: int | None) -> Any:
+    if max_bytes is None:
+        return chunks
+    return PrefetchIterator(chunks, max_bytes=max_bytes)
+
+
+def _prefetch_limit(value: str | None, *, chunked: bool, lazy: bool) -> int | None:
+    if value is None:
+        return None
+    if not chunked:
+        raise ValueError("root_tree prefetch_bytes requires step_size or step_bytes")
+    if lazy:
+        raise ValueError("root_tree prefetch_bytes cannot be combined with lazy")
+    try:
+        limit = uproot._util.memory_size(value)
+    except TypeError:
+        limit = 0
+    if limit <= 0:
+        raise ValueError(
+            f"root_tree prefetch_bytes must be a positive memory size, got {value!r}"
+        )
+    return limit
+
+
+def _iterate_one_file(
+    path: str,
+    options: _ReadOptions,
+    *,
+    start: int | None,
+    stop: int | None,
+    step_size: int | None,
+    step_bytes: str | None,
+) -> Iterator[ak.Array]:
+    with (
+        _open_for_read(path, options) as fin,
+        _decompression_executor(options.read_workers) as executor,
+    ):
+        t = _get_tree(fin, tree=options.tree, path=path)
+        branches = _resolve_branches(
+            t, branches=options.branches, missing_branches=options.missing_branches
+        )
+        entries_per_step = _entries_per_step(
+            t,
+            branches=branches,
+            step_size=step_size,
+            step_bytes=step_bytes,
+        )
+        for chunk_start, chunk_stop in _entry_ranges(
+            t, start=start, stop=stop, step=entries_per_step
+        ):
+            yield _read_window(
+                t,
+                options,
+                branches=branches,
+                start=chunk_start,
+                stop=chunk_stop,
+                decompression_executor=executor,
             )
 
-        safe: list[str] = []
-        opaque: list[str] = []
 
-        for b in branches:
-            if _is_opaque_for_uproot_arrays(b):
-                opaque.append(b)
-            else:
-                safe.append(b)
+def _read_workers(value: int | None) -> int:
+    if value is None:
+        return 1
+    if isinstance(value, bool) or int(value) <= 0:
+        raise ValueError(
+            f"root_tree read_workers must be a positive integer, got {value!r}"
+        )
+    return int(value)
+
+
+def _decompression_executor(
+    read_workers: int,
+) -> AbstractContextManager[Executor | None]:
+    if read_workers == 1:
+        return nullcontext(None)
+    return ThreadPoolExecutor(max_workers=read_workers)
+
+
+def _open_for_read(
+    path: str,
+    options: _ReadOptions,
+    *,
+    metadata_only: bool = False,
+) -> AbstractContextManager[Any]:
+    fin = _open_root_file(
+        path,
+        remote_open_options=options.remote_open_options,
+        file_cache=options.file_cache,
+    )
+    if options.lazy and not metadata_only:
+        # Virtual buffers read from the file on first access, so it must
+        # outlive this call; it is released once the arrays are collected.
+        return nullcontext(fin)
+    return fin
+
+
+def _open_root_file(
+    path: str,
+    *,
+    remote_open_options: dict[str, Any] | None = None,
+    file_cache: RemoteFileCache | None = None,
+) -> Any:
+    if _is_remote_uri(path) and file_cache is not None:
+        return uproot.open(file_cache.local_path(path))
+    if _is_remote_uri(path):
+        return uproot.open(path, **dict(remote_open_options or {}))
+    file_path = _local_file_path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"ROOT input file does not exist: {path}")
+    return uproot.open(file_path)
+
+
+_REMOTE_READ_COALESCE_KEYS = (
+    "max_range_gap",
+    "max_request_bytes",
+    "max_request_ranges",
+    "min_first_request_bytes",
+)
+
+
+def _remote_open_options(config: dict[str, Any] | None) -> dict[str, Any] | None:
+    if config is None:
+        return None
+    config = dict(config)
+    unknown = sorted(set(config) - {*_REMOTE_READ_COALESCE_KEYS, "max_inflight"})
+    if unknown:
+        raise ValueError(f"root_tree remote_read has unknown keys: {unknown}")
+    for key, value in config.items():
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError(
+                f"root_tree remote_read.{key} must be a non-negative integer, "
+                f"got {value!r}"
+            )
+
+    options: dict[str, Any] = {
+        "coalesce_config": CoalesceConfig(
+            **{key: config[key] for key in _REMOTE_READ_COALESCE_KEYS if key in config}
+        )
+    }
+    if "max_request_ranges" in config:
+        # Honoured by the native XRootD handler's vector reads.
+        options["max_num_elements"] = config["max_request_ranges"]
+    if "max_inflight" in config:
+        options["num_workers"] = max(1, config["max_inflight"])
+    return options
+
+
+def _get_tree(fin: Any, *, tree: str, path: str) -> Any:
+    try:
+        return fin[tree]
+    except KeyError as exc:
+        raise KeyError(f"Tree '{tree}' not found in ROOT file: {path}") from exc
 
-        out: dict[str, Any] = {}
 
-        if safe:
-            arrs = t.arrays(
-                safe,
-                entry_start=start,
-                entry_stop=stop,
-                library="ak",
+def _resolve_branches(
+    t: Any,
+    *,
+    branches: list[str] | None,
+    missing_branches: str,
+    fields: list[str] | None = None,
+) -> list[str] | None:
+    missing_policy = _missing_branch_policy(missing_branches)
+    if branches and missing_policy == "ignore":
+        available = set(_tree_keys(t) if fields is None else fields)
+        return [str(branch) for branch in branches if str(branch) in available]
+    return branches
+
+
+def _read_window(
+    t: Any,
+    options: _ReadOptions,
+    *,
+    branches: list[str] | None,
+    start: int | None,
+    stop: int | None,
+    decompression_executor: Executor | None,
+) -> ak.Array:
+    if options.lazy:
+        if options.preselection is None:
+            return _read_virtual_arrays(t, branches=branches, start=start, stop=stop)
+        return _read_preselected_arrays(
+            t,
+            options,
+            branches=branches,
+            start=start,
+            stop=stop,
+            decompression_executor=decompression_executor,
+        )
+    if options.preselection is not None:
+        arrays = _read_preselected_arrays(
+            t,
+            options,
+            branches=branches,
+            start=start,
+            stop=stop,
+            decompression_executor=decompression_executor,
+        )
+    else:
+        arrays = _read_tree_arrays(
+            t,
+            branches=branches,
+            start=start,
+            stop=stop,
+            decompression_executor=decompression_executor,
+        )
+    if options.dtypes is None:
+        return arrays
+    return _apply_dtypes(arrays, options.dtypes)
+
+
+def _read_preselected_arrays(
+    t: Any,
+    options: _ReadOptions,
+    *,
+    branches: list[str] | None,
+    start: int | None,
+    stop: int | None,
+    decompression_executor: Executor | None,
+) -> ak.Array:
+    expr = str(options.preselection)
+    expr_ctx = dict(options.expr_ctx or {})
+    available = [str(key) for key in _tree_keys(t)]
+    predicate_branches = _preselection_branches(expr, expr_ctx, available=available)
+
+    num_entries = int(t.num_entries)
+    window_start = max(0, int(start or 0))
+    window_stop = num_entries if stop is None else min(num_entries, int(stop))
+    window_stop = max(window_start, window_stop)
+
+    length = window_stop - window_start
+    if predicate_branches:
+        predicate = _read_tree_arrays(
+            t,
+            branches=predicate_branches,
+            start=window_start,
+            stop=window_stop,
+            decompression_executor=decompression_executor,
+        )
+    else:
+        # A predicate over no branches is evaluated without reading any.
+        predicate = ak.Array(ak.contents.RecordArray([], [], length=length))
+    mask = _preselection_mask(
+        eval_expr(predicate, expr, expr_ctx), expr=expr, length=length
+    )
+
+    selected = [str(branch) for branch in branches] if branches else available
+    remaining = [branch for branch in selected if branch not in predicate_branches]
+    parts = [predicate[mask]]
+
+    if remaining and options.lazy:
+        # Masking the whole record defers the carry, so each virtual branch is
+        # still only materialised when it is accessed.
+        window = _read_virtual_arrays(
+            t, branches=remaining, start=window_start, stop=window_stop
+        )
+        parts.append(window[mask])
+    elif remaining:
+        pieces = []
+        for range_start, range_stop in _surviving_ranges(
+            mask,
+            boundaries=_entry_boundaries(t, num_entries=num_entries),
+            start=window_start,
+        ):
+            piece = _read_tree_arrays(
+                t,
+                branches=remaining,
+                start=range_start,
+                stop=range_stop,
+                decompression_executor=decompression_executor,
             )
-            for k in arrs.fields:
-                out[k] = arrs[k]
-
-        for b in opaque:
-            out[b] = t[b].array(
-                entry_start=start,
-                entry_stop=stop,
-                library="ak",
+            local = mask[range_start - window_start : range_stop - window_start]
+            pieces.append(piece[local])
+        parts.append(pieces[0] if len(pieces) == 1 else ak.concatenate(pieces, axis=0))
+
+    return _select_fields(parts, selected)
+
+
+def _select_fields(parts: list[ak.Array], fields: list[str]) -> ak.Array:
+    """Return the read holding exactly ``fields``, else gather them into one record."""
+    for part in parts:
+        if part.fields == fields:
+            return part
+    source = {field: part for part in parts for field in part.fields}
+    present = [field for field in fields if field in source]
+    return ak.Array(
+        ak.contents.RecordArray(
+            [source[field][field].layout for field in present],
+            present,
+            length=len(parts[0]),
+        )
+    )
+
+
+_DTYPE_KINDS = {"float": "f", "int": "iu"}
+
+
+def _dtype_policy(config: dict[str, Any] | None, *, lazy: bool) -> _DtypePolicy | None:
+    if config is None:
+        return None
+    if lazy:
+        raise ValueError("root_tree dtypes cannot be combined with lazy")
+    config = dict(config)
+    unknown = sorted(set(config) - {*_DTYPE_KINDS, "branches"})
+    if unknown:
+        raise ValueError(f"root_tree dtypes has unknown keys: {unknown}")
+
+    kinds: dict[str, np.dtype] = {}
+    for key, codes in _DTYPE_KINDS.items():
+        if config.get(key) is not None:
+            dtype = _numeric_dtype(config[key], name=key)
+            kinds.update(dict.fromkeys(codes, dtype))
+    branches = {
+        str(branch): _numeric_dtype(value, name=f"branches.{branch}")
+        for branch, value in dict(config.get("branches") or {}).items()
+    }
+    return _DtypePolicy(kinds=kinds, branches=branches)
+
+
+def _numeric_dtype(value: Any, *, name: str) -> np.dtype:
+    try:
+        dtype = np.dtype(value)
+    except TypeError as exc:
+        raise ValueError(f"root_tree dtypes.{name} has unsupported dtype {value!r}") from exc
+    if dtype.kind not in "fiu":
+        raise ValueError(f"root_tree dtypes.{name} must be numeric, got {value!r}")
+    return dtype
+
+
+def _apply_dtypes(arrays: ak.Array, policy: _DtypePolicy) -> ak.Array:
+    if not arrays.fields:
+        return arrays
+    contents = [
+        ak.transform(
+            partial(
+                _convert_leaf,
+                override=policy.branches.get(field),
+                kinds=policy.kinds,
+            ),
+            arrays[field].layout,
+            highlevel=False,
+        )
+        for field in arrays.fields
+    ]
+    return ak.Array(
+        ak.contents.RecordArray(contents, arrays.fields, length=len(arrays))
+    )
+
+
+def _convert_leaf(
+    node: Any,
+    *,
+    override: np.dtype | None,
+    kinds: dict[str, np.dtype],
+    **kwargs: Any,
+) -> Any:
+    if not isinstance(node, ak.contents.NumpyArray):
+        return None
+    if node.dtype.kind not in "fiu":
+        return node
+    target = override or kinds.get(node.dtype.kind)
+    if target is None or node.dtype == target:
+        return node
+    return ak.contents.NumpyArray(
+        node.data.astype(target, copy=False), parameters=node.parameters
+    )
+
+
+def _preselection(value: str | None) -> str | None:
+    if value is None:
+        return None
+    expr = str(value).strip()
+    if not expr:
+        raise ValueError("root_tree preselection must be a non-empty expression")
+    return expr
+
+
+def _preselection_branches(
+    expr: str,
+    expr_ctx: dict[str, Any],
+    *,
+    available: list[str],
+) -> list[str]:
+    registry = expr_ctx.get("expr_registry") or default_expr_registry()
+    symbols = data_symbols_in_expr(
+        expr,
+        known_functions=set(registry.functions),
+        known_constants=set(registry.constants),
+        context_symbols=set(expr_ctx),
+        produced=set(),
+    )
+    missing = sorted(symbol for symbol in symbols if symbol not in available)
+    if missing:
+        raise KeyError(f"root_tree preselection references unknown branches: {missing}")
+    return sorted(symbols)
+
+
+def _preselection_mask(value: Any, *, expr: str, length: int) -> np.ndarray:
+    error = f"root_tree preselection {expr!r} must give one boolean per event"
+    try:
+        if isinstance(value, ak.Array):
+            value = ak.to_numpy(value)
+        mask = np.asarray(value, dtype=np.bool_)
+    except Exception as exc:
+        raise ValueError(error) from exc
+    if mask.ndim == 0:
+        return np.full(length, bool(mask))
+    if mask.shape != (length,):
+        raise ValueError(error)
+    return mask
+
+
+def _surviving_ranges(
+    mask: np.ndarray,
+    *,
+    boundaries: list[int],
+    start: int,
+) -> list[tuple[int, int]]:
+    """Merge the basket ranges of the window that hold at least one survivor."""
+    stop = start + len(mask)
+    cuts = np.asarray(
+        [start, *(b for b in boundaries if start < b < stop), stop], dtype=np.int64
+    )
+    if len(mask) == 0:
+        return [(start, start)]
+
+    survivors = np.add.reduceat(mask.astype(np.int64), cuts[:-1] - start)
+    ranges: list[tuple[int, int]] = []
+    for index in np.flatnonzero(survivors):
+        range_start, range_stop = int(cuts[index]), int(cuts[index + 1])
+        if ranges and ranges[-1][1] == range_start:
+            ranges[-1] = (ranges[-1][0], range_stop)
+        else:
+            ranges.append((range_start, range_stop))
+    # An empty read still yields correctly typed, zero-length columns.
+    return ranges or [(start, start)]
+
+
+_UPROOT_LANGUAGE = uproot.language.python.python_language
+
+
+def _read_tree_arrays(
+    t: Any,
+    *,
+    branches: list[str] | None,
+    start: int | None,
+    stop: int | None,
+    decompression_executor: Executor | None = None,
+) -> ak.Array:
+    read_kwargs: dict[str, Any] = {}
+    if decompression_executor is not None:
+        read_kwargs["decompression_executor"] = decompression_executor
+
+    if not branches:
+        return t.arrays(
+            entry_start=start,
+            entry_stop=stop,
+            library="ak",
+            **read_kwargs,
+        )
+
+    # Branch names the expression parser cannot handle are read through
+    # ``get(...)`` aliases so that every branch comes from one batched call.
+    expressions: list[str] = []
+    aliases: dict[str, str] = {}
+    for index, b in enumerate(branches):
+        if _is_opaque_for_uproot_arrays(b):
+            alias = f"_opaque_{index}"
+            aliases[alias] = _UPROOT_LANGUAGE.getter_of(str(b))
+            expressions.append(alias)
+        else:
+            expressions.append(str(b))
+    if aliases:
+        read_kwargs["aliases"] = aliases
+
+    arrays = t.arrays(
+        expressions,
+        entry_start=start,
+        entry_stop=stop,
+        library="ak",
+        **read_kwargs,
+    )
+    if not aliases:
+        return arrays
+
+    layout = arrays.layout
+    return ak.Array(
+        ak.contents.RecordArray(
+            [layout.content(expr) for expr in expressions],
+            [str(b) for b in branches],
+            length=layout.length,
+        )
+    )
+
+
+def _read_virtual_arrays(
+    t: Any,
+    *,
+    branches: list[str] | None,
+    start: int | None,
+    stop: int | None,
+) -> ak.Array:
+    # Decompression executors are scoped to this read, while virtual buffers
+    # materialise later, so lazy reads use the file's own executors.
+    filters: dict[str, Any] = {}
+    if branches:
+        filters["filter_name"] = list(branches)
+    return t.arrays(
+        entry_start=start,
+        entry_stop=stop,
+        library="ak",
+        virtual=True,
+        **filters,
+    )
+
+
+def _is_chunked(*, step_size: int | None, step_bytes: str | None) -> bool:
+    if step_size is not None and step_bytes is not None:
+        raise ValueError("root_tree accepts only one of step_size or step_bytes")
+    if step_size is not None:
+        if isinstance(step_size, bool) or int(step_size) <= 0:
+            raise ValueError(
+                f"root_tree step_size must be a positive integer, got {step_size!r}"
             )
+        return True
+    if step_bytes is not None:
+        if not str(step_bytes).strip():
+            raise ValueError("root_tree step_bytes must be a non-empty memory size")
+        return True
+    return False
 
-        return ak.zip(out, depth_limit=1)
+
+def _entries_per_step(
+    t: Any,
+    *,
+    branches: list[str] | None,
+    step_size: int | None,
+    step_bytes: str | None,
+) -> int:
+    if step_size is not None:
+        return int(step_size)
+    if branches:
+        entries = t.num_entries_for(str(step_bytes), filter_name=list(branches))
+    else:
+        entries = t.num_entries_for(str(step_bytes))
+    return max(1, int(entries))
+
+
+def _entry_ranges(
+    t: Any,
+    *,
+    start: int | None,
+    stop: int | None,
+    step: int,
+) -> Iterator[tuple[int, int]]:
+    total = int(t.num_entries)
+    selected_start = max(0, int(start or 0))
+    selected_stop = total if stop is None else min(total, int(stop))
+    if _is_rntuple(t):
+        yield from _cluster_aligned_ranges(
+            _entry_boundaries(t, num_entries=total),
+            start=selected_start,
+            stop=selected_stop,
+            step=step,
+        )
+        return
+    for chunk_start in range(selected_start, selected_stop, step):
+        yield chunk_start, min(chunk_start + step, selected_stop)
+
+
+def _cluster_aligned_ranges(
+    boundaries: list[int],
+    *,
+    start: int,
+    stop: int,
+    step: int,
+) -> Iterator[tuple[int, int]]:
+    """
+    Pack whole RNTuple clusters into chunks of at most ``step`` entries.
+
+    Clusters larger than ``step`` are split into ``step``-sized pieces; every
+    other chunk starts and ends on a cluster boundary.
+    """
+    cuts = [start, *(b for b in boundaries if start < b < stop), stop]
+    chunk_start = start
+    for cluster_start, cluster_stop in pairwise(cuts):
+        if cluster_stop - chunk_start <= step:
+            continue
+        if chunk_start < cluster_start:
+            yield chunk_start, cluster_start
+            chunk_start = cluster_start
+        while cluster_stop - chunk_start > step:
+            yield chunk_start, chunk_start + step
+            chunk_start += step
+    if chunk_start < stop:
+        yield chunk_start, stop
 
 
 def _inspect_tree_schema(
@@ -195,7 +991,22 @@ def _inspect_tree_schema(
     start: int | None,
     stop: int | None,
 ) -> RootTreeSchema:
-    fields = [str(field) for field in _tree_keys(tree)]
+    return _schema_from_metadata(
+        _tree_metadata(tree, layout=False),
+        branches=branches,
+        start=start,
+        stop=stop,
+    )
+
+
+def _schema_from_metadata(
+    metadata: dict[str, Any],
+    *,
+    branches: list[str] | None,
+    start: int | None,
+    stop: int | None,
+) -> RootTreeSchema:
+    fields = list(metadata["fields"])
     if branches:
         requested = [str(branch) for branch in branches]
         missing = [branch for branch in requested if branch not in fields]
@@ -203,8 +1014,8 @@ def _inspect_tree_schema(
             raise KeyError(f"Branches not found in ROOT tree: {missing}")
         fields = requested
 
-    typenames = _tree_typenames(tree)
-    interpretations = _tree_interpretations(tree)
+    typenames = metadata["typenames"]
+    interpretations = metadata["interpretations"]
     awkward_type = {
         field: _field_schema_type(field, typenames=typenames, interpretations=interpretations)
         for field in fields
@@ -212,10 +1023,107 @@ def _inspect_tree_schema(
     return RootTreeSchema(
         fields=fields,
         awkward_type=awkward_type,
-        entry_count=_selected_entry_count(tree, start=start, stop=stop),
+        entry_count=_selected_entry_count(
+            metadata["num_entries"], start=start, stop=stop
+        ),
+    )
+
+
+def load_tree_metadata(
+    path: str,
+    *,
+    tree: str,
+    cache: RootTreeMetadataCache | None,
+    remote_open_options: dict[str, Any] | None = None,
+    file_cache: RemoteFileCache | None = None,
+) -> dict[str, Any]:
+    """
+    Return the metadata record of ``tree`` in ``path``.
+
+    The record holds the fields, typenames, entry count and cluster/basket
+    entry boundaries. With a ``cache``, it is served from and stored in the
+    metadata cache so unchanged files are not reopened.
+    """
+    if cache is not None:
+        cached = cache.get(path, tree)
+        if cached is not None:
+            return cached
+
+    with _open_root_file(
+        path,
+        remote_open_options=remote_open_options,
+        file_cache=file_cache,
+    ) as fin:
+        metadata = _tree_metadata(_get_tree(fin, tree=tree, path=path))
+
+    if cache is not None:
+        cache.put(path, tree, metadata)
+    return metadata
+
+
+def _tree_metadata(tree: Any, *, layout: bool = True) -> dict[str, Any]:
+    """Return the JSON-serialisable metadata record stored by the cache."""
+    num_entries = _num_entries(tree)
+    metadata: dict[str, Any] = {
+        "fields": [str(field) for field in _tree_keys(tree)],
+        "typenames": {
+            str(key): str(value) for key, value in _tree_typenames(tree).items()
+        },
+        "interpretations": {
+            str(key): str(value) for key, value in _tree_interpretations(tree).items()
+        },
+        "num_entries": num_entries,
+    }
+    if layout:
+        metadata["entry_boundaries"] = (
+            None
+            if num_entries is None
+            else _entry_boundaries(tree, num_entries=num_entries)
+        )
+        metadata["compressed_bytes"] = _compressed_bytes(tree)
+    return metadata
+
+
+def _num_entries(tree: Any) -> int | None:
+    num_entries = getattr(tree, "num_entries", None)
+    if num_entries is None:
+        return None
+    try:
+        return int(num_entries)
+    except Exception:
+        return None
+
+
+def _entry_boundaries(tree: Any, *, num_entries: int) -> list[int]:
+    common_entry_offsets = getattr(tree, "common_entry_offsets", None)
+    if callable(common_entry_offsets):
+        offsets = [int(offset) for offset in common_entry_offsets()]
+    else:
+        offsets = [
+            int(cluster.num_first_entry)
+            for cluster in getattr(tree, "cluster_summaries", None) or []
+        ]
+    return sorted(
+        {offset for offset in (0, num_entries, *offsets) if 0 <= offset <= num_entries}
     )
 
 
+def _compressed_bytes(tree: Any) -> int | None:
+    if _is_rntuple(tree):
+        return sum(
+            int(page.locator.num_bytes)
+            for cluster in tree.page_link_list
+            for column in cluster
+            for page in column.pages
+        )
+    compressed = getattr(tree, "compressed_bytes", None)
+    if compressed is not None:
+        return int(compressed)
+    file = getattr(tree, "file", None)
+    end = getattr(file, "fEND", None)
+    return None if end is None else int(end)
+
+
 def _tree_keys(tree: Any) -> list[str]:
     keys = tree.keys() if callable(getattr(tree, "keys", None)) else []
     return list(keys)
@@ -233,6 +1141,13 @@ def _missing_branch_policy(value: str) -> str:
 
 def _tree_typenames(tree: Any) -> dict[str, Any]:
     typenames = getattr(tree, "typenames", None)
+    if callable(typenames) and _is_rntuple(tree):
+        # Record and collection fields carry no C++ typename in the RNTuple
+        # header; describe them with their awkward type instead.
+        return {
+            name: typename or _rntuple_field_type(tree, name)
+            for name, typename in typenames().items()
+        }
     if callable(typenames):
         return dict(typenames())
     if isinstance(typenames, dict):
@@ -240,6 +1155,15 @@ def _tree_typenames(tree: Any) -> dict[str, Any]:
     return {}
 
 
+def _rntuple_field_type(tree: Any, name: str) -> str:
+    form, _ = tree[name].to_akform()
+    return str(form.contents[-1].type)
+
+
+def _is_rntuple(tree: Any) -> bool:
+    return isinstance(tree, uproot.behaviors.RNTuple.RNTuple)
+
+
 def _tree_interpretations(tree: Any) -> dict[str, Any]:
     interpretations = getattr(tree, "interpretations", None)
     if callable(interpretations):
@@ -263,18 +1187,14 @@ def _field_schema_type(
 
 
 def _selected_entry_count(
-    tree: Any,
+    num_entries: int | None,
     *,
     start: int | None,
     stop: int | None,
 ) -> int | None:
-    num_entries = getattr(tree, "num_entries", None)
     if num_entries is None:
         return None
-    try:
-        total = int(num_entries)
-    except Exception:
-        return None
+    total = int(num_entries)
     selected_start = max(0, int(start or 0))
     selected_stop = total if stop is None else min(total, int(stop))
     return max(0, selected_stop - selected_start)
@@ -291,4 +1211,11 @@ def _is_opaque_for_uproot_arrays(expr: str) -> bool:
 
 
 def _is_remote_uri(path: str) -> bool:
-    return bool(urlparse(path).scheme)
+    return urlparse(path).scheme not in ("", "file")
+
+
+def _local_file_path(path: str) -> Path:
+    parsed = urlparse(path)
+    if parsed.scheme == "file":
+        return Path(url2pathname(parsed.path))
+    return Path(path)
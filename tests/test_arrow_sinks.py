@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+from re import escape
+from typing import Any
+
+import awkward as ak
+import numpy as np
+import pytest
+
+from fasthep_carpenter.runtime.chunked import ChunkedArray
+from fasthep_carpenter.sinks.arrow import (
+    MISSING_PYARROW_MESSAGE,
+    run_arrow_ipc_write,
+    run_parquet_write,
+)
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_parquet_writer_rebatches_chunks_into_row_groups(tmp_path: Path) -> None:
+    output_path = tmp_path / "skim.parquet"
+
+    result = run_parquet_write(
+        _chunks(),
+        path=str(output_path),
+        keep=["pt", "jets"],
+        row_group_size=3,
+        dictionary_encoding=True,
+        ctx={"dataset_name": "sample", "partition": {"part": "0_2"}},
+    )
+
+    metadata = pq.ParquetFile(output_path).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [
+        3,
+        2,
+    ]
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+    assert metadata.row_group(0).column(0).statistics.has_min_max
+    assert ak.to_list(ak.from_parquet(output_path)) == ak.to_list(
+        _chunks().concatenate()[["pt", "jets"]]
+    )
+
+    record = result.metadata["writer_manifest"]
+    assert result.format == "parquet"
+    assert record["kind"] == "parquet"
+    assert record["format"] == "parquet"
+    assert record["dataset"] == "sample"
+    assert record["partition"] == 2
+    assert record["entries"] == 5
+    assert record["size_bytes"] == output_path.stat().st_size
+    assert record["tree"] is None
+
+
+def test_parquet_writer_passes_chunks_through_without_row_group_size(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    output_path = tmp_path / "skim.parquet"
+    chunks = ChunkedArray([_chunks().chunks[0], _chunks().chunks[1][:0], *_chunks()])
+    concatenated: list[Any] = []
+    real_concatenate = ak.concatenate
+
+    def recording_concatenate(arrays: Any, *args: Any, **kwargs: Any) -> Any:
+        concatenated.append(arrays)
+        return real_concatenate(arrays, *args, **kwargs)
+
+    monkeypatch.setattr(ak, "concatenate", recording_concatenate)
+
+    result = run_parquet_write(chunks, path=str(output_path))
+
+    metadata = pq.ParquetFile(output_path).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [
+        2,
+        2,
+        3,
+    ]
+    assert concatenated == []
+    assert result.metadata["entries"] == 7
+
+
+def test_arrow_ipc_writer_outputs_memory_mappable_batches(tmp_path: Path) -> None:
+    output_path = tmp_path / "skim.arrow"
+
+    result = run_arrow_ipc_write(_chunks(), path=str(output_path), row_group_size=2)
+
+    with pa.memory_map(str(output_path)) as source:
+        reader = pa.ipc.open_file(source)
+        assert [
+            reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+        ] == [
+            2,
+            2,
+            1,
+        ]
+        table = reader.read_all()
+    assert table.column_names == ["pt", "jets", "name"]
+    assert table["jets"].to_pylist() == [[1.0], [], [2.0, 3.0], [4.0], []]
+    assert result.metadata["entries"] == 5
+    assert (
+        result.metadata["writer_manifest"]["size_bytes"] == output_path.stat().st_size
+    )
+
+
+def test_parquet_writer_concatenates_once_per_row_group(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    output_path = tmp_path / "small_chunks.parquet"
+    chunks = ChunkedArray(ak.Array({"x": [float(i)]}) for i in range(10))
+    real_concatenate = ak.concatenate
+    calls = []
+
+    def counting_concatenate(arrays: Any, *args: Any, **kwargs: Any) -> Any:
+        calls.append(len(arrays))
+        return real_concatenate(arrays, *args, **kwargs)
+
+    monkeypatch.setattr(ak, "concatenate", counting_concatenate)
+    run_parquet_write(chunks, path=str(output_path), row_group_size=4)
+    monkeypatch.undo()
+
+    metadata = pq.ParquetFile(output_path).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [
+        4,
+        4,
+        2,
+    ]
+    assert calls == [4, 4, 2]
+    assert ak.from_parquet(output_path)["x"].tolist() == [float(i) for i in range(10)]
+
+
+def test_columnar_writers_reject_empty_streams(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="parquet writer received an empty stream"):
+        run_parquet_write(iter([]), path=str(tmp_path / "empty.parquet"))
+
+
+def test_columnar_writers_require_pyarrow(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    real_import_module = importlib.import_module
+
+    def fake_import_module(name: str, package: str | None = None) -> Any:
+        if name.startswith("pyarrow"):
+            raise ModuleNotFoundError("No module named 'pyarrow'")
+        return real_import_module(name, package)
+
+    monkeypatch.setattr(
+        "fasthep_carpenter.sinks.arrow.importlib.import_module",
+        fake_import_module,
+    )
+
+    with pytest.raises(RuntimeError, match=escape(MISSING_PYARROW_MESSAGE)):
+        run_arrow_ipc_write(_chunks(), path=str(tmp_path / "skim.arrow"))
+
+
+def _chunks() -> ChunkedArray:
+    return ChunkedArray(
+        [
+            ak.Array(
+                {
+                    "pt": np.array([10.0, 20.0], dtype=np.float32),
+                    "jets": [[1.0], []],
+                    "name": ["a", "b"],
+                }
+            ),
+            ak.Array(
+                {
+                    "pt": np.array([30.0, 40.0, 50.0], dtype=np.float32),
+                    "jets": [[2.0, 3.0], [4.0], []],
+                    "name": ["a", "a", "c"],
+                }
+            ),
+        ]
+    )
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+from typing import Any
+
+import awkward as ak
+import numpy as np
+import pytest
+
+from fasthep_carpenter.runtime.chunked import ChunkedArray
+from fasthep_carpenter.sinks.arrow import run_arrow_ipc_write, run_parquet_write
+from fasthep_carpenter.sources import arrow as arrow_source
+from fasthep_carpenter.sources.arrow import run_arrow_ipc_source, run_parquet_source
+from fasthep_carpenter.sources.root_tree import RootTreeSchema
+
+pytest.importorskip("pyarrow")
+
+
+def test_parquet_source_skips_row_groups_ruled_out_by_statistics(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    path = _write_parquet(tmp_path / "events.parquet")
+    reads: list[tuple[int, list[str]]] = []
+    real_read = arrow_source._ParquetInput.read
+
+    def recording_read(
+        self: arrow_source._ParquetInput, index: int, columns: list[str]
+    ) -> object:
+        reads.append((index, list(columns)))
+        return real_read(self, index, columns)
+
+    monkeypatch.setattr(arrow_source._ParquetInput, "read", recording_read)
+
+    out = run_parquet_source(
+        datasets=[{"name": "sample", "files": [str(path)]}],
+        branches=["Jet_pt"],
+        filters=[{"column": "nJet", "op": ">=", "value": 7}],
+    )
+
+    assert reads == [(2, ["Jet_pt", "nJet"]), (3, ["Jet_pt", "nJet"])]
+    assert out["sample"].fields == ["Jet_pt"]
+    assert ak.to_list(out["sample"].Jet_pt) == [[7.0], [8.0, 8.0], []]
+
+
+def test_parquet_source_reads_partition_entry_window(tmp_path: Path) -> None:
+    path = _write_parquet(tmp_path / "events.parquet")
+
+    out = run_parquet_source(
+        datasets=[],
+        ctx={"partition": {"file": str(path), "start": 2, "stop": 5}},
+    )
+
+    assert out.fields == ["nJet", "Jet_pt"]
+    assert out.nJet.tolist() == [2, 3, 4]
+
+
+def test_parquet_source_keeps_multi_file_datasets_chunked(tmp_path: Path) -> None:
+    first = _write_parquet(tmp_path / "first.parquet")
+    second = _write_parquet(tmp_path / "second.parquet")
+
+    out = run_parquet_source(
+        datasets=[{"name": "sample", "files": [str(first), str(second)]}],
+        start=8,
+    )
+
+    assert isinstance(out["sample"], ChunkedArray)
+    assert [len(chunk) for chunk in out["sample"]] == [2, 2]
+
+
+def test_parquet_source_metadata_only_returns_schema(tmp_path: Path) -> None:
+    path = _write_parquet(tmp_path / "events.parquet")
+
+    out = run_parquet_source(
+        datasets=[{"name": "sample", "files": [str(path)]}],
+        metadata_only=True,
+        stop=4,
+    )
+
+    assert out["sample"] == RootTreeSchema(
+        fields=["nJet", "Jet_pt"],
+        awkward_type={"nJet": "int64", "Jet_pt": "var * float64"},
+        entry_count=4,
+    )
+
+
+def test_arrow_ipc_source_memory_maps_batches(tmp_path: Path) -> None:
+    path = tmp_path / "events.arrow"
+    run_arrow_ipc_write(_events(), path=str(path), row_group_size=4)
+
+    out = run_arrow_ipc_source(
+        datasets=[{"name": "sample", "files": [str(path)]}],
+        filters=[{"column": "nJet", "op": "<", "value": 2}],
+        branches=["Jet_pt", "missing"],
+        missing_branches="ignore",
+    )
+
+    assert ak.to_list(out["sample"]) == [{"Jet_pt": []}, {"Jet_pt": [1.0]}]
+
+
+def test_arrow_ipc_source_reads_unmapped_batches_once_up_to_the_window(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    path = tmp_path / "events.arrow"
+    run_arrow_ipc_write(_events(), path=str(path), row_group_size=3)
+    ipc = importlib.import_module("pyarrow.ipc")
+    real_open_file = ipc.open_file
+    loaded: list[int] = []
+
+    class RecordingReader:
+        def __init__(self, source: Any) -> None:
+            self._reader = real_open_file(source)
+            self.schema = self._reader.schema
+            self.num_record_batches = self._reader.num_record_batches
+
+        def get_batch(self, index: int) -> Any:
+            loaded.append(index)
+            return self._reader.get_batch(index)
+
+    monkeypatch.setattr(ipc, "open_file", RecordingReader)
+    out = run_arrow_ipc_source(
+        datasets=[],
+        memory_map=False,
+        ctx={"partition": {"file": str(path), "start": 2, "stop": 5}},
+    )
+
+    assert ak.to_list(out["nJet"]) == [2, 3, 4]
+    assert loaded == [0, 1]
+
+
+def test_columnar_source_rejects_invalid_filters(tmp_path: Path) -> None:
+    path = _write_parquet(tmp_path / "events.parquet")
+
+    with pytest.raises(ValueError, match="parquet filters must be mappings"):
+        run_parquet_source(
+            datasets=[{"name": "sample", "files": [str(path)]}],
+            filters=[{"column": "nJet", "op": "~", "value": 1}],
+        )
+
+
+def _events() -> ak.Array:
+    return ak.Array(
+        {
+            "nJet": np.arange(10, dtype=np.int64),
+            "Jet_pt": [[float(i)] * (i % 3) for i in range(10)],
+        }
+    )
+
+
+def _write_parquet(path: Path) -> Path:
+    run_parquet_write(_events(), path=str(path), row_group_size=3)
+    return path
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import awkward as ak
+import pytest
+import uproot
+
+from fasthep_carpenter.operations.cutflow import run_cutflow_transform
+from fasthep_carpenter.operations.define import run_define_transform
+from fasthep_carpenter.operations.hist import run_hist_transform
+from fasthep_carpenter.operations.zip_join import run_zip_join
+from fasthep_carpenter.products import merge_event_streams
+from fasthep_carpenter.runtime.chunked import ChunkedArray
+from fasthep_carpenter.sinks.root_tree import run_root_tree_write
+
+
+def _chunks() -> ChunkedArray:
+    return ChunkedArray(
+        [
+            ak.Array({"x": [1.0, 2.0], "w": [1.0, 1.0]}),
+            ak.Array({"x": [3.0, 4.0, 5.0], "w": [2.0, 2.0, 2.0]}),
+        ]
+    )
+
+
+def test_chunked_array_keeps_a_length_index() -> None:
+    stream = _chunks()
+
+    assert len(stream) == 5
+    assert stream.offsets.tolist() == [0, 2, 5]
+    assert stream.locate(3) == (1, 1)
+    assert stream.fields == ["x", "w"]
+    assert ak.to_list(stream.concatenate().x) == [1.0, 2.0, 3.0, 4.0, 5.0]
+    with pytest.raises(TypeError, match="only supports field access"):
+        stream[0]
+
+
+def test_chunkwise_transform_returns_chunks() -> None:
+    out = run_define_transform(
+        stream=_chunks(),
+        variables=[{"name": "y", "expr": "x * 2"}],
+    )
+
+    assert isinstance(out, ChunkedArray)
+    assert [len(chunk) for chunk in out] == [2, 3]
+    assert ak.to_list(out["y"].concatenate()) == [2.0, 4.0, 6.0, 8.0, 10.0]
+
+
+def test_chunkwise_products_are_merged_across_chunks() -> None:
+    h = run_hist_transform(
+        stream=_chunks(),
+        axes=[
+            {
+                "name": "x",
+                "type": "regular",
+                "source": "x",
+                "bins": {"nbins": 5, "low": 0.5, "high": 5.5},
+            }
+        ],
+        weight_expr="w",
+        storage="weighted",
+    )
+    assert h.values().tolist() == [1.0, 1.0, 2.0, 2.0, 2.0]
+
+    out = run_cutflow_transform(stream=_chunks(), selection={"high": ["x > 1.5"]})
+    assert isinstance(out["stream"], ChunkedArray)
+    assert len(out["stream"]) == 4
+    (row,) = out["cutflow"]["cuts"]
+    assert (row["n_unweighted_in"], row["n_unweighted_out"]) == (5, 4)
+
+
+def test_chunkwise_stream_closes_its_source_when_abandoned() -> None:
+    source = _ClosingSource(_chunks())
+
+    out = run_define_transform(
+        stream=source,
+        variables=[{"name": "y", "expr": "x * 2"}],
+    )
+    assert ak.to_list(next(out)["y"]) == [2.0, 4.0]
+    out.close()
+
+    assert source.closed
+
+
+def test_cutflow_streams_filtered_chunks_and_sums_counts_lazily() -> None:
+    pulled: list[int] = []
+
+    def source() -> Iterator[ak.Array]:
+        for index, chunk in enumerate(_chunks()):
+            pulled.append(index)
+            yield chunk
+
+    recorder = _Recorder()
+    out = run_cutflow_transform(
+        stream=source(),
+        selection={"high": ["x > 1.5"]},
+        ctx=_RuntimeContext({"provenance": recorder}),
+    )
+    assert isinstance(out["stream"], Iterator)
+    assert pulled == []
+    assert len(recorder.operations) == 1
+
+    assert [len(chunk) for chunk in out["stream"]] == [1, 3]
+    (row,) = out["cutflow"]["cuts"]
+    assert (row["n_unweighted_in"], row["n_unweighted_out"]) == (5, 4)
+    assert len(recorder.operations) == 1
+
+
+def test_cutflow_counts_drain_an_unconsumed_stream() -> None:
+    out = run_cutflow_transform(stream=iter(_chunks()), selection={"high": ["x > 1.5"]})
+
+    (row,) = out["cutflow"]["cuts"]
+    assert row["n_unweighted_out"] == 4
+    with pytest.raises(RuntimeError, match="drained to complete its counts"):
+        list(out["stream"])
+
+
+def test_zip_join_zips_streamed_chunks() -> None:
+    reco = iter(_chunks())
+    gen = ChunkedArray([ak.Array({"x": [1.5, 2.5]}), ak.Array({"x": [3.5] * 3})])
+
+    out = run_zip_join(
+        inputs=[{"name": "reco", "prefix": "reco"}, {"name": "gen", "prefix": "gen"}],
+        reco=reco,
+        gen=gen,
+    )
+
+    assert isinstance(out, Iterator)
+    chunks = list(out)
+    assert [len(chunk) for chunk in chunks] == [2, 3]
+    assert ak.to_list(chunks[1].gen.x) == [3.5, 3.5, 3.5]
+    assert ak.to_list(chunks[1].reco.w) == [2.0, 2.0, 2.0]
+
+
+class _ClosingSource(Iterator[Any]):
+    def __init__(self, chunks: ChunkedArray) -> None:
+        self._chunks = iter(chunks)
+        self.closed = False
+
+    def __next__(self) -> Any:
+        return next(self._chunks)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.operations: list[dict[str, Any]] = []
+
+    def record_operation(self, **kwargs: Any) -> None:
+        self.operations.append(kwargs)
+
+
+class _RuntimeContext(dict[str, Any]):
+    @property
+    def provenance(self) -> _Recorder:
+        return self["provenance"]
+
+
+def test_merge_event_streams_joins_chunk_lists() -> None:
+    merged = merge_event_streams(
+        [_chunks(), ak.Array({"x": [6.0], "w": [1.0]})],
+        node=None,
+        output_name="events",
+        dataset_name="sample",
+    )
+
+    assert isinstance(merged, ChunkedArray)
+    assert [len(chunk) for chunk in merged] == [2, 3, 1]
+
+
+def test_root_tree_writer_appends_chunks(tmp_path: Path) -> None:
+    output_path = tmp_path / "chunked.root"
+
+    result = run_root_tree_write(
+        _chunks(), path=str(output_path), tree="Events", keep=["x"]
+    )
+
+    assert result.metadata["entries"] == 5
+    assert result.metadata["branches"] == ["x"]
+    with uproot.open(output_path) as fin:
+        assert fin["Events"].arrays()["x"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
@@ -23,6 +23,7 @@ from fasthep_carpenter.operations.di_object_mass import DI_OBJECT_MASS_SPEC
 from fasthep_carpenter.operations.hist import HIST_SPEC
 from fasthep_carpenter.operations.project_fields import PROJECT_FIELDS_SPEC
 from fasthep_carpenter.operations.selection_flag import SELECTION_FLAG_SPEC
+from fasthep_carpenter.operations.weights.correction import CORRECTION_SPEC
 from fasthep_carpenter.operations.weights.lookup_csv import LOOKUP_CSV_SPEC
 from fasthep_carpenter.operations.weights.pdf_envelope import PDF_ENVELOPE_SPEC
 
@@ -398,6 +399,24 @@ def test_weight_operations_declarative_dependencies() -> None:
             "outputs": {"nominal": "Weight", "up": "WeightUp"},
         },
     )
+    grid_lookup = _declarative_dependencies(
+        LOOKUP_CSV_SPEC,
+        {
+            "axes": [
+                {"variable": "Muon_pt", "column": "pt"},
+                {"variable": "Muon_eta", "column": "abseta", "abs": True},
+            ],
+            "outputs": {"nominal": "MuonSF"},
+        },
+    )
+    correction = _declarative_dependencies(
+        CORRECTION_SPEC,
+        {
+            "inputs": {"eta": "Muon_eta", "pt": "Muon_pt"},
+            "constants": {"syst": "nominal"},
+            "outputs": {"nominal": "MuonSF"},
+        },
+    )
     envelope = _declarative_dependencies(
         PDF_ENVELOPE_SPEC,
         {
@@ -408,5 +427,8 @@ def test_weight_operations_declarative_dependencies() -> None:
 
     assert lookup.consumes == {"Muon_Pt"}
     assert lookup.produces == {"Weight", "WeightUp"}
+    assert grid_lookup.consumes == {"Muon_pt", "Muon_eta"}
+    assert correction.consumes == {"Muon_eta", "Muon_pt"}
+    assert correction.produces == {"MuonSF"}
     assert envelope.consumes == {"LHEPdfWeight"}
     assert envelope.produces == {"PdfUp", "PdfDown"}
@@ -315,6 +315,63 @@ def test_attached_root_tree_writer_produces_output_artifact(tmp_path: Path) -> N
         assert (build_dir / link["record"]).is_file()
 
 
+def test_rollover_root_tree_writer_records_every_piece(tmp_path: Path) -> None:
+    run_workflow_file = _hepflow_api().run_workflow_file
+    input_path = tmp_path / "input.root"
+    with uproot.recreate(input_path) as root_file:
+        root_file["events"] = {"Muon_Pt": [1, 2, 3, 4, 5]}
+
+    workflow_path = tmp_path / "workflow.yaml"
+    workflow = {
+        "version": "1.0",
+        "use": {"profiles": ["registry", "fasthep_carpenter:registry"]},
+        "data": {
+            "datasets": [{"name": "sample", "files": [str(input_path)], "nevents": 5}],
+        },
+        "sources": {
+            "events": {
+                "kind": "root_tree",
+                "tree": "events",
+                "stream_type": "event_stream",
+            },
+        },
+        "analysis": {
+            "stages": [
+                {
+                    "id": "DerivedValue",
+                    "op": "hep.define",
+                    "params": {"variables": [{"name": "doubled", "expr": "Muon_Pt * 2"}]},
+                    "write": [
+                        {
+                            "kind": "root_tree",
+                            "path": "skim.root",
+                            "keep": ["Muon_Pt"],
+                            "rollover_entries": 2,
+                        }
+                    ],
+                }
+            ],
+        },
+    }
+    workflow_path.write_text(yaml.safe_dump(workflow, sort_keys=False), encoding="utf-8")
+    build_dir = tmp_path / "build"
+
+    result = run_workflow_file(workflow_path, outdir=build_dir)
+
+    assert result.success is True
+    manifest = json.loads(
+        (build_dir / "artifacts" / "files" / "skim" / "manifest.json").read_text(
+            encoding="utf-8"
+        )
+    )
+    files = manifest["datasets"]["sample"]["files"]
+    assert manifest["total_entries"] == 5
+    assert [item["entries"] for item in files] == [2, 2, 1]
+    assert len({item["path"] for item in files}) == 3
+    for item in files:
+        assert item["size_bytes"] == (build_dir / item["path"]).stat().st_size
+
+
 def test_histogram_loads_unlisted_axis_and_weight_fields(tmp_path: Path) -> None:
     api = _hepflow_api()
     compile_workflow_file = api.compile_workflow_file
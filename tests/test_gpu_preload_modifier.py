@@ -7,11 +7,13 @@ from pathlib import Path
 from re import escape
 from typing import Any
 
+import awkward as ak
 import numpy as np
 import pytest
 import yaml
 from hepflow.registry.loaders import load_object, load_runtime_entry
 
+from fasthep_carpenter.runtime.chunked import ChunkedArray
 from fasthep_carpenter.runtime.modifiers.gpu_preload import (
     MISSING_CUPY_MESSAGE,
     GPUPreloadModifier,
@@ -74,6 +76,42 @@ def test_gpu_preload_converts_selected_numpy_field(
     ]
 
 
+def test_gpu_preload_converts_each_chunk_of_a_multi_file_dataset(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(sys.modules, "cupy", FakeCupy())
+    converted: list[list[Any]] = []
+
+    def fake_to_backend(value: Any, backend: str) -> Any:
+        assert backend == "cuda"
+        converted.append(value.tolist())
+        return value
+
+    monkeypatch.setattr(ak, "to_backend", fake_to_backend)
+    stream = ChunkedArray(
+        [
+            ak.Array({"Muon_Pt": [[1.0], [2.0, 3.0]], "Jet_Pt": [10.0, 20.0]}),
+            ak.Array({"Muon_Pt": [[4.0]], "Jet_Pt": [30.0]}),
+        ]
+    )
+    inputs = {"stream": stream}
+    ctx: dict[str, Any] = {}
+
+    GPUPreloadModifier(fields=["Muon_Pt"]).before_node(
+        node=_node(),
+        inputs=inputs,
+        ctx=ctx,
+    )
+
+    result = inputs["stream"]
+    assert isinstance(result, ChunkedArray)
+    assert result.offsets.tolist() == [0, 2, 3]
+    assert converted == [[[1.0], [2.0, 3.0]], [[4.0]]]
+    assert ctx["execution_modifier_metadata"]["gpu.preload"] == [
+        {"node": "stage.HeavyInference", "fields": ["Muon_Pt"], "backend": "cupy"}
+    ]
+
+
 def test_gpu_preload_missing_field_errors_by_default(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 import awkward as ak
 import pytest
 
 from fasthep_carpenter.operations.merge_fields import run_merge_fields
+from fasthep_carpenter.runtime.chunked import ChunkedArray
 
 
 def test_merge_fields_combines_top_level_fields() -> None:
@@ -58,3 +61,35 @@ def test_merge_fields_rejects_length_mismatch() -> None:
 
     with pytest.raises(ValueError, match="length mismatch"):
         run_merge_fields(left=left, right=right)
+
+
+def test_merge_fields_merges_chunked_inputs_chunk_by_chunk() -> None:
+    left = ChunkedArray([ak.Array({"a": [1, 2]}), ak.Array({"a": [3]})])
+    right = ak.Array({"b": [10, 20, 30]})
+
+    out = run_merge_fields(left=left, right=right)
+
+    assert isinstance(out, ChunkedArray)
+    assert [ak.to_list(chunk) for chunk in out] == [
+        [{"a": 1, "b": 10}, {"a": 2, "b": 20}],
+        [{"a": 3, "b": 30}],
+    ]
+
+
+def test_merge_fields_streams_iterator_inputs() -> None:
+    left = iter([ak.Array({"a": [1, 2]}), ak.Array({"a": [3]})])
+    right = iter([ak.Array({"b": [10, 20]}), ak.Array({"b": [30]})])
+
+    out = run_merge_fields(left=left, right=right)
+
+    assert isinstance(out, Iterator)
+    assert [ak.to_list(chunk.b) for chunk in out] == [[10, 20], [30]]
+
+
+def test_merge_fields_rejects_misaligned_chunked_inputs() -> None:
+    left = ChunkedArray([ak.Array({"a": [1, 2]}), ak.Array({"a": [3]})])
+
+    with pytest.raises(ValueError, match="length mismatch"):
+        list(run_merge_fields(left=left, right=ak.Array({"b": [1, 2]})))
+    with pytest.raises(ValueError, match=r"inputs \['right'\] ran out of chunks"):
+        list(run_merge_fields(left=left, right=ChunkedArray([left.chunks[0]])))
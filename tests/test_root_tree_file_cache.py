@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import awkward as ak
+import fsspec
+import pytest
+import uproot
+
+from fasthep_carpenter.sources.file_cache import RemoteFileCache
+from fasthep_carpenter.sources.root_tree import run_root_tree_source
+
+
+def test_file_cache_serves_remote_inputs_from_local_copy(tmp_path: Path) -> None:
+    remote = _write_remote(tmp_path, "memory://remote/served.root", [1.0, 2.0])
+    cache_dir = tmp_path / "cache"
+
+    first = _read(remote, cache_dir)
+    fsspec.filesystem("memory").rm(remote)
+    second = _read(remote, cache_dir)
+
+    assert ak.to_list(first.Muon_pt) == [1.0, 2.0]
+    assert ak.to_list(second.Muon_pt) == [1.0, 2.0]
+    assert len(list(cache_dir.glob("*.root"))) == 1
+
+
+def test_file_cache_reads_file_uris_in_place(tmp_path: Path) -> None:
+    local = _write_input(tmp_path / "local" / "input.root", [1.0, 2.0])
+    cache_dir = tmp_path / "cache"
+
+    assert ak.to_list(_read(local.as_uri(), cache_dir).Muon_pt) == [1.0, 2.0]
+    assert not cache_dir.exists()
+
+
+def test_file_cache_refetches_truncated_copy(tmp_path: Path) -> None:
+    remote = _write_input(tmp_path / "remote" / "input.root", [1.0, 2.0])
+    cache = RemoteFileCache(tmp_path / "cache")
+
+    cached = cache.local_path(remote.as_uri())
+    original = cached.read_bytes()
+    cached.write_bytes(original[:-16])
+
+    assert cache.local_path(remote.as_uri()).read_bytes() == original
+
+
+def test_file_cache_refetches_rewritten_copy_without_hashing_hits(
+    tmp_path: Path, monkeypatch
+) -> None:
+    remote = _write_input(tmp_path / "remote" / "input.root", [1.0, 2.0])
+    cache = RemoteFileCache(tmp_path / "cache")
+    cached = cache.local_path(remote.as_uri())
+    original = cached.read_bytes()
+
+    real_open = Path.open
+
+    def guarded_open(self: Path, *args: Any, **kwargs: Any) -> Any:
+        if self == cached:
+            raise AssertionError("cache hits must not re-read the local copy")
+        return real_open(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", guarded_open)
+    assert cache.local_path(remote.as_uri()) == cached
+    monkeypatch.undo()
+
+    stat = cached.stat()
+    cached.write_bytes(original[:-16] + b"\0" * 16)
+    os.utime(cached, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.local_path(remote.as_uri()).read_bytes() == original
+
+
+def test_file_cache_refetches_when_remote_changes(tmp_path: Path) -> None:
+    remote = _write_remote(tmp_path, "memory://remote/changed.root", [1.0])
+    cache_dir = tmp_path / "cache"
+
+    assert ak.to_list(_read(remote, cache_dir).Muon_pt) == [1.0]
+    _write_remote(tmp_path, remote, [1.0, 2.0, 3.0])
+
+    assert ak.to_list(_read(remote, cache_dir).Muon_pt) == [1.0, 2.0, 3.0]
+
+
+def test_file_cache_evicts_least_recently_used_files(tmp_path: Path) -> None:
+    remotes = [
+        _write_input(tmp_path / "remote" / f"input_{index}.root", [float(index)])
+        for index in range(3)
+    ]
+    size = remotes[0].stat().st_size
+    cache = RemoteFileCache(tmp_path / "cache", max_bytes=2 * size + size // 2)
+
+    first = cache.local_path(remotes[0].as_uri())
+    cache.local_path(remotes[1].as_uri())
+    cache.local_path(remotes[0].as_uri())
+    third = cache.local_path(remotes[2].as_uri())
+
+    cached = set((tmp_path / "cache").glob("*.root"))
+    assert cached == {first, third}
+
+
+def test_file_cache_requires_path() -> None:
+    with pytest.raises(ValueError, match="file_cache requires a 'path'"):
+        run_root_tree_source(datasets=[], tree="Events", file_cache={})
+
+
+def _read(uri: str, cache_dir: Path) -> ak.Array:
+    return run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        file_cache={"path": str(cache_dir)},
+        ctx={"partition": {"file": uri}},
+    )
+
+
+def _write_remote(tmp_path: Path, uri: str, values: list[float]) -> str:
+    local = _write_input(tmp_path / "staging" / "input.root", values)
+    with fsspec.open(uri, "wb") as remote:
+        remote.write(local.read_bytes())
+    return uri
+
+
+def _write_input(path: Path, values: list[float]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array({"Muon_pt": values})
+    return path
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import awkward as ak
+import pytest
+import uproot
+
+from fasthep_carpenter.sources.metadata_cache import RootTreeMetadataCache
+from fasthep_carpenter.sources.root_tree import RootTreeSchema, run_root_tree_source
+
+
+def test_metadata_only_reuses_cached_schema(tmp_path: Path, monkeypatch) -> None:
+    path = _write_input(tmp_path / "input.root", [1.0, 2.0, 3.0])
+    cache = {"path": str(tmp_path / "cache")}
+
+    first = _inspect(path, cache)
+
+    def fail_open(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("cached metadata must not reopen the ROOT file")
+
+    monkeypatch.setattr("fasthep_carpenter.sources.root_tree.uproot.open", fail_open)
+    second = _inspect(path, cache, start=1)
+
+    assert isinstance(first, RootTreeSchema)
+    assert first.fields == ["Muon_pt"]
+    assert second.fields == first.fields
+    assert second.awkward_type == first.awkward_type
+    assert first.entry_count == 3
+    assert second.entry_count == 2
+
+
+def test_rewritten_file_invalidates_cached_metadata(tmp_path: Path) -> None:
+    path = _write_input(tmp_path / "input.root", [1.0, 2.0, 3.0])
+    cache = {"path": str(tmp_path / "cache")}
+
+    assert _inspect(path, cache).entry_count == 3
+    _write_input(path, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+
+    assert _inspect(path, cache).entry_count == 7
+
+
+def test_metadata_cache_expires_entries_after_ttl(tmp_path: Path, monkeypatch) -> None:
+    path = _write_input(tmp_path / "input.root", [1.0])
+    cache = RootTreeMetadataCache(tmp_path / "cache", ttl_seconds=60)
+    cache.put(str(path), "Events", {"fields": []})
+
+    assert cache.get(str(path), "Events") == {"fields": []}
+
+    now = time.time()
+    monkeypatch.setattr(
+        "fasthep_carpenter.sources.metadata_cache.time.time", lambda: now + 120
+    )
+
+    assert cache.get(str(path), "Events") is None
+
+
+def test_metadata_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    paths = [
+        _write_input(tmp_path / f"input_{index}.root", [1.0]) for index in range(3)
+    ]
+    cache = RootTreeMetadataCache(tmp_path / "cache", max_entries=2)
+
+    cache.put(str(paths[0]), "Events", {"index": 0})
+    cache.put(str(paths[1]), "Events", {"index": 1})
+    _age_entries(tmp_path / "cache")
+    assert cache.get(str(paths[0]), "Events") == {"index": 0}
+    cache.put(str(paths[2]), "Events", {"index": 2})
+
+    assert cache.get(str(paths[0]), "Events") == {"index": 0}
+    assert cache.get(str(paths[1]), "Events") is None
+    assert cache.get(str(paths[2]), "Events") == {"index": 2}
+
+
+def test_metadata_cache_lists_the_directory_once(tmp_path: Path, monkeypatch) -> None:
+    paths = [
+        _write_input(tmp_path / f"input_{index}.root", [1.0]) for index in range(5)
+    ]
+    cache = RootTreeMetadataCache(tmp_path / "cache", max_entries=3)
+    listings = []
+    real_glob = Path.glob
+
+    def counting_glob(self: Path, pattern: str) -> Any:
+        listings.append(pattern)
+        return real_glob(self, pattern)
+
+    monkeypatch.setattr(Path, "glob", counting_glob)
+    for index, path in enumerate(paths):
+        cache.put(str(path), "Events", {"index": index})
+
+    assert len(listings) == 1
+    assert len(list((tmp_path / "cache").iterdir())) == 3
+    assert cache.get(str(paths[1]), "Events") is None
+    assert cache.get(str(paths[4]), "Events") == {"index": 4}
+
+
+def test_metadata_cache_requires_path() -> None:
+    with pytest.raises(ValueError, match="metadata_cache requires a 'path'"):
+        run_root_tree_source(datasets=[], tree="Events", metadata_cache={})
+
+
+def _inspect(path: Path, cache: dict[str, Any], *, start: int | None = None) -> Any:
+    return run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        start=start,
+        metadata_only=True,
+        metadata_cache=cache,
+        ctx={"partition": {"file": str(path)}},
+    )
+
+
+def _age_entries(directory: Path) -> None:
+    for entry in directory.glob("*.json"):
+        os.utime(entry, (1.0, 1.0))
+
+
+def _write_input(path: Path, values: list[float]) -> Path:
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array({"Muon_pt": values})
+    return path
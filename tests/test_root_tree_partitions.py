@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import awkward as ak
+import numpy as np
+import pytest
+import uproot
+
+from fasthep_carpenter.sources.partitions import plan_root_tree_partitions
+
+
+def test_partitions_are_balanced_and_basket_aligned(tmp_path: Path) -> None:
+    path = _write_baskets(tmp_path / "input.root", basket_sizes=[4, 4, 4, 4, 4])
+
+    partitions = plan_root_tree_partitions(
+        [{"name": "sample", "files": [str(path)]}],
+        "Events",
+        target_entries=9,
+    )
+
+    assert [(p.start, p.stop) for p in partitions] == [(0, 8), (8, 20)]
+    assert [p.part for p in partitions] == ["0_0", "0_1"]
+    assert partitions[0].id == "events__sample__0_0"
+    assert {p.dataset for p in partitions} == {"sample"}
+
+
+def test_partitions_split_large_files_more_than_small_ones(tmp_path: Path) -> None:
+    large = _write_baskets(tmp_path / "large.root", basket_sizes=[10] * 10)
+    small = _write_baskets(tmp_path / "small.root", basket_sizes=[10])
+
+    partitions = plan_root_tree_partitions(
+        [{"name": "sample", "files": [str(large), str(small)]}],
+        "Events",
+        target_entries=25,
+        source="reco",
+    )
+
+    assert [(p.file, p.start, p.stop) for p in partitions] == [
+        (str(large), 0, 20),
+        (str(large), 20, 50),
+        (str(large), 50, 70),
+        (str(large), 70, 100),
+        (str(small), 0, 10),
+    ]
+    assert partitions[-1].id == "reco__sample__1_0"
+
+
+def test_target_bytes_uses_compressed_size(tmp_path: Path) -> None:
+    path = _write_baskets(tmp_path / "input.root", basket_sizes=[100] * 4)
+
+    partitions = plan_root_tree_partitions(
+        [{"name": "sample", "files": [str(path)]}],
+        "Events",
+        target_bytes=1,
+    )
+
+    assert [(p.start, p.stop) for p in partitions] == [
+        (0, 100),
+        (100, 200),
+        (200, 300),
+        (300, 400),
+    ]
+
+
+def test_partition_planner_reads_rntuple_clusters(tmp_path: Path) -> None:
+    path = tmp_path / "rntuple.root"
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array({"Muon_pt": np.arange(10.0)})
+
+    partitions = plan_root_tree_partitions(
+        [{"name": "sample", "files": [str(path)]}],
+        "Events",
+        target_entries=3,
+    )
+
+    assert [(p.start, p.stop) for p in partitions] == [(0, 10)]
+
+
+def test_partition_planner_requires_a_target() -> None:
+    with pytest.raises(ValueError, match="requires target_entries or target_bytes"):
+        plan_root_tree_partitions([], "Events")
+
+
+def _write_baskets(path: Path, *, basket_sizes: list[int]) -> Path:
+    with uproot.recreate(path) as root_file:
+        root_file.mktree("Events", {"Muon_pt": "f8"})
+        for size in basket_sizes:
+            root_file["Events"].extend({"Muon_pt": np.arange(size, dtype="f8")})
+    return path
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import gc
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import awkward as ak
+import pytest
+import uproot
+
+from fasthep_carpenter.sources.prefetch import PrefetchIterator
+from fasthep_carpenter.sources.root_tree import run_root_tree_source
+
+
+def test_prefetch_reads_ahead_within_the_memory_budget() -> None:
+    produced: list[int] = []
+
+    def chunks() -> Iterator[ak.Array]:
+        for index in range(4):
+            produced.append(index)
+            yield ak.Array([float(index)] * 8)
+
+    stream = PrefetchIterator(chunks(), max_bytes=1)
+    first = next(stream)
+    deadline = time.monotonic() + 5
+    while len(produced) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    assert ak.to_list(first) == [0.0] * 8
+    assert produced == [0, 1]
+    assert [ak.to_list(chunk)[0] for chunk in stream] == [1.0, 2.0, 3.0]
+
+
+def test_prefetch_propagates_read_errors_after_buffered_chunks() -> None:
+    def chunks() -> Iterator[ak.Array]:
+        yield ak.Array([1.0])
+        raise OSError("remote read failed")
+
+    stream = PrefetchIterator(chunks(), max_bytes=1024)
+
+    assert ak.to_list(next(stream)) == [1.0]
+    with pytest.raises(OSError, match="remote read failed"):
+        next(stream)
+    with pytest.raises(StopIteration):
+        next(stream)
+
+
+def test_prefetch_close_releases_the_source() -> None:
+    closed = threading.Event()
+
+    def chunks() -> Iterator[ak.Array]:
+        try:
+            while True:
+                yield ak.Array([1.0])
+        finally:
+            closed.set()
+
+    stream = PrefetchIterator(chunks(), max_bytes=1)
+    next(stream)
+    stream.close()
+
+    assert closed.is_set()
+
+
+def test_prefetch_releases_the_source_when_dropped_unclosed() -> None:
+    closed = threading.Event()
+
+    def chunks() -> Iterator[ak.Array]:
+        try:
+            while True:
+                yield ak.Array([1.0])
+        finally:
+            closed.set()
+
+    stream = PrefetchIterator(chunks(), max_bytes=1)
+    next(stream)
+    del stream
+    gc.collect()
+
+    assert closed.wait(timeout=5)
+
+
+def test_root_tree_source_prefetches_across_files(tmp_path: Path) -> None:
+    files = []
+    for index, values in enumerate(([1.0, 2.0, 3.0], [4.0])):
+        path = tmp_path / f"input_{index}.root"
+        with uproot.recreate(path) as root_file:
+            root_file["Events"] = ak.Array({"Muon_pt": values})
+        files.append(str(path))
+
+    result = run_root_tree_source(
+        datasets=[{"name": "sample", "files": files}],
+        tree="Events",
+        step_size=2,
+        prefetch_bytes="1 MB",
+    )
+
+    chunks = result["sample"]
+    assert isinstance(chunks, PrefetchIterator)
+    assert [ak.to_list(chunk.Muon_pt) for chunk in chunks] == [
+        [1.0, 2.0],
+        [3.0],
+        [4.0],
+    ]
+
+
+@pytest.mark.parametrize(
+    ("options", "message"),
+    [
+        ({}, "requires step_size or step_bytes"),
+        ({"step_size": 2, "lazy": True}, "cannot be combined with lazy"),
+        ({"step_size": 2, "prefetch_bytes": "plenty"}, "positive memory size"),
+    ],
+)
+def test_prefetch_bytes_validation(options: dict, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        run_root_tree_source(
+            datasets=[],
+            tree="Events",
+            **{"prefetch_bytes": "1 MB", **options},
+        )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from fasthep_carpenter.sources.projection import required_root_tree_branches
+
+
+def test_required_branches_union_consumed_minus_produced_symbols() -> None:
+    steps = [
+        {
+            "id": "BasicVars",
+            "op": "hep.define",
+            "params": {
+                "variables": [
+                    {"name": "Muon_Pt", "expr": "sqrt(Muon_Px ** 2 + Muon_Py ** 2)"},
+                ]
+            },
+        },
+        {
+            "id": "TightMuon",
+            "op": "hep.select_objects",
+            "params": {
+                "collection": "Muon",
+                "output": "TightMuon",
+                "selection": ["pt >= 20", "abs(eta) <= 2.4"],
+                "keep": ["pt", "eta"],
+            },
+        },
+        {
+            "id": "Events",
+            "op": "hep.selection.cutflow",
+            "params": {
+                "selection": {"All": ["nTightMuon >= 1", "HLT_IsoMu24 == 1"]},
+            },
+        },
+        {
+            "id": "MuonPt",
+            "op": "hep.hist",
+            "params": {
+                "axes": [{"name": "pt", "source": "Muon_Pt"}],
+                "weight_expr": "genWeight",
+            },
+        },
+    ]
+
+    assert required_root_tree_branches(steps) == [
+        "HLT_IsoMu24",
+        "Muon_Px",
+        "Muon_Py",
+        "Muon_eta",
+        "Muon_pt",
+        "genWeight",
+    ]
+
+
+def test_required_branches_expand_collections_against_available_branches() -> None:
+    steps = [
+        {
+            "op": "hep.define",
+            "params": {
+                "variables": [{"name": "jet_pt2", "expr": "Jet.pt * 2 + MET_pt"}],
+            },
+        }
+    ]
+
+    assert required_root_tree_branches(
+        steps,
+        available=["Jet_pt", "Jet_eta", "JetX", "MET_pt", "Muon_pt"],
+    ) == ["Jet_eta", "Jet_pt", "MET_pt"]
+
+
+def test_required_branches_reject_unknown_operations() -> None:
+    with pytest.raises(ValueError, match=r"unknown operation 'hep\.nope'"):
+        required_root_tree_branches([{"id": "Bad", "op": "hep.nope"}])
@@ -0,0 +1,548 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any
+
+import awkward as ak
+import numpy as np
+import pytest
+import uproot
+from uproot.source.coalesce import CoalesceConfig
+
+from fasthep_carpenter.operations.cutflow import run_cutflow_transform
+from fasthep_carpenter.operations.define import run_define_transform
+from fasthep_carpenter.operations.hist import run_hist_transform
+from fasthep_carpenter.runtime.chunked import ChunkedArray
+from fasthep_carpenter.sources.root_tree import run_root_tree_source
+
+
+def test_step_size_yields_bounded_chunks_across_files(tmp_path: Path) -> None:
+    first = _write_input(tmp_path / "first.root", [1.0, 2.0, 3.0, 4.0, 5.0])
+    second = _write_input(tmp_path / "second.root", [6.0, 7.0])
+
+    result = run_root_tree_source(
+        datasets=[{"name": "sample", "files": [str(first), str(second)]}],
+        tree="Events",
+        branches=["Muon_pt"],
+        step_size=2,
+    )
+
+    chunks = result["sample"]
+    assert isinstance(chunks, Iterator)
+    chunks = list(chunks)
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1, 2]
+    assert ak.to_list(ak.concatenate(chunks).Muon_pt) == [
+        1.0,
+        2.0,
+        3.0,
+        4.0,
+        5.0,
+        6.0,
+        7.0,
+    ]
+
+
+@pytest.mark.parametrize("step_size", [None, 2])
+def test_streamed_chunks_flow_through_define_hist_and_cutflow(
+    tmp_path: Path, step_size: int | None
+) -> None:
+    first = _write_input(tmp_path / "first.root", [1.0, 2.0, 3.0, 4.0, 5.0])
+    second = _write_input(tmp_path / "second.root", [6.0, 7.0])
+
+    def read() -> Any:
+        return run_root_tree_source(
+            datasets=[{"name": "sample", "files": [str(first), str(second)]}],
+            tree="Events",
+            branches=["Muon_pt"],
+            step_size=step_size,
+        )["sample"]
+
+    defined = run_define_transform(
+        stream=read(), variables=[{"name": "y", "expr": "Muon_pt * 2"}]
+    )
+    assert isinstance(defined, Iterator if step_size else ChunkedArray)
+    histogram = run_hist_transform(
+        stream=defined,
+        axes=[
+            {
+                "name": "y",
+                "type": "regular",
+                "source": "y",
+                "bins": {"nbins": 4, "low": 0.0, "high": 16.0},
+            }
+        ],
+    )
+    selected = run_cutflow_transform(
+        stream=read(), selection={"high": ["Muon_pt > 1.5"]}
+    )
+
+    assert histogram.values().tolist() == [1.0, 2.0, 2.0, 2.0]
+    filtered = ak.concatenate(list(selected["stream"]))
+    assert ak.to_list(filtered.Muon_pt) == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+    (row,) = selected["cutflow"]["cuts"]
+    assert (row["n_unweighted_in"], row["n_unweighted_out"]) == (7, 6)
+
+
+def test_step_size_respects_partition_entry_range(tmp_path: Path) -> None:
+    path = _write_input(tmp_path / "input.root", [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    chunks = list(
+        run_root_tree_source(
+            datasets=[],
+            tree="Events",
+            step_size=2,
+            ctx={"partition": {"file": str(path), "start": 1, "stop": 4}},
+        )
+    )
+
+    assert [ak.to_list(chunk.Muon_pt) for chunk in chunks] == [[2.0, 3.0], [4.0]]
+
+
+def test_rntuple_chunks_align_to_cluster_boundaries(tmp_path: Path) -> None:
+    path = tmp_path / "clusters.root"
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array({"Muon_pt": [1.0, 2.0, 3.0]})
+        for values in ([4.0, 5.0, 6.0], [7.0, 8.0, 9.0]):
+            root_file["Events"].extend(ak.Array({"Muon_pt": values}))
+
+    chunks = list(
+        run_root_tree_source(
+            datasets=[],
+            tree="Events",
+            step_size=5,
+            ctx={"partition": {"file": str(path), "start": 1}},
+        )
+    )
+
+    assert [ak.to_list(chunk.Muon_pt) for chunk in chunks] == [
+        [2.0, 3.0, 4.0, 5.0, 6.0],
+        [7.0, 8.0, 9.0],
+    ]
+
+
+def test_rntuple_metadata_only_describes_record_fields(tmp_path: Path) -> None:
+    path = tmp_path / "records.root"
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array(
+            {"x": [1.0, 2.0], "Muon": [{"pt": 1.0}, {"pt": 2.0}]}
+        )
+
+    schema = run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        branches=["x", "Muon"],
+        metadata_only=True,
+        ctx={"partition": {"file": str(path), "stop": 1}},
+    )
+
+    assert schema.fields == ["x", "Muon"]
+    assert schema.awkward_type == {"x": "double", "Muon": "{pt: float64}"}
+    assert schema.entry_count == 1
+
+
+def test_step_bytes_yields_chunks(tmp_path: Path) -> None:
+    path = _write_input(tmp_path / "input.root", [1.0, 2.0, 3.0])
+
+    result = run_root_tree_source(
+        datasets=[{"name": "sample", "files": [str(path)]}],
+        tree="Events",
+        step_bytes="1 MB",
+    )
+
+    chunks = list(result["sample"])
+    assert len(chunks) == 1
+    assert ak.to_list(chunks[0].Muon_pt) == [1.0, 2.0, 3.0]
+
+
+def test_step_size_and_step_bytes_are_exclusive() -> None:
+    with pytest.raises(ValueError, match="only one of step_size or step_bytes"):
+        run_root_tree_source(
+            datasets=[],
+            tree="Events",
+            step_size=10,
+            step_bytes="10 MB",
+        )
+
+
+def test_read_workers_preserves_file_order(tmp_path: Path) -> None:
+    files = [
+        str(
+            _write_input(tmp_path / f"input_{index}.root", [float(index)] * (index + 1))
+        )
+        for index in range(4)
+    ]
+
+    result = run_root_tree_source(
+        datasets=[{"name": "sample", "files": files}],
+        tree="Events",
+        branches=["Muon_pt"],
+        read_workers=3,
+    )
+
+    events = result["sample"]
+    assert isinstance(events, ChunkedArray)
+    assert [len(chunk) for chunk in events] == [1, 2, 3, 4]
+    assert ak.to_list(events.concatenate().Muon_pt) == [
+        0.0,
+        1.0,
+        1.0,
+        2.0,
+        2.0,
+        2.0,
+        3.0,
+        3.0,
+        3.0,
+        3.0,
+    ]
+
+
+def test_read_workers_passes_decompression_executor(monkeypatch) -> None:
+    calls: list[dict[str, Any]] = []
+
+    class FakeTree:
+        def arrays(self, *args: Any, **kwargs: Any) -> ak.Array:
+            calls.append(dict(kwargs))
+            return ak.Array({"Muon_pt": [1.0]})
+
+    class FakeFile:
+        def __enter__(self) -> dict[str, FakeTree]:
+            return {"Events": FakeTree()}
+
+        def __exit__(self, *exc_info: object) -> None:
+            return None
+
+    monkeypatch.setattr(
+        "fasthep_carpenter.sources.root_tree.uproot.open",
+        lambda path: FakeFile(),
+    )
+
+    run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        branches=["Muon_pt"],
+        read_workers=2,
+        ctx={"partition": {"file": "root://example.test//store/data.root"}},
+    )
+
+    assert len(calls) == 1
+    assert isinstance(calls[0]["decompression_executor"], Executor)
+
+
+def test_opaque_branches_share_one_batched_read(monkeypatch) -> None:
+    calls: list[tuple[list[str], dict[str, Any]]] = []
+
+    class FakeTree:
+        def arrays(self, expressions: list[str], **kwargs: Any) -> ak.Array:
+            calls.append((list(expressions), dict(kwargs)))
+            return ak.Array({"Muon_pt": [1.0, 2.0], "_opaque_1": [[3], []]})
+
+    class FakeFile:
+        def __enter__(self) -> dict[str, FakeTree]:
+            return {"Events": FakeTree()}
+
+        def __exit__(self, *exc_info: object) -> None:
+            return None
+
+    monkeypatch.setattr(
+        "fasthep_carpenter.sources.root_tree.uproot.open",
+        lambda path: FakeFile(),
+    )
+
+    events = run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        branches=["Muon_pt", "Obj./Obj.hits"],
+        ctx={"partition": {"file": "root://example.test//store/data.root"}},
+    )
+
+    assert len(calls) == 1
+    assert calls[0][0] == ["Muon_pt", "_opaque_1"]
+    assert calls[0][1]["aliases"] == {"_opaque_1": "get('Obj./Obj.hits')"}
+    assert events.fields == ["Muon_pt", "Obj./Obj.hits"]
+    assert ak.to_list(events["Obj./Obj.hits"]) == [[3], []]
+
+
+def test_read_workers_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="read_workers must be a positive integer"):
+        run_root_tree_source(datasets=[], tree="Events", read_workers=0)
+
+
+def test_remote_read_configures_coalesced_reads_for_remote_uris(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    local = _write_input(tmp_path / "input.root", [1.0])
+    opened: list[tuple[Any, dict[str, Any]]] = []
+    real_open = uproot.open
+
+    def recording_open(path: Any, **kwargs: Any) -> Any:
+        opened.append((path, kwargs))
+        return real_open(local)
+
+    monkeypatch.setattr(
+        "fasthep_carpenter.sources.root_tree.uproot.open", recording_open
+    )
+
+    run_root_tree_source(
+        datasets=[
+            {
+                "name": "sample",
+                "files": ["root://example.test//store/data.root", str(local)],
+            }
+        ],
+        tree="Events",
+        remote_read={
+            "max_range_gap": 1024,
+            "max_request_bytes": 4096,
+            "max_request_ranges": 16,
+            "max_inflight": 4,
+        },
+    )
+
+    remote_path, remote_kwargs = opened[0]
+    assert remote_path == "root://example.test//store/data.root"
+    config = remote_kwargs["coalesce_config"]
+    assert isinstance(config, CoalesceConfig)
+    assert (config.max_range_gap, config.max_request_bytes) == (1024, 4096)
+    assert config.max_request_ranges == 16
+    assert remote_kwargs["max_num_elements"] == 16
+    assert remote_kwargs["num_workers"] == 4
+    assert opened[1] == (local, {})
+
+
+def test_remote_read_rejects_unknown_keys() -> None:
+    with pytest.raises(ValueError, match="remote_read has unknown keys"):
+        run_root_tree_source(
+            datasets=[],
+            tree="Events",
+            remote_read={"gap": 10},
+        )
+
+
+def test_lazy_mode_only_materialises_accessed_branches(tmp_path: Path) -> None:
+    path = tmp_path / "input.root"
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array(
+            {"Muon_pt": [1.0, 2.0, 3.0], "Jet_pt": [[1.0], [], [2.0, 3.0]]}
+        )
+
+    result = run_root_tree_source(
+        datasets=[{"name": "sample", "files": [str(path)]}],
+        tree="Events",
+        lazy=True,
+    )
+
+    events = result["sample"]
+    assert not events.layout.is_any_materialized
+    assert ak.to_list(events.Muon_pt * 2) == [2.0, 4.0, 6.0]
+    assert events.layout.content("Muon_pt").is_all_materialized
+    assert not events.layout.content("Jet_pt").is_any_materialized
+
+
+def test_lazy_mode_respects_requested_branches_and_chunks(tmp_path: Path) -> None:
+    path = _write_input(tmp_path / "input.root", [1.0, 2.0, 3.0])
+
+    chunks = list(
+        run_root_tree_source(
+            datasets=[],
+            tree="Events",
+            branches=["Muon_pt"],
+            lazy=True,
+            step_size=2,
+            ctx={"partition": {"file": str(path)}},
+        )
+    )
+
+    assert [chunk.fields for chunk in chunks] == [["Muon_pt"], ["Muon_pt"]]
+    assert [ak.to_list(chunk.Muon_pt) for chunk in chunks] == [[1.0, 2.0], [3.0]]
+
+
+def test_preselection_reads_other_branches_only_for_surviving_baskets(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "input.root"
+    with uproot.recreate(path) as root_file:
+        root_file.mktree("Events", {"nMuon": "int32", "Muon_pt": "float64"})
+        for first in (0, 3, 6):
+            root_file["Events"].extend(
+                {
+                    "nMuon": [0, 0, 0] if first == 3 else [1, 0, 0],
+                    "Muon_pt": [float(first + i) for i in range(3)],
+                }
+            )
+
+    reads: list[tuple[tuple[str, ...], int, int]] = []
+    real_arrays = uproot.behaviors.TBranch.HasBranches.arrays
+
+    def recording_arrays(self: Any, expressions: Any = None, **kwargs: Any) -> Any:
+        reads.append((tuple(expressions), kwargs["entry_start"], kwargs["entry_stop"]))
+        return real_arrays(self, expressions, **kwargs)
+
+    monkeypatch.setattr(
+        uproot.behaviors.TBranch.HasBranches, "arrays", recording_arrays
+    )
+
+    result = run_root_tree_source(
+        datasets=[{"name": "sample", "files": [str(path)]}],
+        tree="Events",
+        branches=["Muon_pt", "nMuon"],
+        preselection="nMuon > 0",
+    )
+
+    events = result["sample"]
+    assert events.fields == ["Muon_pt", "nMuon"]
+    assert ak.to_list(events.Muon_pt) == [0.0, 6.0]
+    assert ak.to_list(events.nMuon) == [1, 1]
+    assert reads == [
+        (("nMuon",), 0, 9),
+        (("Muon_pt",), 0, 3),
+        (("Muon_pt",), 6, 9),
+    ]
+
+
+def test_preselection_without_survivors_keeps_branch_types(tmp_path: Path) -> None:
+    path = _write_input(tmp_path / "input.root", [1.0, 2.0, 3.0])
+
+    events = run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        preselection="Muon_pt > 10",
+        ctx={"partition": {"file": str(path)}},
+    )
+
+    assert len(events) == 0
+    assert events.fields == ["Muon_pt"]
+
+
+def test_preselection_without_branches_reads_only_requested_ones(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "input.root"
+    with uproot.recreate(path) as root_file:
+        root_file.mktree("Events", {"nMuon": "int32", "Muon_pt": "float64"})
+        root_file["Events"].extend({"nMuon": [1, 0, 2], "Muon_pt": [1.0, 2.0, 3.0]})
+
+    reads: list[tuple[str, ...]] = []
+    real_arrays = uproot.behaviors.TBranch.HasBranches.arrays
+
+    def recording_arrays(self: Any, expressions: Any = None, **kwargs: Any) -> Any:
+        reads.append(tuple(expressions or ()))
+        return real_arrays(self, expressions, **kwargs)
+
+    monkeypatch.setattr(
+        uproot.behaviors.TBranch.HasBranches, "arrays", recording_arrays
+    )
+
+    events = run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        branches=["Muon_pt"],
+        preselection="1 > 0",
+        ctx={"partition": {"file": str(path)}},
+    )
+
+    assert events.fields == ["Muon_pt"]
+    assert ak.to_list(events.Muon_pt) == [1.0, 2.0, 3.0]
+    assert reads == [("Muon_pt",)]
+
+
+def test_lazy_preselection_keeps_unaccessed_branches_virtual(tmp_path: Path) -> None:
+    path = tmp_path / "input.root"
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array(
+            {
+                "nMuon": [1, 0, 2],
+                "Muon_pt": [1.0, 2.0, 3.0],
+                "Jet_pt": [[1.0], [], [2.0, 3.0]],
+            }
+        )
+
+    events = run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        branches=["Muon_pt", "Jet_pt"],
+        preselection="nMuon > 0",
+        lazy=True,
+        ctx={"partition": {"file": str(path)}},
+    )
+
+    assert events.fields == ["Muon_pt", "Jet_pt"]
+    assert ak.to_list(events.Muon_pt) == [1.0, 3.0]
+    layout = events.layout
+    assert isinstance(layout, ak.contents.IndexedArray)
+    assert layout.content.content("Muon_pt").is_all_materialized
+    assert not layout.content.content("Jet_pt").is_any_materialized
+
+
+def test_preselection_applies_dtypes_policy(tmp_path: Path) -> None:
+    path = tmp_path / "input.root"
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array({"nMuon": [1, 0, 2], "MET_pt": [1.0, 2.0, 3.0]})
+
+    events = run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        branches=["MET_pt"],
+        preselection="nMuon > 0",
+        dtypes={"float": "float32"},
+        ctx={"partition": {"file": str(path)}},
+    )
+
+    assert ak.to_list(events.MET_pt) == [1.0, 3.0]
+    assert events.MET_pt.type.content.primitive == "float32"
+
+
+def test_preselection_rejects_unknown_branches(tmp_path: Path) -> None:
+    path = _write_input(tmp_path / "input.root", [1.0])
+
+    with pytest.raises(KeyError, match="unknown branches"):
+        run_root_tree_source(
+            datasets=[],
+            tree="Events",
+            preselection="Electron_pt > 10",
+            ctx={"partition": {"file": str(path)}},
+        )
+
+
+def test_dtypes_policy_narrows_columns_with_branch_overrides(tmp_path: Path) -> None:
+    path = tmp_path / "input.root"
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array(
+            {
+                "Muon_pt": [[1.5, 2.5], [], [3.5]],
+                "MET_pt": [10.0, 20.0, 30.0],
+                "nMuon": np.array([2, 0, 1], dtype=np.int64),
+                "HLT_flag": [True, False, True],
+            }
+        )
+
+    events = run_root_tree_source(
+        datasets=[],
+        tree="Events",
+        dtypes={
+            "float": "float32",
+            "int": "int32",
+            "branches": {"MET_pt": "float64"},
+        },
+        ctx={"partition": {"file": str(path)}},
+    )
+
+    assert str(events.type.content) == (
+        "{Muon_pt: var * float32, MET_pt: float64, nMuon: int32, HLT_flag: bool}"
+    )
+    assert ak.to_list(events.Muon_pt) == [[1.5, 2.5], [], [3.5]]
+
+
+def test_dtypes_policy_rejects_unknown_keys() -> None:
+    with pytest.raises(ValueError, match="dtypes has unknown keys"):
+        run_root_tree_source(datasets=[], tree="Events", dtypes={"double": "f4"})
+
+
+def _write_input(path: Path, values: list[float]) -> Path:
+    with uproot.recreate(path) as root_file:
+        root_file["Events"] = ak.Array({"Muon_pt": values})
+    return path
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 import awkward as ak
 import numpy as np
 import pytest
 import uproot
+from hepflow.model.io import ArtifactManifest, OutputResult
 
-from fasthep_carpenter.sinks.root_tree import run_root_tree_write
+from fasthep_carpenter.sinks.compression import parallel_compression
+from fasthep_carpenter.sinks.root_tree import RootTreeWriter, run_root_tree_write
 
 
 def test_default_root_tree_writer_outputs_rntuple(tmp_path: Path) -> None:
@@ -39,6 +43,7 @@ def test_explicit_root_tree_format_round_trips_scalar_and_jagged_branches(
         format=output_format,
     )
 
+    assert isinstance(result, OutputResult)
     assert result.path == str(output_path)
     assert result.metadata["format"] == output_format
     assert result.metadata["root_classname"] == classname
@@ -72,6 +77,220 @@ def test_root_tree_writer_rejects_invalid_format(tmp_path: Path) -> None:
         run_root_tree_write(_payload(), path=str(tmp_path / "bad.root"), format="root")
 
 
+def test_root_tree_writer_streams_chunks_into_uniform_clusters(tmp_path: Path) -> None:
+    output_path = tmp_path / "streamed.root"
+    chunks = (ak.Array({"x": [float(i)] * size}) for i, size in enumerate((3, 4, 5)))
+
+    result = run_root_tree_write(
+        chunks, path=str(output_path), tree="Events", flush_entries=5
+    )
+
+    assert result.metadata["entries"] == 12
+    with uproot.open(output_path) as root_file:
+        ntuple = root_file["Events"]
+        assert [c.num_entries for c in ntuple.cluster_summaries] == [5, 5, 2]
+        assert ntuple.arrays()["x"].tolist() == [0.0] * 3 + [1.0] * 4 + [2.0] * 5
+
+
+def test_root_tree_writer_handle_appends_ttree_baskets(tmp_path: Path) -> None:
+    output_path = tmp_path / "baskets.root"
+
+    with RootTreeWriter(
+        output_path, tree="Events", format="ttree", flush_entries=2
+    ) as writer:
+        writer.write(_payload())
+        writer.write(_payload())
+
+    assert writer.entries == 6
+    with uproot.open(output_path) as root_file:
+        tree = root_file["Events"]
+        assert tree["int32_branch"].entry_offsets == [0, 2, 4, 6]
+        assert tree["int32_branch"].array(library="np").tolist() == [1, 2, 3] * 2
+
+
+def test_root_tree_writer_counts_bytes_as_it_writes(tmp_path: Path) -> None:
+    output_path = tmp_path / "counted.root"
+    sizes = []
+
+    with RootTreeWriter(output_path, format="ttree", compression="none") as writer:
+        for _ in range(3):
+            writer.write(ak.Array({"x": np.arange(1000, dtype=np.float64)}))
+            sizes.append(writer.bytes_written)
+
+    assert sizes[0] > 8000
+    assert sizes[1] - sizes[0] >= 8000
+    assert sizes[2] - sizes[1] >= 8000
+    assert writer.size_bytes == output_path.stat().st_size
+
+
+def test_root_tree_writer_rejects_empty_streams(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="empty stream"):
+        run_root_tree_write(iter([]), path=str(tmp_path / "empty.root"))
+
+
+def test_root_tree_writer_flush_options_are_exclusive(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="only one of flush_entries or flush_bytes"):
+        run_root_tree_write(
+            _payload(),
+            path=str(tmp_path / "bad.root"),
+            flush_entries=10,
+            flush_bytes="1 MB",
+        )
+
+
+@pytest.mark.parametrize("output_format", ["rntuple", "ttree"])
+@pytest.mark.parametrize("compression", ["zlib", "zstd"])
+def test_root_tree_writer_parallel_compression_matches_serial_output(
+    tmp_path: Path,
+    output_format: str,
+    compression: str,
+) -> None:
+    payload = ak.Array(
+        {
+            "x": np.arange(100_000, dtype=np.float64),
+            "flag": np.arange(100_000) % 3 == 0,
+            "jagged": [[float(i)] * (i % 4) for i in range(100_000)],
+        }
+    )
+    serial = tmp_path / "serial1.root"
+    parallel = tmp_path / "threads.root"
+
+    run_root_tree_write(
+        payload, path=str(serial), format=output_format, compression=compression
+    )
+    run_root_tree_write(
+        payload,
+        path=str(parallel),
+        format=output_format,
+        compression=compression,
+        compression_workers=4,
+    )
+
+    with uproot.open(serial) as fserial, uproot.open(parallel) as fparallel:
+        assert ak.to_list(fparallel["events"].arrays()) == ak.to_list(
+            fserial["events"].arrays()
+        )
+
+
+@pytest.mark.parametrize("compression", [uproot.ZLIB(4), uproot.ZSTD(4)])
+def test_parallel_compression_splits_large_blocks_deterministically(
+    compression: Any,
+) -> None:
+    data = np.arange(2**17, dtype=np.float64).tobytes()
+    small = data[:1000]
+    with ThreadPoolExecutor(1) as one, _RecordingExecutor(4) as four:
+        serial = parallel_compression(compression, one)
+        threaded = parallel_compression(compression, four)
+        compressed = threaded.compress(data)
+
+        assert four.submitted == [0, 2**18, 2**19, 3 * 2**18]
+        assert compressed == serial.compress(data)
+        assert threaded.compress(small) == compression.compress(small)
+    assert bytes(compression.decompress(compressed, len(data))) == data
+    assert threaded.code_pair == compression.code_pair
+
+
+def test_parallel_compression_rejects_unsplittable_algorithms(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="supports zlib and zstd, got lz4"):
+        RootTreeWriter(tmp_path / "lz4.root", compression="lz4", compression_workers=2)
+
+
+def test_root_tree_writer_rejects_invalid_compression_workers(tmp_path: Path) -> None:
+    with pytest.raises(
+        ValueError, match="compression_workers must be a positive integer"
+    ):
+        run_root_tree_write(
+            _payload(), path=str(tmp_path / "bad.root"), compression_workers=0
+        )
+
+
+@pytest.mark.parametrize(
+    ("output_format", "classname"),
+    [
+        ("rntuple", "ROOT::RNTuple"),
+        ("ttree", "TTree"),
+    ],
+)
+def test_root_tree_writer_describes_output_without_reopening(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    output_format: str,
+    classname: str,
+) -> None:
+    output_path = tmp_path / "unverified.root"
+
+    def fail_open(*args: object, **kwargs: object) -> None:
+        raise AssertionError("output must not be reopened")
+
+    monkeypatch.setattr(uproot, "open", fail_open)
+    result = run_root_tree_write(
+        _payload(), path=str(output_path), format=output_format, verify=False
+    )
+    monkeypatch.undo()
+
+    manifest = result.metadata["writer_manifest"]
+    assert result.metadata["root_classname"] == classname
+    assert manifest["size_bytes"] == output_path.stat().st_size
+    assert _classname(output_path) == classname
+
+
+def test_root_tree_writer_rolls_over_into_uniform_files(tmp_path: Path) -> None:
+    chunks = (ak.Array({"x": [float(i)] * size}) for i, size in enumerate((3, 4)))
+
+    result = run_root_tree_write(
+        chunks,
+        path=str(tmp_path / "skim_{dataset}_{index}.root"),
+        rollover_entries=3,
+        ctx={"dataset_name": "sample", "partition": {"id": "p0", "part": "0_0"}},
+    )
+
+    assert isinstance(result, ArtifactManifest)
+    records = [part.metadata["writer_manifest"] for part in result.parts]
+    assert [Path(part.path).name for part in result.parts] == [
+        "skim_sample_0.root",
+        "skim_sample_1.root",
+        "skim_sample_2.root",
+    ]
+    assert [record["entries"] for record in records] == [3, 3, 1]
+    assert [record["piece"] for record in records] == [0, 1, 2]
+    assert {record["name"] for record in records} == {"skim_sample"}
+    assert [part.partition_id for part in result.parts] == ["p0/0", "p0/1", "p0/2"]
+    for part, record in zip(result.parts, records, strict=True):
+        assert record["size_bytes"] == Path(part.path).stat().st_size
+    with uproot.open(tmp_path / "skim_sample_1.root") as root_file:
+        assert root_file["events"]["x"].array().tolist() == [1.0, 1.0, 1.0]
+
+
+def test_root_tree_writer_rolls_over_on_written_bytes(tmp_path: Path) -> None:
+    chunks = (ak.Array({"x": np.arange(100, dtype=np.float64)}) for _ in range(4))
+
+    result = run_root_tree_write(
+        chunks,
+        path=str(tmp_path / "skim.root"),
+        compression="none",
+        rollover_bytes="1 kB",
+    )
+
+    assert isinstance(result, ArtifactManifest)
+    assert [Path(part.path).name for part in result.parts] == [
+        "skim_0.root",
+        "skim_1.root",
+        "skim_2.root",
+        "skim_3.root",
+    ]
+    assert sum(part.metadata["entries"] for part in result.parts) == 400
+
+
+def test_root_tree_writer_rollover_options_are_exclusive(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="exactly one of rollover_entries"):
+        run_root_tree_write(
+            _payload(),
+            path=str(tmp_path / "bad_{index}.root"),
+            rollover_entries=10,
+            rollover_bytes="1 MB",
+        )
+
+
 def _payload() -> ak.Array:
     return ak.Array(
         {
@@ -82,6 +301,17 @@ def _payload() -> ak.Array:
     )
 
 
+class _RecordingExecutor(ThreadPoolExecutor):
+    def __init__(self, max_workers: int) -> None:
+        super().__init__(max_workers)
+        self.submitted: list[Any] = []
+
+    def map(self, fn: Any, *iterables: Any, **kwargs: Any) -> Any:
+        items = list(iterables[0])
+        self.submitted.extend(items)
+        return super().map(fn, items, **kwargs)
+
+
 def _classname(path: Path) -> str:
     with uproot.open(path) as root_file:
         return str(root_file["events"].classname)
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+import awkward as ak
+import numpy as np
+import pytest
+from hepflow.registry.loaders import load_object
+
+from fasthep_carpenter.operations.weights import correction as correction_module
+from fasthep_carpenter.operations.weights.correction import (
+    apply_correction,
+    load_correction,
+)
+
+
+def _correction_set() -> dict:
+    muon_sf = {
+        "name": "muon_sf",
+        "version": 1,
+        "inputs": [
+            {"name": "eta", "type": "real"},
+            {"name": "pt", "type": "real"},
+            {"name": "syst", "type": "string"},
+        ],
+        "output": {"name": "weight", "type": "real"},
+        "data": {
+            "nodetype": "category",
+            "input": "syst",
+            "content": [
+                {
+                    "key": "nominal",
+                    "value": {
+                        "nodetype": "transform",
+                        "input": "eta",
+                        "rule": {
+                            "nodetype": "formula",
+                            "expression": "abs(x)",
+                            "parser": "TFormula",
+                            "variables": ["eta"],
+                        },
+                        "content": {
+                            "nodetype": "multibinning",
+                            "inputs": ["eta", "pt"],
+                            "edges": [[0.0, 1.2, 2.4], [20.0, 50.0, 200.0]],
+                            "content": [1.0, 1.1, 2.0, 2.1],
+                            "flow": "clamp",
+                        },
+                    },
+                },
+                {
+                    "key": "up",
+                    "value": {
+                        "nodetype": "formula",
+                        "expression": "[0]*x + [1]",
+                        "parser": "TFormula",
+                        "variables": ["pt"],
+                        "parameters": [0.01, 1.0],
+                    },
+                },
+            ],
+        },
+    }
+    trigger = {
+        "name": "trigger",
+        "version": 1,
+        "inputs": [{"name": "ht", "type": "real"}],
+        "output": {"name": "weight", "type": "real"},
+        "generic_formulas": [
+            {
+                "nodetype": "formula",
+                "expression": "(x >= [0] && x < [1]) * [2] + !(x >= [0])",
+                "parser": "TFormula",
+                "variables": ["ht"],
+            }
+        ],
+        "data": {
+            "nodetype": "binning",
+            "input": "ht",
+            "edges": {"n": 2, "low": 0.0, "high": 200.0},
+            "content": [
+                {"nodetype": "formularef", "index": 0, "parameters": [50, 100, 0.5]},
+                0.9,
+            ],
+            "flow": 1.0,
+        },
+    }
+    return {"schema_version": 2, "corrections": [muon_sf, trigger]}
+
+
+def _write(path: Path, document: dict) -> Path:
+    if path.suffix == ".gz":
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            json.dump(document, handle)
+    else:
+        path.write_text(json.dumps(document), encoding="utf-8")
+    return path
+
+
+def test_correction_resolves_from_registry() -> None:
+    spec = load_object(
+        "fasthep_carpenter.operations.weights.correction:CORRECTION_SPEC"
+    )
+    impl = load_object(
+        "fasthep_carpenter.operations.weights.correction:run_correction_transform"
+    )
+
+    assert spec["name"] == "hep.weights.correction"
+    assert callable(impl)
+
+
+def test_correction_evaluates_jagged_inputs_per_variation(tmp_path: Path) -> None:
+    path = _write(tmp_path / "muon.json.gz", _correction_set())
+    events = ak.Array(
+        {
+            "Muon_eta": [[-0.5, 2.0], [], [1.5]],
+            "Muon_pt": [[30.0, 60.0], [], [500.0]],
+        }
+    )
+
+    out = apply_correction(
+        events,
+        path=str(path),
+        correction="muon_sf",
+        inputs={"eta": "Muon_eta", "pt": "Muon_pt"},
+        constants={"syst": "nominal"},
+        variations={"up": {"syst": "up"}},
+        outputs={"nominal": "MuonSF", "up": "MuonSF_up"},
+    )
+
+    assert ak.to_list(out.MuonSF) == [[1.0, 2.1], [], [2.1]]
+    assert ak.to_list(ak.flatten(out.MuonSF_up)) == pytest.approx([1.3, 1.6, 6.0])
+    assert ak.to_list(ak.num(out.MuonSF_up)) == [2, 0, 1]
+
+
+def test_correction_formulas_and_flow_nodes(tmp_path: Path) -> None:
+    path = _write(tmp_path / "corrections.json", _correction_set())
+    events = ak.Array({"HT": [10.0, 60.0, 99.0, 150.0, 250.0, -5.0]})
+
+    out = apply_correction(
+        events,
+        path=str(path),
+        correction="trigger",
+        inputs={"ht": "HT"},
+        outputs={"nominal": "TriggerSF"},
+    )
+
+    assert ak.to_list(out.TriggerSF) == [1.0, 0.5, 0.5, 0.9, 1.0, 1.0]
+
+
+def test_correction_dispatch_evaluates_each_child_once_on_its_rows() -> None:
+    calls = []
+
+    def child(offset: float) -> Any:
+        def evaluate(columns: dict[str, np.ndarray], n: int) -> np.ndarray:
+            calls.append((offset, columns["x"].tolist(), n))
+            return columns["x"] + offset
+
+        return evaluate
+
+    out = correction_module._dispatch(
+        [child(0.0), child(10.0), child(20.0)],
+        np.array([1, 0, 1, 2, 0, 1]),
+        {"x": np.arange(6.0)},
+        6,
+    )
+
+    assert out.tolist() == [10.0, 1.0, 12.0, 23.0, 4.0, 15.0]
+    assert calls == [
+        (0.0, [1.0, 4.0], 2),
+        (10.0, [0.0, 2.0, 5.0], 3),
+        (20.0, [3.0], 1),
+    ]
+
+
+def test_correction_reports_unmatched_categories_and_missing_inputs(
+    tmp_path: Path,
+) -> None:
+    path = _write(tmp_path / "corrections.json", _correction_set())
+    events = ak.Array({"Muon_eta": [0.5], "Muon_pt": [30.0]})
+    inputs = {"eta": "Muon_eta", "pt": "Muon_pt"}
+    outputs = {"nominal": "MuonSF"}
+
+    with pytest.raises(ValueError, match="has no category for 'down'"):
+        apply_correction(
+            events,
+            path=str(path),
+            correction="muon_sf",
+            inputs=inputs,
+            constants={"syst": "down"},
+            outputs=outputs,
+        )
+    with pytest.raises(ValueError, match=r"missing inputs \['syst'\]"):
+        apply_correction(
+            events,
+            path=str(path),
+            correction="muon_sf",
+            inputs=inputs,
+            outputs=outputs,
+        )
+    with pytest.raises(ValueError, match=r"not found .* \['muon_sf', 'trigger'\]"):
+        load_correction(str(path), "electron_sf")
+
+
+def test_correction_is_compiled_once_per_file_version(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = _write(tmp_path / "corrections.json", _correction_set())
+    compiled: list[tuple[Any, ...]] = []
+    compile_correction = correction_module._compile_correction
+
+    def recording_compile(*args: Any) -> Any:
+        compiled.append(args)
+        return compile_correction(*args)
+
+    monkeypatch.setattr(correction_module, "_compile_correction", recording_compile)
+
+    first = load_correction(str(path), "trigger")
+    assert load_correction(str(path), "trigger") is first
+    assert len(compiled) == 1
+
+    document = _correction_set()
+    document["corrections"][1]["data"]["content"][1] = 0.75
+    _write(path, document)
+    reloaded = load_correction(str(path), "trigger")
+    assert reloaded.evaluate({"ht": np.array([150.0])}, 1).tolist() == [0.75]
+    assert len(compiled) == 2
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["__import__('os')", "x.real", "y + 1", "[3] * x"],
+)
+def test_correction_rejects_unsupported_formulas(
+    tmp_path: Path, expression: str
+) -> None:
+    document = {
+        "name": "bad",
+        "inputs": [{"name": "pt", "type": "real"}],
+        "data": {
+            "nodetype": "formula",
+            "expression": expression,
+            "parser": "TFormula",
+            "variables": ["pt"],
+            "parameters": [1.0],
+        },
+    }
+    path = _write(tmp_path / "bad.json", document)
+
+    with pytest.raises(ValueError, match="correction 'bad' formula"):
+        load_correction(str(path), "bad")
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
 import awkward as ak
+import numpy as np
+import pytest
 import yaml
 from hepflow.api import compile_workflow_file
 from hepflow.registry.loaders import load_object
 from hepflow.utils import read_yaml
 
+from fasthep_carpenter.operations.weights import lookup_csv
 from fasthep_carpenter.operations.weights.lookup_csv import apply_lookup_csv
 from fasthep_carpenter.operations.weights.pdf_envelope import apply_pdf_envelope
+from fasthep_carpenter.operations.weights.table_cache import TableCache
 
 
 def test_weight_operations_resolve_from_registry() -> None:
@@ -68,6 +73,156 @@ def test_lookup_csv_produces_nominal_up_down_fields(tmp_path: Path) -> None:
     assert ak.to_list(out.TriggerEffWeight_down) == [0.85, 0.72]
 
 
+def test_lookup_csv_sorts_rows_and_rejects_values_outside_the_bins(
+    tmp_path: Path,
+) -> None:
+    csv_path = tmp_path / "sf.csv"
+    csv_path.write_text(
+        "pt_min,pt_max,sf\n50,100,3.0\n0,20,1.0\n20,50,2.0\n", encoding="utf-8"
+    )
+    lookup: dict[str, Any] = {
+        "path": str(csv_path),
+        "variable": "pt",
+        "bins": {},
+        "values": {"nominal": "sf"},
+        "outputs": {"nominal": "w"},
+    }
+
+    out = apply_lookup_csv(ak.Array({"pt": [0.0, 19.9, 20.0, 99.0]}), **lookup)
+    assert ak.to_list(out.w) == [1.0, 1.0, 2.0, 3.0]
+
+    with pytest.raises(ValueError, match=r"No CSV lookup bin matched value 100\.0"):
+        apply_lookup_csv(ak.Array({"pt": [10.0, 100.0]}), **lookup)
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        ["0,30,1.0", "20,50,2.0"],
+        ["0,20,1.0", "30,50,2.0"],
+        ["0,20,1.0", "20,20,2.0"],
+    ],
+)
+def test_lookup_csv_rejects_overlapping_or_gapped_bins(
+    tmp_path: Path, rows: list[str]
+) -> None:
+    csv_path = tmp_path / "sf.csv"
+    csv_path.write_text("\n".join(["pt_min,pt_max,sf", *rows]), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="CSV lookup bin"):
+        apply_lookup_csv(
+            ak.Array({"pt": [10.0]}),
+            path=str(csv_path),
+            variable="pt",
+            bins={},
+            values={"nominal": "sf"},
+            outputs={"nominal": "w"},
+        )
+
+
+def _write_pt_eta_table(path: Path) -> None:
+    rows = ["pt_min,pt_max,abseta_min,abseta_max,sf,sf_up"]
+    for pt_min, pt_max, pt_sf in [(50, 200, 3.0), (20, 50, 2.0)]:
+        for eta_min, eta_max, eta_sf in [(1.2, 2.4, 0.1), (0.0, 1.2, 0.0)]:
+            sf = pt_sf + eta_sf
+            rows.append(f"{pt_min},{pt_max},{eta_min},{eta_max},{sf},{sf + 0.5}")
+    path.write_text("\n".join(rows), encoding="utf-8")
+
+
+def _pt_eta_lookup(path: Path, **kwargs: Any) -> dict[str, Any]:
+    return {
+        "path": str(path),
+        "axes": [
+            {"variable": "Muon_pt", "column": "pt"},
+            {"variable": "Muon_eta", "column": "abseta", "abs": True},
+        ],
+        "values": {"nominal": "sf", "up": "sf_up"},
+        "outputs": {"nominal": "MuonSF", "up": "MuonSF_up"},
+        **kwargs,
+    }
+
+
+def test_lookup_csv_looks_up_jagged_objects_on_a_multi_dimensional_grid(
+    tmp_path: Path,
+) -> None:
+    csv_path = tmp_path / "muon_sf.csv"
+    _write_pt_eta_table(csv_path)
+    events = ak.Array(
+        {
+            "Muon_pt": [[25.0, 60.0], [], [199.0]],
+            "Muon_eta": [[-1.5, 0.3], [], [-0.1]],
+        }
+    )
+
+    out = apply_lookup_csv(events, **_pt_eta_lookup(csv_path))
+
+    assert ak.to_list(out.MuonSF) == [[2.1, 3.0], [], [3.0]]
+    assert ak.to_list(out.MuonSF_up) == [[2.6, 3.5], [], [3.5]]
+
+
+@pytest.mark.parametrize(
+    ("out_of_range", "expected"),
+    [("clamp", [[2.1, 3.1]]), ("default", [[0.5, 0.5]])],
+)
+def test_lookup_csv_out_of_range_policies(
+    tmp_path: Path, out_of_range: str, expected: list[list[float]]
+) -> None:
+    csv_path = tmp_path / "muon_sf.csv"
+    _write_pt_eta_table(csv_path)
+    events = ak.Array({"Muon_pt": [[10.0, 500.0]], "Muon_eta": [[1.5, 3.0]]})
+
+    out = apply_lookup_csv(
+        events,
+        **_pt_eta_lookup(csv_path, out_of_range=out_of_range, default_value=0.5),
+    )
+    assert ak.to_list(out.MuonSF) == expected
+
+    with pytest.raises(
+        ValueError, match=r"No CSV lookup bin matched value 10\.0 of 'Muon_pt'"
+    ):
+        apply_lookup_csv(events, **_pt_eta_lookup(csv_path))
+
+
+def test_lookup_csv_broadcasts_event_variables_and_rejects_incomplete_grids(
+    tmp_path: Path,
+) -> None:
+    csv_path = tmp_path / "period_sf.csv"
+    csv_path.write_text(
+        "\n".join(
+            [
+                "run_min,run_max,pt_min,pt_max,sf",
+                "0,100,0,50,1.0",
+                "0,100,50,100,2.0",
+                "100,200,0,50,3.0",
+                "100,200,50,100,4.0",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    lookup: dict[str, Any] = {
+        "path": str(csv_path),
+        "axes": [
+            {"variable": "run", "column": "run"},
+            {"variable": "Jet_pt", "column": "pt"},
+        ],
+        "values": {"nominal": "sf"},
+        "outputs": {"nominal": "JetSF"},
+    }
+    events = ak.Array({"run": [10, 150], "Jet_pt": [[20.0, 70.0], [70.0]]})
+
+    out = apply_lookup_csv(events, **lookup)
+    assert ak.to_list(out.JetSF) == [[1.0, 2.0], [4.0]]
+
+    csv_path.write_text(
+        "\n".join(csv_path.read_text(encoding="utf-8").splitlines()[:-1]),
+        encoding="utf-8",
+    )
+    with pytest.raises(
+        ValueError, match=r"CSV lookup bin \[100.0, 200.0\), \[50.0, 100.0\) is missing"
+    ):
+        apply_lookup_csv(events, **lookup)
+
+
 def test_pdf_envelope_produces_up_down_fields() -> None:
     events = ak.Array({"LHEPdfWeight": [[0.98, 1.04, 1.01], [0.91, 1.07, 1.02]]})
 
@@ -81,6 +236,86 @@ def test_pdf_envelope_produces_up_down_fields() -> None:
     assert ak.to_list(out.ttbar_pdf_weight_down) == [0.98, 0.91]
 
 
+def test_pdf_envelope_hessian_and_replica_uncertainties_with_alphas() -> None:
+    events = ak.Array(
+        {"LHEPdfWeight": [[1.0, 1.03, 0.96, 0.98, 1.02], [1.1, 1.1, 1.1, 1.0, 1.2]]}
+    )
+    outputs = {"up": "PdfUp", "down": "PdfDown", "std": "PdfStd"}
+
+    hessian = apply_pdf_envelope(
+        events, inputs="LHEPdfWeight", outputs=outputs, method="hessian"
+    )
+    assert ak.to_list(hessian.PdfStd) == pytest.approx(
+        [np.sqrt(0.03**2 + 0.04**2 + 0.02**2 + 0.02**2), 0.1 * np.sqrt(2)]
+    )
+    assert ak.to_list(hessian.PdfUp) == pytest.approx(
+        [1.0 + hessian.PdfStd[0], 1.1 + hessian.PdfStd[1]]
+    )
+
+    replicas = apply_pdf_envelope(
+        events,
+        inputs="LHEPdfWeight",
+        outputs=outputs,
+        method="replicas",
+        alphas=[3, 4],
+    )
+    replica_std = np.std([[1.03, 0.96], [1.1, 1.1]], axis=1, ddof=1)
+    expected = np.hypot(replica_std, [0.02, 0.1])
+    assert ak.to_list(replicas.PdfStd) == pytest.approx(expected.tolist())
+    assert ak.to_list(replicas.PdfDown) == pytest.approx((1.0, 1.1) - expected)
+
+
+def test_pdf_envelope_scale_7point_and_padded_weight_lists() -> None:
+    scale = [0.8, 0.9, 0.1, 0.95, 1.0, 1.05, 5.0, 1.1, 1.2]
+    events = ak.Array({"LHEScaleWeight": [scale, scale[:5], []]})
+
+    out = apply_pdf_envelope(
+        events,
+        inputs="LHEScaleWeight",
+        outputs={"up": "ScaleUp", "down": "ScaleDown"},
+        method="scale",
+        n_members=9,
+    )
+
+    assert ak.to_list(out.ScaleUp) == [1.2, 1.0, None]
+    assert ak.to_list(out.ScaleDown) == [0.8, 0.8, None]
+
+    with pytest.raises(ValueError, match=r"members \[9\] are outside the 9"):
+        apply_pdf_envelope(
+            events,
+            inputs="LHEScaleWeight",
+            outputs={"up": "ScaleUp"},
+            members=[0, 9],
+            n_members=9,
+        )
+
+
+@pytest.mark.parametrize("method", ["envelope", "hessian", "replicas", "scale"])
+def test_pdf_envelope_gives_none_for_events_without_weights(method: str) -> None:
+    weights = [0.8, 0.9, 1.1, 0.95, 1.0, 1.05, 1.2, 1.1, 0.85]
+    events = ak.Array({"LHEPdfWeight": [weights, [], weights]})
+
+    out = apply_pdf_envelope(
+        events,
+        inputs="LHEPdfWeight",
+        outputs={"up": "PdfUp", "down": "PdfDown", "std": "PdfStd"},
+        method=method,
+    )
+
+    for field in ("PdfUp", "PdfDown", "PdfStd"):
+        values = ak.to_list(out[field])
+        assert values[1] is None
+        assert values[0] == values[2] is not None
+
+    empty = apply_pdf_envelope(
+        events[1:2],
+        inputs="LHEPdfWeight",
+        outputs={"up": "PdfUp", "std": "PdfStd"},
+        method=method,
+    )
+    assert ak.to_list(empty.PdfUp) == ak.to_list(empty.PdfStd) == [None]
+
+
 def test_weight_outputs_can_be_used_by_systematic_weight_multiply(
     tmp_path: Path,
 ) -> None:
@@ -157,12 +392,16 @@ def test_weight_outputs_can_be_used_by_systematic_weight_multiply(
             ],
         },
     }
-    workflow_path.write_text(yaml.safe_dump(workflow, sort_keys=False), encoding="utf-8")
+    workflow_path.write_text(
+        yaml.safe_dump(workflow, sort_keys=False), encoding="utf-8"
+    )
 
     compile_workflow_file(workflow_path, outdir=tmp_path / "build")
 
     plan = read_yaml(tmp_path / "build" / "compile" / "trigger_eff_up" / "plan.yaml")
-    hist_node = next(node for node in plan["nodes"] if node["id"] == "stage.WeightedHist")
+    hist_node = next(
+        node for node in plan["nodes"] if node["id"] == "stage.WeightedHist"
+    )
     assert hist_node["params"]["weight_expr"] == (
         "(TriggerEffWeight) * (TriggerEffWeight_up)"
     )
@@ -197,8 +436,81 @@ def test_minimal_workflow_compiles_with_pdf_envelope(tmp_path: Path) -> None:
             ]
         },
     }
-    workflow_path.write_text(yaml.safe_dump(workflow, sort_keys=False), encoding="utf-8")
+    workflow_path.write_text(
+        yaml.safe_dump(workflow, sort_keys=False), encoding="utf-8"
+    )
 
     plan = compile_workflow_file(workflow_path, outdir=tmp_path / "build")
 
     assert plan.get_node("stage.PDFWeights").impl == "hep.weights.pdf_envelope"
+
+
+def test_lookup_csv_reuses_parsed_tables_until_the_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    csv_path = tmp_path / "sf.csv"
+    csv_path.write_text("pt_min,pt_max,sf\n0,50,1.0\n50,100,2.0\n", encoding="utf-8")
+    parsed: list[str] = []
+    parse = lookup_csv._parse_lookup_table
+
+    def recording_parse(path: str, **kwargs: Any) -> Any:
+        parsed.append(path)
+        return parse(path, **kwargs)
+
+    monkeypatch.setattr(lookup_csv, "_parse_lookup_table", recording_parse)
+    lookup: dict[str, Any] = {
+        "path": str(csv_path),
+        "variable": "pt",
+        "values": {"nominal": "sf"},
+        "outputs": {"nominal": "w"},
+    }
+    events = ak.Array({"pt": [10.0, 60.0]})
+
+    apply_lookup_csv(events, **lookup)
+    out = apply_lookup_csv(events, **lookup)
+    assert ak.to_list(out.w) == [1.0, 2.0]
+    assert len(parsed) == 1
+
+    csv_path.write_text("pt_min,pt_max,sf\n0,50,1.25\n50,100,2.5\n", encoding="utf-8")
+    out = apply_lookup_csv(events, **lookup)
+    assert ak.to_list(out.w) == [1.25, 2.5]
+    assert len(parsed) == 2
+
+
+def test_lookup_csv_sidecar_skips_parsing_in_a_fresh_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    csv_path = tmp_path / "muon_sf.csv"
+    _write_pt_eta_table(csv_path)
+    events = ak.Array({"Muon_pt": [[25.0, 60.0]], "Muon_eta": [[-1.5, 0.3]]})
+
+    apply_lookup_csv(events, **_pt_eta_lookup(csv_path, sidecar=True))
+    (sidecar,) = tmp_path.glob("muon_sf.csv.*.npz")
+
+    monkeypatch.setattr(lookup_csv, "TABLE_CACHE", TableCache())
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("sidecar was not used")
+
+    monkeypatch.setattr(lookup_csv, "_parse_lookup_table", fail)
+    out = apply_lookup_csv(events, **_pt_eta_lookup(csv_path, sidecar=True))
+    assert ak.to_list(out.MuonSF_up) == [[2.6, 3.5]]
+    assert sidecar.exists()
+
+
+def test_table_cache_evicts_the_least_recently_used_table(tmp_path: Path) -> None:
+    paths = [tmp_path / f"{name}.csv" for name in "abc"]
+    for path in paths:
+        path.write_text("x\n", encoding="utf-8")
+    cache = TableCache(max_entries=2)
+
+    cache.get_or_load(paths[0], "k", lambda: "a")
+    cache.get_or_load(paths[1], "k", lambda: "b")
+    assert cache.get_or_load(paths[0], "k", lambda: "reloaded") == "a"
+    cache.get_or_load(paths[2], "k", lambda: "c")
+
+    assert len(cache) == 2
+    assert cache.get_or_load(paths[0], "k", lambda: "reloaded") == "a"
+    assert cache.get_or_load(paths[1], "k", lambda: "reloaded") == "reloaded"
+    with pytest.raises(ValueError, match="must be positive"):
+        TableCache(max_entries=0)